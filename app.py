@@ -1,10 +1,21 @@
+import startup  # first: marks the start of the cold-start timing report
 import streamlit as st
-import matplotlib.pyplot as plt
-import numpy as np
-import random
-import string
+import secrets
 import time
-import hashlib
+import os
+
+# Light modules only at startup. numpy (scoring) and matplotlib (wheel) load on
+# first use inside compute_scores / dashboard_page, so entry/login pages skip them.
+with startup.timed("import content + auth + storage"):
+    from content import APP_CSS, ASSESSMENT_QUESTIONS, CATEGORIES, LIKERT_QUESTIONS, LOGO_SVG
+    import responses
+    import toxicity
+    from session import SESSION_KEY, Session
+    from auth import HasherBusy, PasswordHasher, TokenBucketLimiter
+    from perf import TimingRegistry
+    import metrics
+    import codes
+    from storage import Storage, open_storage
 
 # ------------------------------------------------------------
 # RelateScore™ Streamlit Prototype (Cloud-safe navigation)
@@ -13,53 +24,14 @@ import hashlib
 # - Tip microcopy appears directly under every "Enter Invite Code" button
 # - Invite codes work across sessions on the same Streamlit Cloud instance via shared in-memory store
 # ------------------------------------------------------------
-st.set_page_config(page_title="RelateScore™", page_icon="✅", layout="centered")
-st.set_option("client.showErrorDetails", True)
+with startup.timed("page config"):
+    st.set_page_config(page_title="RelateScore™", page_icon="✅", layout="centered")
+    st.set_option("client.showErrorDetails", True)
 
 # -----------------------------
-# Styling
+# Styling (CSS/logo strings are built once per process in content.py)
 # -----------------------------
-st.markdown(
-    """
-    <style>
-        .block-container { max-width: 520px; padding-top: 24px; }
-        h1, h2, h3 { color: #1A1A1A; font-family: sans-serif; }
-        .stButton > button {
-            background-color: #C6A667 !important;
-            color: #FFFFFF !important;
-            border-radius: 10px !important;
-            border: none !important;
-            padding: 10px 18px !important;
-            width: 100% !important;
-        }
-        .insight-card {
-            background-color: #FFFFFF;
-            border: 1px solid #C6A667;
-            border-radius: 10px;
-            padding: 14px;
-            margin-bottom: 10px;
-        }
-        .logo { text-align:center; margin-bottom: 10px; padding-top: 10px; overflow: visible !important; }
-        .logo svg { display:block; margin:0 auto; overflow: visible !important; }
-        .tagline { text-align:center; color:#3A3A3A; margin-bottom: 18px; }
-        .rgi-big { font-size: 54px; font-weight: 800; color: #C6A667; text-align: center; line-height: 1.0; }
-        .small-muted { color:#666; font-size: 0.92rem; }
-        .tip-under-btn { margin-top: -10px; margin-bottom: 14px; }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
-
-LOGO_SVG = """
-<div class="logo">
-<svg width="64" height="64" viewBox="0 0 64 64" xmlns="http://www.w3.org/2000/svg" aria-label="RelateScore logo">
-  <circle cx="32" cy="32" r="20" stroke="#C6A667" stroke-width="4" fill="none"/>
-  <path d="M22 32 L29 39 L44 24" stroke="#C6A667" stroke-width="4" fill="none"
-        stroke-linecap="round" stroke-linejoin="round"/>
-</svg>
-<div style="font-size: 22px; font-weight: 700; margin-top: 6px;">RelateScore™</div>
-</div>
-"""
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 def display_logo():
     st.markdown(LOGO_SVG, unsafe_allow_html=True)
@@ -74,9 +46,56 @@ def _rerun():
         st.experimental_rerun()
 
 def nav(to_page: str):
-    st.session_state.page = to_page
+    state().page = to_page
     _rerun()
 
+# -----------------------------
+# Runtime timing (perf.py): process-wide histograms for pages and hot helpers,
+# shown on the admin page. RELATESCORE_ADMINS=alice,bob lists admin usernames.
+# -----------------------------
+ADMIN_USERS = frozenset(u.strip() for u in os.environ.get("RELATESCORE_ADMINS", "").split(",") if u.strip())
+
+@st.cache_resource
+def get_timings() -> TimingRegistry:
+    return TimingRegistry()
+
+timings = get_timings()
+
+# -----------------------------
+# Prometheus metrics (metrics.py): invites, logins, scoring
+# - RELATESCORE_METRICS_PORT=9464: serve /metrics on 127.0.0.1
+# - RELATESCORE_METRICS_FILE=path: rewrite a textfile every RELATESCORE_METRICS_INTERVAL seconds (15)
+# -----------------------------
+@st.cache_resource
+def get_metrics() -> "metrics.RelateScoreMetrics":
+    m = metrics.RelateScoreMetrics()
+    port = os.environ.get("RELATESCORE_METRICS_PORT")
+    if port:
+        metrics.serve(m.registry, int(port))
+    path = os.environ.get("RELATESCORE_METRICS_FILE")
+    if path:
+        metrics.TextfileDumper(m.registry, path, float(os.environ.get("RELATESCORE_METRICS_INTERVAL", "15")))
+    return m
+
+def is_admin() -> bool:
+    s = state()
+    return bool(s.logged_in and s.username in ADMIN_USERS)
+
+# -----------------------------
+# Storage (shared across sessions)
+# - RELATESCORE_STORAGE=memory (default): process memory, lost on restart
+# - RELATESCORE_STORAGE=sqlite:///path/relatescore.db: durable, shared by processes on the host
+# -----------------------------
+STORAGE_URL = os.environ.get("RELATESCORE_STORAGE", "memory")
+
+@st.cache_resource
+def get_storage() -> Storage:
+    # users, invites { CODE: {"created_at": ts, "used": bool, "revoked": bool} }, score history
+    m = get_metrics()
+    storage = open_storage(STORAGE_URL, INVITE_TTL_SECONDS, on_invite_expired=m.invites_expired.inc)
+    m.watch_live_invites(storage.live_invite_count)
+    return storage
+
 # -----------------------------
 # Invite Store (shared across sessions)
 # -----------------------------
@@ -84,261 +103,219 @@ INVITE_TTL_SECONDS = 60 * 30  # 30 minutes
 
 
 # How often the originating session checks for invite acceptance (seconds)
-CHECK_ACCEPTANCE_INTERVAL_SECONDS = 3
+CHECK_ACCEPTANCE_INTERVAL_SECONDS = float(os.environ.get("RELATESCORE_ACCEPTANCE_CHECK_SECONDS", "3"))
+
+# -----------------------------
+# Partner pairing (pairs.py): consuming an invite links the two members, and
+# "mutual reflection" blends in the partner's latest real category scores
+# -----------------------------
 @st.cache_resource
-def get_invite_store():
-    # { CODE: {"created_at": ts, "used": bool} }
-    return {}
-
-def _clean_expired_invites(store: dict):
-    now = time.time()
-    expired = [code for code, meta in store.items()
-               if (now - meta.get("created_at", now)) > INVITE_TTL_SECONDS]
-    for code in expired:
-        store.pop(code, None)
-
-def register_invite(code: str) -> None:
-    store = get_invite_store()
-    _clean_expired_invites(store)
-    store[code] = {"created_at": time.time(), "used": False, "revoked": False}
+def get_pair_index():
+    # Offers for invites that expire unclaimed are dropped after the same TTL
+    return startup.lazy_import("pairs").PairIndex(INVITE_TTL_SECONDS)
+
+def _pair_key() -> str:
+    """Username, or a per-session key for partners who joined without an account."""
+    s = state()
+    if s.username:
+        return s.username
+    if not s.pair_session_key:
+        s.pair_session_key = f"session:{secrets.token_hex(8)}"
+    return s.pair_session_key
 
+# -----------------------------
+# Invite codes (codes.py): secrets-based, drawn from a pool a background thread
+# keeps filled, and registered with an atomic insert-if-absent so a code that
+# is already live is never handed out twice
+# -----------------------------
+@st.cache_resource
+def get_code_issuer() -> "codes.InviteCodeIssuer":
+    return codes.InviteCodeIssuer(get_storage().register_new_invite,
+                                  on_collision=get_metrics().invite_code_collisions.inc)
+
+@timings.instrument("invite.register")
+def create_invite() -> str:
+    """Issues and registers a new unique invite code for this session."""
+    code = get_code_issuer().issue()
+    get_metrics().invites_registered.inc()
+    get_pair_index().offer(code, _pair_key())
+    return code
+
+@timings.instrument("invite.validate")
 def validate_invite(code: str):
     """
     Returns (is_valid, reason)
-    Reasons: ok | missing | expired | used
+    Reasons: ok | missing | expired | revoked | used
     """
-    store = get_invite_store()
-    _clean_expired_invites(store)
-    meta = store.get(code)
-    if not meta:
-        return False, "missing"
-    if (time.time() - meta.get("created_at", time.time())) > INVITE_TTL_SECONDS:
-        store.pop(code, None)
-        return False, "expired"
-    if meta.get("revoked"):
-        return False, "revoked"
-    if meta.get("used"):
-        return False, "used"
-    return True, "ok"
+    return get_storage().validate_invite(code)
 
-def consume_invite(code: str) -> None:
-    store = get_invite_store()
-    meta = store.get(code)
-    if meta:
-        meta["used"] = True
+@timings.instrument("invite.consume")
+def consume_invite(code: str):
+    """
+    Atomically validates and marks the invite used (consume-once across sessions).
+    Links this session to the inviter on success.
+    Returns (is_valid, reason) like validate_invite.
+    """
+    is_ok, reason = get_storage().claim_invite(code)
+    get_metrics().invites_consumed[reason].inc()
+    if is_ok:
+        get_pair_index().accept(code, _pair_key())
+    return is_ok, reason
 
+@timings.instrument("invite.revoke")
 def revoke_invite(code: str) -> None:
     """Marks an invite as revoked so it cannot be used."""
-    store = get_invite_store()
-    _clean_expired_invites(store)
-    meta = store.get(code)
-    if meta:
-        meta["revoked"] = True
+    get_storage().revoke_invite(code)
+    get_pair_index().withdraw(code)
 
+@timings.instrument("invite.is_accepted")
 def is_invite_accepted(code: str) -> bool:
     """Returns True if the invite exists and has been marked used/accepted."""
-    store = get_invite_store()
-    _clean_expired_invites(store)
-    meta = store.get(code)
-    return bool(meta and meta.get("used"))
+    return get_storage().is_invite_accepted(code)
+
+def wait_for_invite_acceptance(code: str, timeout: float) -> bool:
+    """Blocks (without CPU) until consume_invite/revoke_invite wakes this code, or timeout.
+
+    Timed as invite.wait and left out of the page.create_invite timing.
+    """
+    with timings.idle("invite.wait"):
+        return get_storage().wait_for_acceptance(code, timeout)
 
 # -----------------------------
 # User Store (shared across sessions)
 # Prototype-only credential store for Streamlit Cloud instance.
-# In production, replace with a real auth provider / DB with salted hashes.
+# - Passwords: salted scrypt on a bounded worker pool (auth.py);
+#   RELATESCORE_KDF_COST=low|default|high, RELATESCORE_KDF_WORKERS=<threads>
+# - Login attempts are throttled per username and per client IP (token buckets)
 # -----------------------------
+KDF_COST = os.environ.get("RELATESCORE_KDF_COST", "default")
+KDF_WORKERS = int(os.environ.get("RELATESCORE_KDF_WORKERS", "2"))
+
 @st.cache_resource
-def get_user_store():
-    # { username: {"pw_hash": str, "created_at": ts} }
-    return {}
+def get_password_hasher() -> PasswordHasher:
+    return PasswordHasher(cost=KDF_COST, workers=KDF_WORKERS)
 
-def _hash_pw(pw: str) -> str:
-    return hashlib.sha256(pw.encode("utf-8")).hexdigest()
+@st.cache_resource
+def get_login_limiters():
+    # (per username, per IP): bursts of 5 / 20 attempts, then one every 30s / 3s
+    return TokenBucketLimiter(5, 1 / 30), TokenBucketLimiter(20, 1 / 3)
+
+def _client_ip() -> str:
+    ctx = getattr(st, "context", None)
+    ip = getattr(ctx, "ip_address", None) if ctx is not None else None
+    if not ip and ctx is not None:
+        forwarded = (getattr(ctx, "headers", None) or {}).get("X-Forwarded-For", "")
+        ip = forwarded.split(",")[0].strip()
+    return ip or "unknown"
 
 def register_user(username: str, password: str):
-    store = get_user_store()
+    """
+    Returns (ok, reason)
+    Reasons: ok | missing | exists | busy
+    """
     u = (username or "").strip()
     if not u:
         return False, "missing"
-    if u in store:
+    if get_storage().get_user(u):
+        return False, "exists"
+    try:
+        pw_hash = get_password_hasher().hash(password or "")
+    except HasherBusy:
+        return False, "busy"
+    if not get_storage().add_user(u, {"pw_hash": pw_hash, "created_at": time.time()}):
         return False, "exists"
-    store[u] = {"pw_hash": _hash_pw(password or ""), "created_at": time.time()}
     return True, "ok"
 
-def verify_user(username: str, password: str):
-    store = get_user_store()
+def verify_user(username: str, password: str, client_ip: str = "unknown"):
+    """
+    Returns (ok, reason)
+    Reasons: ok | invalid | throttled | busy
+    """
+    m = get_metrics()
+    with m.login_seconds.time():
+        ok, reason = _verify_user(username, password, client_ip)
+    m.logins[reason].inc()
+    return ok, reason
+
+def _verify_user(username: str, password: str, client_ip: str):
     u = (username or "").strip()
-    meta = store.get(u)
-    if not meta:
-        return False
-    return meta.get("pw_hash") == _hash_pw(password or "")
+    user_limiter, ip_limiter = get_login_limiters()
+    if not ip_limiter.allow(client_ip) or not user_limiter.allow(u):
+        return False, "throttled"
+
+    hasher = get_password_hasher()
+    meta = get_storage().get_user(u)
+    try:
+        ok = hasher.verify(password or "", meta["pw_hash"] if meta else None, username=u)
+    except HasherBusy:
+        return False, "busy"
+    if not ok:
+        return False, "invalid"
+
+    # Upgrade legacy SHA-256 or old-cost hashes while we have the plaintext
+    if hasher.needs_rehash(meta["pw_hash"]):
+        try:
+            get_storage().set_pw_hash(u, hasher.hash(password or ""))
+        except HasherBusy:
+            pass
+    return True, "ok"
 
 def is_invite_used(code: str) -> bool:
-    store = get_invite_store()
-    _clean_expired_invites(store)
-    meta = store.get(code)
-    return bool(meta and meta.get("used"))
+    return get_storage().is_invite_accepted(code)
 
 
 # -----------------------------
 # Data
 # -----------------------------
-CATEGORIES = [
-    "Emotional Awareness",
-    "Communication Style",
-    "Conflict Tendencies",
-    "Attachment Patterns",
-    "Empathy & Responsiveness",
-    "Self-Insight",
-    "Trust & Boundaries",
-    "Stability & Consistency"
-]
-
-# -----------------------------
-# RQ Wheel Color System (per category)
-# - Uses RelateScore palette where possible (Accent Blue / Mint / Gold)
-# - Adds distinct, premium-safe supporting colors for clear differentiation
-# -----------------------------
-CATEGORY_COLORS = {
-    "Emotional Awareness": "#2E6AF3",        # Accent Blue
-    "Communication Style": "#0C9A6F",        # Success Green
-    "Conflict Tendencies": "#E54646",        # Error Red
-    "Attachment Patterns": "#6B5B95",        # Deep Violet (supporting)
-    "Empathy & Responsiveness": "#A6E3DA",   # Mint
-    "Self-Insight": "#F4A623",               # Warning Amber
-    "Trust & Boundaries": "#C6A667",         # Gold
-    "Stability & Consistency": "#1A1A1A",    # Charcoal
-}
+# CATEGORIES lives in content.py (shared with scoring.py and batch scoring)
 
-def _hex_to_rgb01(hex_color: str):
-    hex_color = hex_color.lstrip("#")
-    return tuple(int(hex_color[i:i+2], 16) / 255.0 for i in (0, 2, 4))
-
-def _blend_hex(c1: str, c2: str, t: float) -> str:
-    """Blend c1->c2 with t in [0,1]. Returns hex string."""
-    t = float(np.clip(t, 0.0, 1.0))
-    r1, g1, b1 = _hex_to_rgb01(c1)
-    r2, g2, b2 = _hex_to_rgb01(c2)
-    r = r1 + (r2 - r1) * t
-    g = g1 + (g2 - g1) * t
-    b = b1 + (b2 - b1) * t
-    return "#{:02X}{:02X}{:02X}".format(int(r * 255), int(g * 255), int(b * 255))
-
-def _category_dynamic_color(category: str, score: float) -> str:
-    """Real-time color per category based on its score (0-100):
-    - Low scores bias toward a warm neutral (subtle)
-    - High scores move toward the category's base color
-    """
-    base = CATEGORY_COLORS.get(category, "#2E6AF3")
-    warm_neutral = "#FAFAF8"  # Warm Surface
-    # Map score to intensity; keep conservative so it stays premium
-    intensity = float(np.clip((score - 20.0) / 70.0, 0.0, 1.0))  # 20->0, 90->1
-    return _blend_hex(warm_neutral, base, intensity)
-
-def draw_rq_wheel(ax, categories, scores_dict):
-    """Draw an RQ Wheel with per-category colors + wedge fills."""
-    n = len(categories)
-    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
-    values = np.array([float(scores_dict[c]) for c in categories], dtype=float)
-
-    # Close the polygon
-    angles_loop = np.concatenate([angles, [angles[0]]])
-    values_loop = np.concatenate([values, [values[0]]])
-
-    # Background + grid styling
-    ax.set_facecolor("#FAFAF8")
-    ax.grid(True, linewidth=0.8, alpha=0.25)
-    ax.spines["polar"].set_alpha(0.25)
-    ax.set_ylim(0, 100)
-    ax.set_yticks([20, 40, 60, 80, 100])
-    ax.set_yticklabels([])
-
-    # Colored wedges per category (gives the "real-time" multi-color feel)
-    for i in range(n):
-        a0 = angles[i]
-        a1 = angles[(i + 1) % n]
-        v0 = values[i]
-        v1 = values[(i + 1) % n]
-
-        # Handle wrap-around for the last wedge
-        if i == n - 1:
-            a1 = angles[0] + 2 * np.pi
-
-        col = _category_dynamic_color(categories[i], v0)
-        ax.fill([a0, a0, a1, a1], [0, v0, v1, 0], color=col, alpha=0.22, linewidth=0)
-
-    # Outline polygon (neutral premium stroke)
-    ax.plot(angles_loop, values_loop, linewidth=2.2, alpha=0.9)
-
-    # Markers per axis in category color
-    for i, cat in enumerate(categories):
-        v = float(values[i])
-        mcol = _category_dynamic_color(cat, v)
-        ax.scatter([angles[i]], [v], s=60, c=[mcol], edgecolors="#1A1A1A", linewidths=0.6, zorder=5)
-
-    # Category labels, colored to match
-    ax.set_xticks(angles)
-    labels = []
-    for i, cat in enumerate(categories):
-        v = float(values[i])
-        labels.append(cat)
-        # Apply colored tick labels after set_xticklabels
-    ax.set_xticklabels(labels, fontsize=10)
-    for tick, cat in zip(ax.get_xticklabels(), categories):
-        tick.set_color(CATEGORY_COLORS.get(cat, "#1A1A1A"))
-        tick.set_fontweight("medium")
-
-LIKERT_QUESTIONS = {
-    cat: [
-        f"On a scale of 1–5, how important is {cat.lower()} to you in relationships?",
-        f"How would you rate your current level in {cat.lower()}?",
-        f"How often do you reflect on {cat.lower()}?"
-    ]
-    for cat in CATEGORIES
-}
+# -----------------------------
+# Toxicity gate for the free-text reflection (see toxicity.py)
+# RELATESCORE_BLOCKLIST=path replaces the default terms (one per line; multi-word lines are phrases)
+# -----------------------------
+BLOCKLIST_PATH = os.environ.get("RELATESCORE_BLOCKLIST", "")
 
-ASSESSMENT_QUESTIONS = {
-    cat: [
-        f"How often do you recognize patterns in {cat.lower()}?",
-        f"How comfortable are you discussing {cat.lower()}?",
-        f"How does {cat.lower()} impact your connections?"
-    ]
-    for cat in CATEGORIES
-}
+@st.cache_resource
+def get_toxicity_gate() -> "toxicity.ToxicityGate":
+    if not BLOCKLIST_PATH:
+        return toxicity.ToxicityGate()
+    terms = toxicity.load_terms(BLOCKLIST_PATH)
+    return toxicity.ToxicityGate(
+        blocklist=[t for t in terms if " " not in t],
+        phrases=[t for t in terms if " " in t],
+    )
+
+# -----------------------------
+# RQ Wheel: colors, drawing and the cached renderers live in wheel.py
+# - RELATESCORE_WHEEL=matplotlib (default): cached PNG from a matplotlib figure
+# - RELATESCORE_WHEEL=svg: inline SVG string, matplotlib is never imported
+# -----------------------------
+WHEEL_RENDERER = os.environ.get("RELATESCORE_WHEEL", "matplotlib")
+
+@st.cache_resource
+def get_wheel_renderer():
+    # One figure template + LRU of rendered PNGs per process (imports matplotlib)
+    wheel = startup.lazy_import("wheel")
+    with startup.timed("build matplotlib wheel renderer"):
+        return wheel.WheelRenderer(CATEGORIES)
+
+# LIKERT_QUESTIONS / ASSESSMENT_QUESTIONS live in content.py (built once per process)
 
 # -----------------------------
-# Session state init
+# Session state: one typed Session (session.py) under a single key
 # -----------------------------
+def state() -> Session:
+    return st.session_state[SESSION_KEY]
+
 def init_state():
-    defaults = {
-        "page": "entry",
-        "logged_in": False,
-        "consent_accepted": False,
-        "username": "",
-        "invite_waiting": False,
-        "invite_accepted": False,
-
-        # Invite flow (local convenience)
-        "invite_code": None,  # last generated code in THIS session
-        "partner_code": "",
-
-        # Assessment flow
-        "use_mutual": False,
-        "likert_responses": {},
-        "assessment_responses": {},
-        "scores": None,
-        "raw_scores": None,
-        "prev_scores": None,
-        "prev_scores_ts": None,
-        "score_history": [],
-        "insights": None,
-        "pause_waiting": False,
-    }
-    for k, v in defaults.items():
-        if k not in st.session_state:
-            st.session_state[k] = v
+    if SESSION_KEY not in st.session_state:
+        st.session_state[SESSION_KEY] = Session()
 
 def reset_state():
+    # Withdrawing consent also ends the partner link
+    s = st.session_state.get(SESSION_KEY)
+    if s is not None and (s.username or s.pair_session_key):
+        get_pair_index().unlink(_pair_key())
     for k in list(st.session_state.keys()):
         del st.session_state[k]
     init_state()
@@ -353,131 +330,65 @@ init_state()
 # Notes:
 # - In this Streamlit prototype we store prior scores in session_state (per browser session).
 # - In production, persist these per-user in your backend so smoothing is consistent across devices/sessions.
-EMA_ALPHA = 0.25  # 0<alpha<=1; lower = smoother, higher = more responsive
-MAX_DAILY_CHANGE = 15.0  # max allowed change in score points per day (per category)
-MIN_CHANGE_FLOOR = 2.0   # minimum allowed change even if dt is very small (prevents "stuck" feeling)
-OUTLIER_SOFT_THRESHOLD = 25.0  # deltas above this get compressed ("dampened")
-
-def _now_ts() -> float:
-    return time.time()
-
-def _dt_days(prev_ts: float | None) -> float:
-    if not prev_ts:
-        return 1.0
-    dt = max(0.0, _now_ts() - float(prev_ts))
-    return max(dt / 86400.0, 1.0 / 1440.0)  # at least 1 minute
-
-def _dampen_delta(delta: float, threshold: float = OUTLIER_SOFT_THRESHOLD) -> float:
-    """Soft dampening: compress very large deltas without hard-clipping."""
-    ad = abs(delta)
-    if ad <= threshold:
-        return delta
-    # Beyond threshold, compress using a square-root curve (smooth, monotonic)
-    compressed = threshold + (ad - threshold) ** 0.5 * 5.0
-    return float(np.sign(delta) * compressed)
-
-def _cap_delta(delta: float, allowed: float) -> float:
-    if abs(delta) <= allowed:
-        return delta
-    return float(np.sign(delta) * allowed)
+# - Tunables and the vectorized kernel live in scoring.py (shared with cohort replays),
+#   which is imported on first use since it pulls in numpy.
+# - The per-submission body lives in submissions.py (Streamlit-free, benchmarked as is).
+def _scoring():
+    return startup.lazy_import("scoring")
 
-def smooth_scores(new_scores: dict, prev_scores: dict | None, prev_ts: float | None) -> dict:
-    """Apply EMA smoothing + outlier dampening + max-delta cap to category scores (not including RGI)."""
-    if not prev_scores:
-        return new_scores
-
-    days = _dt_days(prev_ts)
-    allowed = max(MIN_CHANGE_FLOOR, MAX_DAILY_CHANGE * days)
+# Entries kept in each session's score history (RELATESCORE_HISTORY_CAPACITY)
+SCORE_HISTORY_CAPACITY = int(os.environ.get("RELATESCORE_HISTORY_CAPACITY", "20"))
 
-    smoothed = {}
-    for cat in CATEGORIES:
-        new_v = float(new_scores.get(cat, 0.0))
-        old_v = float(prev_scores.get(cat, new_v))
+# Population percentiles (quantiles.py): one KLL sketch per category + RGI, fed by every
+# submission in this process. Shown once RELATESCORE_PERCENTILE_MIN_COUNT submissions exist.
+PERCENTILE_MIN_COUNT = int(os.environ.get("RELATESCORE_PERCENTILE_MIN_COUNT", "20"))
 
-        # 1) dampen outliers in the update step
-        raw_delta = new_v - old_v
-        damp_delta = _dampen_delta(raw_delta)
-
-        # 2) EMA on the dampened target
-        target = old_v + damp_delta
-        ema = old_v + EMA_ALPHA * (target - old_v)
+@st.cache_resource
+def get_population():
+    return startup.lazy_import("quantiles").PopulationSketches(CATEGORIES)
 
-        # 3) cap maximum movement based on elapsed time
-        capped_delta = _cap_delta(ema - old_v, allowed)
-        smoothed[cat] = float(np.clip(old_v + capped_delta, 20, 90))
+def _submissions():
+    return startup.lazy_import("submissions")
 
-    return smoothed
+def _now_ts() -> float:
+    return time.time()
 
-def generate_invite_code(length: int = 8) -> str:
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
+def smooth_scores(new_scores: dict, prev_scores: dict | None, prev_ts: float | None) -> dict:
+    """Apply EMA smoothing + outlier dampening + max-delta cap to category scores (not including RGI)."""
+    sub = _submissions()
+    return sub.smooth_scores(new_scores, prev_scores, sub.dt_days(_now_ts(), prev_ts))
 
+@timings.instrument("compute_scores")
 def compute_scores():
-    # --- Step 1: Compute "raw" category scores from the current assessment session
-    raw_cat_scores = {}
-    for cat in CATEGORIES:
-        likert_vals = [st.session_state.likert_responses[q] for q in LIKERT_QUESTIONS[cat]]
-        assess_vals = [st.session_state.assessment_responses[q] for q in ASSESSMENT_QUESTIONS[cat]]
-
-        baseline = float(np.mean(likert_vals)) * 20.0
-        raw = float(np.mean(assess_vals)) * 20.0
-
-        score = (raw / baseline) * 50.0 if baseline > 0 else raw
-
-        if st.session_state.use_mutual:
-            mutual = float(np.random.uniform(40, 80))
-            score = 0.4 * score + 0.6 * mutual
-
-        raw_cat_scores[cat] = float(np.clip(score, 20, 90))
-
-    st.session_state.raw_scores = dict(raw_cat_scores)
+    with get_metrics().compute_scores_seconds.time():
+        s = state()
+        _submissions().score_submission(
+            s, s.likert, s.assessment, pairs=get_pair_index(), pair_key=_pair_key(), storage=get_storage(),
+            population=get_population(), now=_now_ts(), history_capacity=SCORE_HISTORY_CAPACITY)
 
-    # --- Step 2: Apply stability smoothing (EMA + dampening)
-    prev_scores = st.session_state.get("prev_scores")
-    prev_ts = st.session_state.get("prev_scores_ts")
-    smoothed_cats = smooth_scores(raw_cat_scores, prev_scores, prev_ts)
+@timings.instrument("reblend_scores")
+def reblend_scores() -> bool:
+    """Re-blends the latest submission with the partner's newer reflection (no new submission)."""
+    return _submissions().reblend_submission(state(), pairs=get_pair_index(), pair_key=_pair_key())
 
-    # --- Step 3: Compute RGI from the (smoothed) category scores
-    weights = np.array([0.15, 0.15, 0.15, 0.10, 0.15, 0.10, 0.10, 0.10], dtype=float)
-    rgi = float(np.sum(np.array([smoothed_cats[c] for c in CATEGORIES], dtype=float) * weights))
-
-    final_scores = dict(smoothed_cats)
-    final_scores["RGI"] = float(np.clip(rgi, 20, 90))
-
-    # --- Step 4: Persist the smoothed state for next computation (prototype: per session)
-    st.session_state.scores = final_scores
-    st.session_state.prev_scores = dict(smoothed_cats)
-    st.session_state.prev_scores_ts = _now_ts()
-
-    # Optional: keep a short history for debugging / future UI
-    hist = st.session_state.get("score_history", [])
-    hist.append({
-        "ts": st.session_state.prev_scores_ts,
-        "raw": dict(raw_cat_scores),
-        "smoothed": dict(smoothed_cats),
-        "rgi": final_scores["RGI"],
-    })
-    st.session_state.score_history = hist[-20:]
+# -----------------------------
+# Insights: declarative rule table compiled once per process (insights.py)
+# -----------------------------
+@st.cache_resource
+def get_insight_engine():
+    return startup.lazy_import("insights").InsightEngine()
 
 def generate_insights():
-    insights = []
-    for cat in CATEGORIES:
-        score = st.session_state.scores.get(cat, 0)
-        if score > 70:
-            type_ = "Strength"
-            desc = "This is a strong foundation to build on."
-        elif score < 40:
-            type_ = "Blind Spot"
-            desc = "This pattern may create misunderstandings."
-        else:
-            type_ = "Neutral"
-            desc = "Balanced area with room for awareness."
-        insights.append({
-            "category": cat,
-            "type": type_,
-            "description": desc,
-            "suggestion": "Consider a small experiment this week to shift this pattern by 1%."
-        })
-    st.session_state.insights = insights
+    s = state()
+    # Only the matched rule index per category is kept in the session; render() caches the text
+    s.insight_rules = _submissions().insight_rules(get_insight_engine(), s.smoothed, s.before)
+
+def session_insights() -> list:
+    s = state()
+    if s.insight_rules is None:
+        return []
+    engine = get_insight_engine()
+    return [engine.render(c, r) for c, r in enumerate(s.insight_rules) if r >= 0]
 
 def tip_microcopy():
     st.markdown(
@@ -499,10 +410,11 @@ def home_footer_microcopy():
     )
 def entry_page():
     display_logo()
+    s = state()
     st.markdown('<div class="tagline">Private reflection. Shared only by choice.</div>', unsafe_allow_html=True)
 
     # Credential entry (Figure 1 / Fix-1)
-    username_in = st.text_input("Username", value=st.session_state.get("username", ""), key="entry_username")
+    username_in = st.text_input("Username", value=s.username, key="entry_username")
     password_in = st.text_input("Password", type="password", value="", key="entry_password")
 
     if st.button("Create Profile", key="entry_create"):
@@ -512,10 +424,15 @@ def entry_page():
     can_login = bool(username_in.strip()) and bool(password_in)
     if st.button("Log In", key="entry_login", disabled=not can_login):
         # Do not persist password in session state or logs
-        if verify_user(username_in.strip(), password_in):
-            st.session_state.username = username_in.strip()
-            st.session_state.logged_in = True
+        ok, reason = verify_user(username_in.strip(), password_in, _client_ip())
+        if ok:
+            s.username = username_in.strip()
+            s.logged_in = True
             nav("home")
+        elif reason == "throttled":
+            st.error("Too many login attempts. Please wait a moment and try again.")
+        elif reason == "busy":
+            st.error("Sign-in is busy right now. Please try again in a few seconds.")
         else:
             st.error("Login failed. Please check your credentials and try again.")
 
@@ -523,17 +440,18 @@ def entry_page():
 
 def create_profile_page():
     display_logo()
+    s = state()
     st.header("Create your private profile")
     st.write("Your responses are encrypted and visible only by choice.")
 
     # Credentials (prototype)
-    new_username = st.text_input("Choose a username", value=st.session_state.get("username", ""), key="cp_username").strip()
+    new_username = st.text_input("Choose a username", value=s.username, key="cp_username").strip()
     new_password = st.text_input("Choose a password", type="password", value="", key="cp_password")
     new_password2 = st.text_input("Confirm password", type="password", value="", key="cp_password2")
 
-    st.session_state.consent_accepted = st.checkbox(
+    s.consent_accepted = st.checkbox(
         "I understand that my reflections are private, encrypted, and can be deleted at any time.",
-        value=st.session_state.consent_accepted,
+        value=s.consent_accepted,
         key="consent_checkbox"
     )
 
@@ -542,7 +460,7 @@ def create_profile_page():
         if st.button("Back", key="create_back"):
             nav("entry")
     with c2:
-        disabled = (not st.session_state.consent_accepted) or (not new_username) or (not new_password) or (new_password != new_password2)
+        disabled = (not s.consent_accepted) or (not new_username) or (not new_password) or (new_password != new_password2)
         if st.button("Continue", key="create_continue", disabled=disabled):
             if new_password != new_password2:
                 st.error("Passwords do not match.")
@@ -551,11 +469,13 @@ def create_profile_page():
             if not ok:
                 if reason == "exists":
                     st.error("That username is already in use. Please choose another.")
+                elif reason == "busy":
+                    st.error("Sign-up is busy right now. Please try again in a few seconds.")
                 else:
                     st.error("Please enter a valid username and password.")
                 return
-            st.session_state.username = new_username
-            st.session_state.logged_in = True
+            s.username = new_username
+            s.logged_in = True
             nav("home")
 
     if new_password and new_password2 and (new_password != new_password2):
@@ -581,7 +501,7 @@ def log_in_page():
             nav("entry")
     with c2:
         if st.button("Log In", key="login_go"):
-            st.session_state.logged_in = True
+            state().logged_in = True
             nav("home")
 
     # Footer microcopy (small, muted, centered)
@@ -605,14 +525,13 @@ def home_page():
       - If THIS session generated an invite code and another authenticated session accepts it,
         automatically transition this session to the Reflection start page (Figure 3).
     """
+    s = state()
     display_logo()
     st.header("Home")
 
     # If you have an active invite code, allow returning to the waiting screen without regenerating
-    if st.session_state.get("invite_code"):
-        store = get_invite_store()
-        _clean_expired_invites(store)
-        meta = store.get(st.session_state.invite_code)
+    if s.invite_code:
+        meta = get_storage().get_invite(s.invite_code)
         if meta and (not meta.get("revoked")) and (not meta.get("used")):
             remaining = max(0, int(INVITE_TTL_SECONDS - (time.time() - float(meta.get("created_at", time.time())))))
             if remaining > 0:
@@ -625,23 +544,21 @@ def home_page():
 
 
     # --- AUTO-TRANSITION (Home): if the last generated invite has been accepted, continue to Reflection
-    if st.session_state.get("invite_code") and is_invite_accepted(st.session_state.invite_code):
+    if s.invite_code and is_invite_accepted(s.invite_code):
         nav("reflection_start")
         return
 
 
-    if not st.session_state.logged_in:
+    if not s.logged_in:
         st.warning("Please log in or create a profile to continue.")
         if st.button("Return to Entry", key="home_return_entry"):
             nav("entry")
         return
 
     if st.button("Create Invite", key="home_create_invite"):
-        code = generate_invite_code()
-        st.session_state.invite_code = code
-        st.session_state.invite_waiting = True
-        st.session_state.invite_accepted = False
-        register_invite(code)
+        s.invite_code = create_invite()
+        s.invite_waiting = True
+        s.invite_accepted = False
         nav("create_invite")
 
     if st.button("Enter Invite Code", key="home_enter_invite"):
@@ -657,106 +574,126 @@ def home_page():
 
 
 
+def _invite_remaining(code: str):
+    """(invite meta or {}, seconds since it was created, whole seconds left before it expires)."""
+    meta = get_storage().get_invite(code)
+    if meta is None:  # missing or already expired
+        return {}, float(INVITE_TTL_SECONDS), 0
+    elapsed = max(0.0, time.time() - float(meta["created_at"]))
+    return meta, elapsed, max(0, int(INVITE_TTL_SECONDS - elapsed))
+
+def _waiting_status(code: str) -> bool:
+    """Countdown + progressive microcopy (calm, consent-forward). Returns False once the code expired or was revoked."""
+    meta, elapsed, remaining = _invite_remaining(code)
+    mins = remaining // 60
+    secs = remaining % 60
+    st.markdown(
+        f"<div class='small-muted' style='margin-top:6px;'>Code expires in {mins:d}:{secs:02d} minutes.</div>",
+        unsafe_allow_html=True
+    )
+    if remaining <= 0 or meta.get("revoked"):
+        st.markdown(
+            "<div class='small-muted' style='margin-top:8px;'><b>This code expired.</b> Generate a new one to continue.</div>",
+            unsafe_allow_html=True
+        )
+        return False
+    if elapsed < 15:
+        msg = "Waiting for your partner to accept…"
+    elif elapsed < 45:
+        msg = "This can take a moment. Nothing is shared until both of you agree."
+    elif elapsed < 90:
+        msg = "If needed, you can generate a new code or return home."
+    else:
+        msg = "Still waiting. You can step away and come back anytime."
+    st.markdown(
+        f"<div class='small-muted' style='margin-top:8px;'>{msg}</div>",
+        unsafe_allow_html=True
+    )
+    return True
+
+def _wait_for_partner(code: str):
+    # Redrawn on every check, so the countdown and microcopy stay current
+    if not _waiting_status(code):
+        # Expired or revoked: a full rerun draws the expired page, which stops polling
+        _rerun()
+    with st.spinner("Waiting for your partner to accept…"):
+        accepted = wait_for_invite_acceptance(code, CHECK_ACCEPTANCE_INTERVAL_SECONDS)
+    if accepted:
+        nav("reflection_start")
+
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+_wait_for_partner_fragment = (
+    _fragment(run_every=CHECK_ACCEPTANCE_INTERVAL_SECONDS)(_wait_for_partner) if _fragment else None
+)
+
 def create_invite_page():
     display_logo()
+    s = state()
     st.header("Create Invite")
-    st.session_state.pause_waiting = False
+    s.pause_waiting = False
 
-    if not st.session_state.invite_code:
-        code = generate_invite_code()
-        st.session_state.invite_code = code
-        register_invite(code)
+    if not s.invite_code:
+        s.invite_code = create_invite()
 
     st.write("Share this invitation code privately with your partner:")
-    st.code(st.session_state.invite_code)
+    st.code(s.invite_code)
     st.markdown("<div class='small-muted' style='margin-top:4px;'>Tip: Select the code and copy it to share privately.</div>", unsafe_allow_html=True)
 
 
     # --- AUTO-TRANSITION: if partner accepts invite, move this originating session to Reflection automatically
-    if is_invite_accepted(st.session_state.invite_code):
+    if is_invite_accepted(s.invite_code):
         nav("reflection_start")
         return
 
     # -----------------------------
-    # Layer 1: Waiting UX (progressive microcopy + controls + countdown)
+    # Layer 1: Waiting UX (controls, then countdown + progressive microcopy)
+    # While the code is live the countdown is drawn by the waiting fragment below,
+    # so it refreshes every check; an expired/revoked code is drawn here once.
     # -----------------------------
-    store = get_invite_store()
-    _clean_expired_invites(store)
-    meta = store.get(st.session_state.invite_code, {})
-    created_at = float(meta.get("created_at", time.time()))
-    elapsed = max(0.0, time.time() - created_at)
-    remaining = max(0, int(INVITE_TTL_SECONDS - elapsed))
-
-    # Countdown
-    mins = remaining // 60
-    secs = remaining % 60
-    st.markdown(
-        f"<div class='small-muted' style='margin-top:6px;'>Code expires in {mins:d}:{secs:02d} minutes.</div>",
-        unsafe_allow_html=True
-    )
-
-    # Progressive microcopy (calm, consent-forward)
-    if remaining <= 0:
-        st.markdown(
-            "<div class='small-muted' style='margin-top:8px;'><b>This code expired.</b> Generate a new one to continue.</div>",
-            unsafe_allow_html=True
-        )
-    else:
-        if elapsed < 15:
-            msg = "Waiting for your partner to accept…"
-        elif elapsed < 45:
-            msg = "This can take a moment. Nothing is shared until both of you agree."
-        elif elapsed < 90:
-            msg = "If needed, you can generate a new code or return home."
-        else:
-            msg = "Still waiting. You can step away and come back anytime."
-        st.markdown(
-            f"<div class='small-muted' style='margin-top:8px;'>{msg}</div>",
-            unsafe_allow_html=True
-        )
-
     # Controls (always available)
     cA, cB, cC = st.columns(3)
     with cA:
         if st.button("Return to Home", key="wait_home"):
-            st.session_state.pause_waiting = True
+            s.pause_waiting = True
             nav("home")
             return
     with cB:
         if st.button("Generate New Code", key="wait_regen"):
             # Revoke old code and issue a new one
-            st.session_state.pause_waiting = False
-            revoke_invite(st.session_state.invite_code)
-            new_code = generate_invite_code()
-            st.session_state.invite_code = new_code
-            register_invite(new_code)
+            s.pause_waiting = False
+            revoke_invite(s.invite_code)
+            s.invite_code = create_invite()
             st.info("New code generated.")
-            return
     with cC:
         if st.button("Cancel Invite", key="wait_cancel"):
-            revoke_invite(st.session_state.invite_code)
-            st.session_state.invite_code = None
-            st.session_state.partner_code = ""
-            st.session_state.pause_waiting = True
+            revoke_invite(s.invite_code)
+            s.invite_code = None
+            s.partner_code = ""
+            s.pause_waiting = True
             nav("home")
             return
 
     # If accepted, transition immediately
-    if is_invite_accepted(st.session_state.invite_code):
+    if is_invite_accepted(s.invite_code):
         nav("reflection_start")
         return
 
     # If expired, stop polling (user can regenerate)
+    meta, _, remaining = _invite_remaining(s.invite_code)
     if remaining <= 0 or meta.get("revoked"):
+        _waiting_status(s.invite_code)
         return
 
     # If user chose to pause waiting (e.g., returned home), stop polling
-    if st.session_state.get("pause_waiting"):
+    if s.pause_waiting:
         return
 
-    # Spinner + periodic re-run (configurable cadence)
-    with st.spinner("Waiting for your partner to accept…"):
-        time.sleep(CHECK_ACCEPTANCE_INTERVAL_SECONDS)
+    # Wait for acceptance: consume_invite wakes this session immediately via the invite's event.
+    # With fragments, only the countdown + waiting block reruns every interval (no logo/CSS/widgets).
+    if _wait_for_partner_fragment is not None:
+        _wait_for_partner_fragment(s.invite_code)
+        return
+    _wait_for_partner(s.invite_code)
     _rerun()
 
 
@@ -778,28 +715,28 @@ def create_invite_page():
 
 def enter_invite_page():
     display_logo()
+    s = state()
     st.header("Enter Invite")
     st.write("Entering the invitation code transitions you into the full application experience.")
 
-    st.session_state.partner_code = st.text_input(
+    s.partner_code = st.text_input(
         "Invitation code",
-        value=st.session_state.partner_code,
+        value=s.partner_code,
         key="partner_code_input"
     ).strip().upper()
 
     c1, c2 = st.columns(2)
     with c1:
         if st.button("Back", key="enter_invite_back"):
-            nav("home" if st.session_state.logged_in else "entry")
+            nav("home" if s.logged_in else "entry")
     with c2:
         if st.button("Continue", key="enter_invite_continue"):
-            if not st.session_state.partner_code:
+            if not s.partner_code:
                 st.error("Please enter a code.")
                 return
 
-            is_ok, reason = validate_invite(st.session_state.partner_code)
+            is_ok, reason = consume_invite(s.partner_code)
             if is_ok:
-                consume_invite(st.session_state.partner_code)
                 nav("reflection_start")
             else:
                 if reason == "expired":
@@ -819,29 +756,34 @@ def reflection_start_page():
     c1, c2 = st.columns(2)
     with c1:
         if st.button("Back", key="refstart_back"):
-            nav("home" if st.session_state.logged_in else "entry")
+            nav("home" if state().logged_in else "entry")
     with c2:
         if st.button("Start Reflection", key="refstart_go"):
+            state().reflection_started_run = state().runs
             nav("likert")
 
 def likert_page():
     display_logo()
+    s = state()
     st.header("Personal Calibration")
 
-    for cat_i, cat in enumerate(CATEGORIES):
-        st.subheader(cat)
-        for q_i, q in enumerate(LIKERT_QUESTIONS[cat]):
-            st.session_state.likert_responses[q] = st.slider(
-                q, 1, 5, 3, key=f"likert_{cat_i}_{q_i}"
-            )
-
-    c1, c2 = st.columns(2)
-    with c1:
-        if st.button("Back", key="likert_back"):
-            nav("reflection_start")
-    with c2:
-        if st.button("Proceed", key="likert_next"):
-            nav("preview")
+    # One form: moving a slider doesn't rerun the script; answers arrive with Back/Proceed
+    with st.form("likert_form", border=False):
+        for cat_i, cat in enumerate(CATEGORIES):
+            st.subheader(cat)
+            for q_i, q in enumerate(LIKERT_QUESTIONS[cat]):
+                item = responses.item_id(cat_i, q_i)
+                s.likert[item] = st.slider(q, 1, 5, s.likert[item], key=f"likert_{cat_i}_{q_i}")
+
+        c1, c2 = st.columns(2)
+        with c1:
+            back = st.form_submit_button("Back", key="likert_back")
+        with c2:
+            proceed = st.form_submit_button("Proceed", key="likert_next")
+    if back:
+        nav("reflection_start")
+    if proceed:
+        nav("preview")
 
 def preview_page():
     display_logo()
@@ -852,11 +794,16 @@ def preview_page():
     st.write("- A wheel showing patterns")
     st.write("- Strengths, blind spots, and growth areas")
 
-    st.session_state.use_mutual = st.checkbox(
-        "Include simulated mutual reflection?",
-        value=st.session_state.use_mutual,
+    s = state()
+    shared = s.use_mutual
+    s.use_mutual = st.checkbox(
+        "Include your partner's reflection (mutual blend)?",
+        value=shared,
         key="mutual_checkbox"
     )
+    if shared and not s.use_mutual:
+        # Opting out withdraws scores already shared with the partner
+        get_pair_index().stop_sharing(_pair_key())
 
     c1, c2 = st.columns(2)
     with c1:
@@ -868,51 +815,91 @@ def preview_page():
 
 def assessment_page():
     display_logo()
+    s = state()
     st.header("Relational Assessment")
 
-    for cat_i, cat in enumerate(CATEGORIES):
-        st.subheader(cat)
-        for q_i, q in enumerate(ASSESSMENT_QUESTIONS[cat]):
-            st.session_state.assessment_responses[q] = st.slider(
-                q, 1, 5, 3, key=f"assess_{cat_i}_{q_i}"
-            )
+    with st.form("assessment_form", border=False):
+        for cat_i, cat in enumerate(CATEGORIES):
+            st.subheader(cat)
+            for q_i, q in enumerate(ASSESSMENT_QUESTIONS[cat]):
+                item = responses.item_id(cat_i, q_i)
+                s.assessment[item] = st.slider(q, 1, 5, s.assessment[item], key=f"assess_{cat_i}_{q_i}")
+
+        st.subheader("Reflection (optional)")
+        s.reflection = st.text_area(
+            "Anything you want to note about this relationship right now?",
+            value=s.reflection,
+            key="reflection_text",
+        )
 
-    c1, c2 = st.columns(2)
-    with c1:
-        if st.button("Back", key="assess_back"):
-            nav("preview")
-    with c2:
-        if st.button("Submit", key="assess_submit"):
-            if np.random.rand() < 0.1:
-                st.error("Input blocked for toxicity. Please revise.")
-            else:
-                compute_scores()
-                generate_insights()
-                nav("dashboard")
+        c1, c2 = st.columns(2)
+        with c1:
+            back = st.form_submit_button("Back", key="assess_back")
+        with c2:
+            submit = st.form_submit_button("Submit", key="assess_submit")
+    if back:
+        nav("preview")
+    if submit:
+        if get_toxicity_gate().check(s.reflection):
+            st.error("Input blocked for toxicity. Please revise.")
+        else:
+            compute_scores()
+            generate_insights()
+            get_metrics().assessment_runs.observe(s.runs - s.reflection_started_run)
+            nav("dashboard")
 
 def dashboard_page():
     display_logo()
     st.header("Dashboard")
 
-    if not st.session_state.scores:
+    s = state()
+    if not s.has_scores:
         st.warning("No results found yet. Please complete the assessment.")
         if st.button("Go to Assessment", key="dash_go_assessment"):
             nav("assessment")
         return
 
-    st.markdown(f"<div class='rgi-big'>{st.session_state.scores['RGI']:.1f}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='rgi-big'>{s.rgi:.1f}</div>", unsafe_allow_html=True)
     st.caption("Relationship Growth Index")
 
+    population = get_population()
+    if population.count >= PERCENTILE_MIN_COUNT:
+        pct = population.percentiles(s.smoothed, s.rgi)
+        st.caption(f"At or above {pct['RGI']:.0f}% of the {population.count} reflections scored on this server")
+        with st.expander("Where you stand by category", expanded=False):
+            st.dataframe([
+                {"Category": cat, "Score": round(v, 1), "Percentile": round(pct[cat])}
+                for cat, v in zip(CATEGORIES, s.smoothed)
+            ], use_container_width=True)
+
+    if s.history is not None and len(s.history) > 1:
+        st.caption("RGI trend (this session)")
+        st.line_chart(s.history.rgi(), height=160)
+
+    if s.use_mutual:
+        pairs = get_pair_index()
+        key = _pair_key()
+        if pairs.partner_of(key) is None:
+            st.info("Mutual reflection: no linked partner yet, so these scores are your self-reflection only.")
+        elif pairs.blended(key) is None:
+            st.info("Mutual reflection: waiting for your partner to share their reflection. "
+                    "Scores are yours only for now.")
+        elif pairs.version(key) != s.pair_version:
+            st.info("Your partner updated their reflection.")
+            if st.button("Update mutual scores", key="dash_update_mutual"):
+                if reblend_scores():
+                    generate_insights()
+                _rerun()
+
     # Debug/verification: show smoothing behavior (optional)
     with st.expander("Stability smoothing (EMA) details", expanded=False):
-        st.write(f"EMA alpha: {EMA_ALPHA}")
-        st.write(f"Max daily change: {MAX_DAILY_CHANGE} points/day (min floor {MIN_CHANGE_FLOOR})")
-        if st.session_state.raw_scores:
+        scoring = _scoring()
+        st.write(f"EMA alpha: {scoring.EMA_ALPHA}")
+        st.write(f"Max daily change: {scoring.MAX_DAILY_CHANGE} points/day (min floor {scoring.MIN_CHANGE_FLOOR})")
+        if s.raw is not None:
             st.caption("Raw vs smoothed category scores (prototype debug view)")
             rows = []
-            for cat in CATEGORIES:
-                raw_v = float(st.session_state.raw_scores.get(cat, np.nan))
-                sm_v = float(st.session_state.scores.get(cat, np.nan))
+            for cat, raw_v, sm_v in zip(CATEGORIES, s.raw, s.smoothed):
                 rows.append({
                     "Category": cat,
                     "Raw": round(raw_v, 1),
@@ -922,13 +909,19 @@ def dashboard_page():
             st.dataframe(rows, use_container_width=True)
 
     # RQ Wheel (multi-color, real-time per category)
-    scores = st.session_state.scores
-    fig, ax = plt.subplots(figsize=(6.3, 6.3), subplot_kw=dict(polar=True))
-    draw_rq_wheel(ax, CATEGORIES, scores)
-    st.pyplot(fig, use_container_width=True)
+    # Rendered once per (scores rounded to 0.1); reruns reuse the cached image
+    scores = s.scores()
+    if WHEEL_RENDERER == "svg":
+        with timings.time("wheel.render_svg"):
+            svg = startup.lazy_import("wheel").render_wheel_svg(scores, CATEGORIES)
+        st.markdown(f"<div class='rq-wheel'>{svg}</div>", unsafe_allow_html=True)
+    else:
+        with timings.time("wheel.render_png"):
+            png = get_wheel_renderer().render(scores)
+        st.image(png, use_container_width=True)
 
     st.subheader("Key Insights")
-    for insight in (st.session_state.insights or []):
+    for insight in session_insights():
         st.markdown(
             f"""
             <div class="insight-card">
@@ -947,6 +940,53 @@ def dashboard_page():
     if st.button("Return to Home", key="dash_home"):
         nav("home")
 
+def admin_page():
+    display_logo()
+    st.header("Performance (admin)")
+    if not is_admin():
+        st.error("This page is only available to admins.")
+        if st.button("Back", key="admin_denied_back"):
+            nav("home" if state().logged_in else "entry")
+        return
+
+    reg = get_timings()
+    st.caption(f"Wall time per call since {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(reg.started_at))} "
+               "(this process, all sessions). Page rows include the helpers called from them, "
+               "but not idle waits such as invite.wait.")
+    rows = [
+        {
+            "Name": name,
+            "Calls": s["count"],
+            "p50 ms": round(s["p50_s"] * 1000.0, 2),
+            "p95 ms": round(s["p95_s"] * 1000.0, 2),
+            "p99 ms": round(s["p99_s"] * 1000.0, 2),
+            "Max ms": round(s["max_s"] * 1000.0, 2),
+            "Total s": round(s["total_s"], 3),
+        }
+        for name, s in reg.summaries().items()
+    ]
+    if rows:
+        st.dataframe(rows, use_container_width=True)
+    else:
+        st.info("No timings recorded yet.")
+
+    with st.expander("Cold-start timings for this process", expanded=False):
+        st.code(startup.report(), language=None)
+
+    completed = get_metrics().assessment_runs
+    if completed.count:
+        st.caption(f"Script runs per completed assessment (Start Reflection to Submit): "
+                   f"{completed.sum / completed.count:.1f} on average over {completed.count:.0f} assessments")
+
+    c1, c2 = st.columns(2)
+    with c1:
+        if st.button("Back to Home", key="admin_home"):
+            nav("home")
+    with c2:
+        if st.button("Reset timings", key="admin_reset"):
+            reg.reset()
+            _rerun()
+
 # -----------------------------
 # Router
 # -----------------------------
@@ -962,7 +1002,20 @@ PAGES = {
     "preview": preview_page,
     "assessment": assessment_page,
     "dashboard": dashboard_page,
+    "admin": admin_page,
 }
 
-page = st.session_state.get("page", "entry")
-PAGES.get(page, entry_page)()
+startup.mark("script body before first page")
+page = state().page
+if page not in PAGES:
+    page = "entry"
+state().runs += 1
+get_metrics().script_runs.labels(page).inc()
+if is_admin() and page != "admin":
+    if st.sidebar.button("Performance (admin)", key="admin_open"):
+        nav("admin")
+try:
+    with startup.timed(f"first render: {page}"), timings.time(f"page.{page}"):
+        PAGES[page]()
+finally:
+    startup.print_report_once()
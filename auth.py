@@ -0,0 +1,199 @@
+import base64
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# ------------------------------------------------------------
+# RelateScore™ password hashing + login throttling (Streamlit-free)
+# - scrypt with a per-user random salt and a tunable cost (PBKDF2-SHA256
+#   fallback where OpenSSL has no scrypt); both release the GIL
+# - KDF work runs on a small bounded pool, so a login burst queues at most
+#   `max_pending` hashes and then fails fast instead of starving every session
+# - Successful verifications are cached (keyed by an HMAC, never plaintext)
+#   so repeat logins skip the KDF
+# - Token buckets throttle attempts per username and per client IP
+# Encoded hashes:
+#   scrypt$<n>$<r>$<p>$<salt b64>$<hash b64>
+#   pbkdf2_sha256$<iterations>$<salt b64>$<hash b64>
+#   <64 hex chars>  legacy unsalted SHA-256 (verify only; rehash on login)
+# ------------------------------------------------------------
+
+# cost name -> (scrypt n, pbkdf2 iterations); scrypt uses r=8, p=1 (128 * r * n bytes of memory)
+KDF_COSTS = {
+    "low": (2 ** 12, 100_000),
+    "default": (2 ** 14, 300_000),
+    "high": (2 ** 15, 600_000),
+}
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+HASH_BYTES = 32
+_SCRYPT_MAXMEM = 256 * 1024 * 1024
+HAS_SCRYPT = hasattr(hashlib, "scrypt")
+
+
+class HasherBusy(RuntimeError):
+    """Raised when the KDF pool already has max_pending hashes queued."""
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text.encode("ascii"))
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                          maxmem=_SCRYPT_MAXMEM, dklen=HASH_BYTES)
+
+def _pbkdf2(password: str, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations, dklen=HASH_BYTES)
+
+def hash_password(password: str, cost: str = "default") -> str:
+    """Salted KDF hash in the encoded format above (runs on the calling thread)."""
+    n, iterations = KDF_COSTS[cost]
+    salt = secrets.token_bytes(SALT_BYTES)
+    if HAS_SCRYPT:
+        digest = _scrypt(password, salt, n, SCRYPT_R, SCRYPT_P)
+        return f"scrypt${n}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+    digest = _pbkdf2(password, salt, iterations)
+    return f"pbkdf2_sha256${iterations}${_b64(salt)}${_b64(digest)}"
+
+def verify_password(password: str, encoded: str) -> bool:
+    """Constant-time check of `password` against any supported encoded hash."""
+    parts = (encoded or "").split("$")
+    try:
+        if parts[0] == "scrypt" and len(parts) == 6:
+            n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+            digest = _scrypt(password, _unb64(parts[4]), n, r, p)
+            return hmac.compare_digest(digest, _unb64(parts[5]))
+        if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            digest = _pbkdf2(password, _unb64(parts[2]), int(parts[1]))
+            return hmac.compare_digest(digest, _unb64(parts[3]))
+        if len(parts) == 1 and len(encoded) == 64:
+            legacy = hashlib.sha256(password.encode("utf-8")).hexdigest()
+            return hmac.compare_digest(legacy, encoded)
+    except (ValueError, TypeError):
+        return False
+    return False
+
+def needs_rehash(encoded: str, cost: str = "default") -> bool:
+    """True for legacy hashes or hashes made with a different cost than `cost`."""
+    n, iterations = KDF_COSTS[cost]
+    parts = (encoded or "").split("$")
+    if HAS_SCRYPT:
+        return not (parts[0] == "scrypt" and len(parts) == 6 and int(parts[1]) == n)
+    return not (parts[0] == "pbkdf2_sha256" and len(parts) == 4 and int(parts[1]) == iterations)
+
+
+class PasswordHasher:
+    """Runs hash/verify on a bounded worker pool, with a cache of recent successful verifications."""
+
+    def __init__(self, cost: str = "default", workers: int = 2, max_pending: int = 32,
+                 cache_size: int = 4096, cache_ttl_seconds: float = 300.0, clock=time.monotonic):
+        if cost not in KDF_COSTS:
+            raise ValueError(f"Unknown KDF cost {cost!r}; expected one of {sorted(KDF_COSTS)}")
+        self.cost = cost
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="relatescore-kdf")
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._clock = clock
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl_seconds
+        self._cache = OrderedDict()  # hmac digest -> expiry
+        self._cache_lock = threading.Lock()
+        self._cache_key = secrets.token_bytes(32)  # per process; cache keys never reveal passwords
+        self._dummy_hash = hash_password(secrets.token_hex(8), cost)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy("Too many password hashes in flight")
+        try:
+            return self._pool.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password: str) -> str:
+        return self._run(hash_password, password, self.cost)
+
+    def _cache_token(self, username: str, password: str, encoded: str) -> bytes:
+        msg = "\0".join((username, encoded, password)).encode("utf-8")
+        return hmac.new(self._cache_key, msg, hashlib.sha256).digest()
+
+    def verify(self, password: str, encoded: str | None, username: str = "") -> bool:
+        """Verifies against `encoded`; with encoded=None burns the same KDF time and returns False."""
+        if encoded is None:
+            # Unknown user: same work as a real check so timing doesn't reveal which usernames exist
+            self._run(verify_password, password, self._dummy_hash)
+            return False
+
+        token = self._cache_token(username, password, encoded)
+        now = self._clock()
+        with self._cache_lock:
+            expiry = self._cache.get(token)
+            if expiry is not None:
+                if expiry > now:
+                    self._cache.move_to_end(token)
+                    return True
+                del self._cache[token]
+
+        ok = self._run(verify_password, password, encoded)
+        if ok:
+            with self._cache_lock:
+                self._cache[token] = now + self._cache_ttl
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return ok
+
+    def needs_rehash(self, encoded: str) -> bool:
+        return needs_rehash(encoded, self.cost)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False)
+
+
+# -----------------------------
+# Attempt throttling
+# -----------------------------
+class TokenBucketLimiter:
+    """Per-key token buckets: `capacity` attempts in a burst, refilled at `refill_per_second`."""
+
+    def __init__(self, capacity: float, refill_per_second: float, max_keys: int = 100_000,
+                 clock=time.monotonic):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self._max_keys = max_keys
+        self._clock = clock
+        self._buckets = OrderedDict()  # key -> [tokens, last_ts]; oldest-touched first
+        self._lock = threading.Lock()
+
+    def _refilled(self, key, now: float):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return [self.capacity, now]
+        tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_per_second)
+        return [tokens, now]
+
+    def allow(self, key, cost: float = 1.0) -> bool:
+        """Takes `cost` tokens from `key`'s bucket if available."""
+        now = self._clock()
+        with self._lock:
+            bucket = self._refilled(key, now)
+            allowed = bucket[0] >= cost
+            if allowed:
+                bucket[0] -= cost
+            self._buckets[key] = bucket
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+            return allowed
+
+    def retry_after(self, key, cost: float = 1.0) -> float:
+        """Seconds until `key` has `cost` tokens again."""
+        with self._lock:
+            tokens = self._refilled(key, self._clock())[0]
+        return max(0.0, (cost - tokens) / self.refill_per_second)
+
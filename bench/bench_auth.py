@@ -0,0 +1,83 @@
+"""
+Login throughput per KDF cost setting.
+
+For each cost in auth.KDF_COSTS, a burst of concurrent logins (one thread
+per simulated session) verifies passwords through a PasswordHasher with a
+bounded worker pool. Reports logins/s for cold verifications (full KDF)
+and for repeat logins served from the verification cache, plus how many
+attempts were shed with HasherBusy.
+
+Run from the repo root:
+    python -m bench.bench_auth --logins 200 --sessions 16 --workers 2
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+from auth import KDF_COSTS, HasherBusy, PasswordHasher, hash_password
+
+
+def run_burst(hasher: PasswordHasher, users: list, sessions: int) -> dict:
+    """`sessions` threads share the list of (username, password, encoded) logins."""
+    lock = threading.Lock()
+    next_i = [0]
+    stats = {"ok": 0, "busy": 0, "failed": 0}
+
+    def worker():
+        while True:
+            with lock:
+                i = next_i[0]
+                next_i[0] += 1
+            if i >= len(users):
+                return
+            username, password, encoded = users[i]
+            try:
+                ok = hasher.verify(password, encoded, username=username)
+                key = "ok" if ok else "failed"
+            except HasherBusy:
+                key = "busy"
+            with lock:
+                stats[key] += 1
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats["seconds"] = time.perf_counter() - t0
+    stats["logins_per_s"] = stats["ok"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200, help="logins per burst")
+    parser.add_argument("--sessions", type=int, default=16, help="concurrent sessions (threads)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="KDF pool size")
+    parser.add_argument("--max-pending", type=int, default=64, help="KDF queue bound before HasherBusy")
+    parser.add_argument("--costs", nargs="*", default=list(KDF_COSTS), choices=list(KDF_COSTS))
+    args = parser.parse_args(argv)
+
+    print(f"{args.logins} logins, {args.sessions} sessions, {args.workers} KDF workers, "
+          f"max_pending={args.max_pending}, cpus={os.cpu_count()}")
+    print(f"{'cost':<8} {'hash ms':>8} {'cold logins/s':>14} {'cached logins/s':>16} {'shed':>6}")
+    for cost in args.costs:
+        # Distinct users so every cold login pays the full KDF
+        t0 = time.perf_counter()
+        users = [(f"user{i}", f"pw{i}", hash_password(f"pw{i}", cost)) for i in range(args.logins)]
+        hash_ms = (time.perf_counter() - t0) * 1000.0 / args.logins
+
+        hasher = PasswordHasher(cost=cost, workers=args.workers, max_pending=args.max_pending)
+        cold = run_burst(hasher, users, args.sessions)
+        cached = run_burst(hasher, users, args.sessions)
+        hasher.shutdown()
+        print(f"{cost:<8} {hash_ms:>8.1f} {cold['logins_per_s']:>14.1f} {cached['logins_per_s']:>16.0f} "
+              f"{cold['busy']:>6d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Invite code issuing: collision rate against large live stores, and issue latency.
+
+Fills a store with N live codes, then issues M more through InviteCodeIssuer
+and reports the measured collision rate next to the expected N / 36**length.
+At the app's 8 symbols collisions are too rare to observe, so shorter lengths
+are run too to check the rate really tracks store size. Also times issue()
+with the background-refilled pool vs generating every code inline, and the
+old random.choices() generator for reference.
+
+Run from the repo root:
+    python -m bench.bench_invite_codes --sizes 10000 100000 1000000 --lengths 4 5 6 8
+"""
+import argparse
+import random
+import string
+import sys
+import time
+
+import numpy as np
+
+from codes import ALPHABET, InviteCodeIssuer, random_codes
+from storage import MemoryStorage
+
+
+def fill(size: int, length: int) -> MemoryStorage:
+    storage = MemoryStorage(invite_ttl_seconds=3600.0)
+    now = time.time()
+    issued = 0
+    while issued < size:
+        for code in random_codes(min(10_000, size - issued), length):
+            issued += storage.register_new_invite(code, now)
+    return storage
+
+
+def latencies_us(issue, n: int) -> np.ndarray:
+    out = np.empty(n)
+    for i in range(n):
+        t0 = time.perf_counter()
+        issue()
+        out[i] = time.perf_counter() - t0
+    return out * 1e6
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="live codes already in the store")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[4, 5, 6, 8])
+    parser.add_argument("--issues", type=int, default=20_000, help="codes issued per run")
+    args = parser.parse_args(argv)
+
+    print(f"{'length':>6} {'live':>9} {'issued':>7} {'collisions':>10} {'rate':>10} {'expected':>10} {'us/issue':>9}")
+    for length in args.lengths:
+        space = len(ALPHABET) ** length
+        for size in args.sizes:
+            if size + args.issues > space // 2:
+                continue
+            storage = fill(size, length)
+            issuer = InviteCodeIssuer(storage.register_new_invite, length=length)
+            t0 = time.perf_counter()
+            for _ in range(args.issues):
+                issuer.issue()
+            us = (time.perf_counter() - t0) * 1e6 / args.issues
+            stats = issuer.stats()
+            # Live codes grow from size to size + issues over the run
+            expected = (size + args.issues / 2) / space
+            print(f"{length:>6} {size:>9} {stats['issued']:>7} {stats['collisions']:>10} "
+                  f"{stats['collision_rate']:>10.2e} {expected:>10.2e} {us:>9.2f}")
+
+    storage = fill(args.sizes[-1], 8)
+    pooled = InviteCodeIssuer(storage.register_new_invite)
+    inline = InviteCodeIssuer(storage.register_new_invite, pool_size=0, low_water=0, background=False)
+    old = lambda: storage.register_invite("".join(random.choices(string.ascii_uppercase + string.digits, k=8)))
+    print(f"\nissue latency, {args.sizes[-1]} live codes, length 8 (us)")
+    print(f"{'':>22} {'p50':>7} {'p99':>7} {'max':>8}")
+    for name, fn in (("pool (background)", pooled.issue), ("inline secrets", inline.issue),
+                     ("random.choices (old)", old)):
+        lat = latencies_us(fn, args.issues)
+        print(f"{name:>22} {np.percentile(lat, 50):>7.2f} {np.percentile(lat, 99):>7.2f} {lat.max():>8.1f}")
+    print(f"pool misses: {pooled.stats()['pool_misses']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Hot-path overhead of the metrics registry.
+
+Times each update the app makes (counter inc, labeled counter inc,
+histogram observe and the histogram timer) in ns/op next to an empty call
+and a plain lock-guarded counter, then runs the same counter from many
+threads at once. Finally compares an invite register+claim with and
+without its metric updates, which is the overhead the app actually pays.
+
+Run from the repo root:
+    python -m bench.bench_metrics --ops 1000000 --threads 8
+"""
+import argparse
+import sys
+import threading
+import time
+
+from metrics import RelateScoreMetrics
+from storage import MemoryStorage
+
+
+def ns_per_op(fn, ops: int) -> float:
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(ops):
+        fn()
+    return (time.perf_counter() - t0) * 1e9 / ops
+
+def threaded_ops_per_s(fn, ops: int, threads: int) -> float:
+    per_thread = ops // threads
+    start = threading.Barrier(threads + 1)
+
+    def worker():
+        start.wait()
+        for _ in range(per_thread):
+            fn()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for t in workers:
+        t.join()
+    return per_thread * threads / (time.perf_counter() - t0)
+
+
+class LockedCounter:
+    """Reference point: the obvious thread-safe counter."""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self):
+        with self._lock:
+            self.value += 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ops", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    m = RelateScoreMetrics()
+    logins = m.registry._metrics["relatescore_logins_total"]
+    locked = LockedCounter()
+    ok_child = m.logins["ok"]
+
+    def timer_block():
+        with m.compute_scores_seconds.time():
+            pass
+
+    cases = [
+        ("empty call", lambda: None),
+        ("locked int counter", locked.inc),
+        ("counter inc (pre-resolved)", m.invites_registered.inc),
+        ("labeled inc (dict lookup)", lambda: m.invites_consumed["ok"].inc()),
+        ("labeled inc (labels() each call)", lambda: logins.labels("ok").inc()),
+        ("histogram observe", lambda: m.login_seconds.observe(0.003)),
+        ("histogram timer block", timer_block),
+    ]
+    print(f"{'single thread':<34} {'ns/op':>8}")
+    for name, fn in cases:
+        print(f"{name:<34} {ns_per_op(fn, args.ops):>8.0f}")
+
+    print(f"\n{args.threads} threads, {args.ops} ops total{'':<8} {'ops/s':>12}")
+    before = ok_child.value
+    for name, fn in (("locked int counter", locked.inc), ("metrics counter", ok_child.inc)):
+        print(f"{name:<34} {threaded_ops_per_s(fn, args.ops, args.threads):>12.0f}")
+    counted = ok_child.value - before
+    print(f"metrics counter lost no updates: {counted == (args.ops // args.threads) * args.threads} ({counted:.0f})")
+
+    # What the app pays: register_invite + consume_invite with and without metrics
+    n = min(args.ops, 200_000)
+    codes = [f"M{i:08d}" for i in range(n)]
+    for label, instrumented in (("invite register+claim", False), ("  + metric updates", True)):
+        storage = MemoryStorage(3600.0)
+        t0 = time.perf_counter()
+        for code in codes:
+            storage.register_invite(code)
+            ok, reason = storage.claim_invite(code)
+            if instrumented:
+                m.invites_registered.inc()
+                m.invites_consumed[reason].inc()
+        print(f"{label:<34} {(time.perf_counter() - t0) * 1e9 / n:>8.0f} ns/lifecycle")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
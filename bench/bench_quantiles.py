@@ -0,0 +1,90 @@
+"""
+Population percentile sketches: update cost, query latency, accuracy, merging.
+
+Feeds N synthetic category scores into a KLLSketch and reports ns per update,
+microseconds per percentile lookup (e.g. "63.4 in Communication Style"), the
+worst rank error against the exact sorted answer, and the sketch's retained
+items and JSON size. Then splits the same stream over P "processes", ships
+each sketch through to_json/from_json and merges them, and checks the merged
+error too. Sorting everything per request is timed alongside for reference.
+
+Run from the repo root:
+    python -m bench.bench_quantiles --n 1000000 --processes 8 --k 200
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from quantiles import KLLSketch, PopulationSketches
+
+
+def max_rank_error(sketch: KLLSketch, sorted_values: np.ndarray, probes: np.ndarray) -> float:
+    exact = np.searchsorted(sorted_values, probes, side="right") / len(sorted_values)
+    return max(abs(sketch.rank(p) - e) for p, e in zip(probes.tolist(), exact.tolist()))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000, help="scores fed to the sketch")
+    parser.add_argument("--processes", type=int, default=8, help="sketches merged in the merge test")
+    parser.add_argument("--k", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    values = rng.normal(60.0, 12.0, args.n).clip(20.0, 90.0)
+    sorted_values = np.sort(values)
+    probes = np.linspace(20.0, 90.0, 141)
+    stream = values.tolist()
+
+    sketch = KLLSketch(args.k, seed=args.seed)
+    t0 = time.perf_counter()
+    sketch.update_many(stream)
+    update_ns = (time.perf_counter() - t0) * 1e9 / args.n
+
+    sketch.percentile(63.4)  # builds the sorted view once
+    t0 = time.perf_counter()
+    for _ in range(args.queries):
+        sketch.percentile(63.4)
+    query_us = (time.perf_counter() - t0) * 1e6 / args.queries
+
+    t0 = time.perf_counter()
+    exact = np.searchsorted(np.sort(values), 63.4, side="right") / args.n
+    sort_ms = (time.perf_counter() - t0) * 1e3
+
+    print(f"n={args.n} k={args.k}")
+    print(f"update                 {update_ns:>10.0f} ns/value")
+    print(f"percentile(63.4)       {query_us:>10.2f} us  -> {sketch.percentile(63.4):.2f} (exact {100 * exact:.2f})")
+    print(f"sort + search (exact)  {sort_ms * 1e3:>10.0f} us")
+    print(f"retained items         {sketch._size:>10d}  JSON {len(json.dumps(sketch.to_dict()))} bytes")
+    print(f"max rank error         {max_rank_error(sketch, sorted_values, probes):>10.4f}")
+
+    # Per-process sketches -> JSON -> merged
+    chunks = np.array_split(values, args.processes)
+    t0 = time.perf_counter()
+    shipped = []
+    for i, chunk in enumerate(chunks):
+        pop = PopulationSketches(["Communication Style"], k=args.k, seed=args.seed + i)
+        for v in chunk.tolist():
+            pop.update([v], v)
+        shipped.append(pop.to_json())
+    build_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    merged = PopulationSketches.from_json(shipped[0])
+    for text in shipped[1:]:
+        merged.merge(PopulationSketches.from_json(text))
+    merge_ms = (time.perf_counter() - t0) * 1e3
+    merged_sketch = merged.snapshot()["Communication Style"]
+    print(f"\n{args.processes} process sketches built in {build_s:.1f}s, "
+          f"JSON round trip + merge {merge_ms:.1f} ms")
+    print(f"merged n={merged.count}  max rank error {max_rank_error(merged_sketch, sorted_values, probes):.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
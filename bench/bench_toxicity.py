@@ -0,0 +1,125 @@
+"""
+Toxicity gate throughput in texts per second.
+
+Scans synthetic reflections (a few sentences each, some with blocklist terms)
+through toxicity.ToxicityGate. Reports cold scans (every text new, so the
+Aho-Corasick pass runs) and repeat scans served from the result cache. Then
+compares against a naive per-term substring scan as the blocklist grows, which
+shows the automaton's cost does not depend on how many terms there are.
+
+Before timing anything it checks the default gate against KNOWN_CASES
+(contractions, plurals/suffixes, elongation, and everyday words that must
+pass) and exits 1 if any result differs.
+
+Run from the repo root:
+    python -m bench.bench_toxicity --texts 20000
+"""
+import argparse
+import random
+import sys
+import time
+
+from toxicity import DEFAULT_BLOCKLIST, DEFAULT_PHRASES, ToxicityGate, normalize
+
+VOCAB = (
+    "we talked about the week and i felt heard when you listened to me after work "
+    "sometimes it is hard to say what i need but i am trying to be more open with you "
+    "the argument on sunday was about money and plans and it left me tired"
+).split()
+
+
+# text -> terms the default gate must report (empty: must pass)
+KNOWN_CASES = {
+    "you are stupid": ("you are stupid",),
+    "you're stupid": ("you are stupid",),
+    "You’re a loser": ("you are a loser",),
+    "ur a loser": ("you are a loser",),
+    "u r pathetic": ("you are pathetic",),
+    "i hate u": ("i hate you",),
+    "idiots": ("idiot",),
+    "morons": ("moron",),
+    "fucker": ("fuck",),
+    "bitches": ("bitch",),
+    "bullshit": ("bullshit",),
+    "stuuupiiid idiot": ("idiot",),
+    "you are stuuupid": ("you are stupid",),
+    "fuuuck": ("fuck",),
+    "sh!t happens": ("shit",),
+    "I feel looser and calmer now": (),
+    "I was a loser at cards": (),
+    "I felt useless and stupid": (),
+    "our plans for your birthday": (),
+    "that was an idiotic plan of mine": (),
+    "class": (),
+}
+
+
+def check_known_cases() -> list:
+    gate = ToxicityGate(cache_size=0)
+    return [f"{text!r}: expected {want}, got {got}"
+            for text, want in KNOWN_CASES.items() if (got := gate.check(text)) != want]
+
+
+def make_texts(n: int, toxic_rate: float, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    terms = DEFAULT_BLOCKLIST + DEFAULT_PHRASES
+    texts = []
+    for i in range(n):
+        words = rng.choices(VOCAB, k=rng.randint(20, 60))
+        if rng.random() < toxic_rate:
+            words.insert(rng.randrange(len(words)), rng.choice(terms))
+        texts.append(f"{' '.join(words)} #{i}")  # unique, so cold scans never hit the cache
+    return texts
+
+def texts_per_second(fn, texts: list) -> tuple:
+    t0 = time.perf_counter()
+    flagged = sum(1 for t in texts if fn(t))
+    seconds = time.perf_counter() - t0
+    return len(texts) / seconds, flagged
+
+def synthetic_terms(n: int, seed: int = 11) -> tuple:
+    rng = random.Random(seed)
+    return tuple("".join(rng.choices("bcdfghjklmnpqrstvwxz", k=rng.randint(5, 9))) for _ in range(n))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--texts", type=int, default=20_000, help="reflections per run")
+    parser.add_argument("--toxic-rate", type=float, default=0.05, help="share of texts containing a term")
+    parser.add_argument("--extra-terms", type=int, nargs="*", default=[0, 1_000, 10_000],
+                        help="synthetic terms added to the default blocklist")
+    args = parser.parse_args(argv)
+
+    errors = check_known_cases()
+    for e in errors:
+        print("FAIL:", e)
+    if errors:
+        return 1
+    print(f"known cases: {len(KNOWN_CASES)} OK")
+
+    texts = make_texts(args.texts, args.toxic_rate)
+    print(f"{args.texts} texts, ~{sum(map(len, texts)) // len(texts)} chars each, toxic rate {args.toxic_rate}")
+
+    gate = ToxicityGate(cache_size=args.texts)
+    cold, flagged = texts_per_second(gate.check, texts)
+    cached, _ = texts_per_second(gate.check, texts)
+    print(f"gate: {cold:>10.0f} texts/s cold  {cached:>10.0f} texts/s cached  flagged {flagged}")
+
+    print(f"{'terms':>7} {'automaton texts/s':>18} {'naive texts/s':>14}")
+    for extra in args.extra_terms:
+        blocklist = DEFAULT_BLOCKLIST + synthetic_terms(extra)
+        gate = ToxicityGate(blocklist=blocklist, cache_size=0)
+        keys = [normalize(t) for t in gate.terms]
+
+        def naive(text, keys=keys):
+            norm = normalize(text)
+            return any(k in norm for k in keys)
+
+        ac_rate, _ = texts_per_second(gate.check, texts)
+        naive_rate, _ = texts_per_second(naive, texts)
+        print(f"{len(gate.terms):>7d} {ac_rate:>18.0f} {naive_rate:>14.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
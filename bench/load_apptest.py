@@ -0,0 +1,255 @@
+"""
+Headless multi-session load test: N couples driven concurrently through app.py.
+
+Every simulated user is its own streamlit.testing.v1.AppTest session on its
+own thread, and all of them share this process's st.cache_resource stores,
+exactly like sessions on one Streamlit Cloud instance. Each couple pairs up
+through the shared invite store:
+
+    inviter: entry -> create_profile -> home -> create_invite (waits for partner)
+             -> reflection_start -> likert -> preview -> assessment -> dashboard
+    partner: entry -> create_profile -> home -> enter_invite (inviter's code)
+             -> reflection_start -> likert -> preview -> assessment -> dashboard
+
+AppTest sets up a process-wide test runtime for every run, so two runs
+cannot execute at the same moment: script runs are serialized with a lock,
+while the sessions interleave step by step. The shared stores therefore see
+every session live at once, but Python-level contention between script
+threads is not modeled (start several harness processes for that).
+
+Slider changes are replayed the way a browser sends them: a slider outside a
+form reruns the script on every change, one inside a form only when the form
+is submitted.
+
+Reports script latency percentiles per page (each AppTest run, grouped by the
+page it ended on; a run that navigates includes the st.rerun into the next
+page), the total number of script runs and reruns, script runs per completed
+assessment, and peak RSS.
+
+Run from the repo root:
+    python -m bench.load_apptest --couples 8
+    python -m bench.load_apptest --couples 32 --kdf-cost low --storage sqlite:///tmp/load.db
+"""
+import argparse
+import os
+import queue
+import random
+import resource
+import sys
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from session import SESSION_KEY
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+PERCENTILES = (50, 90, 95, 99)
+_RUN_LOCK = threading.Lock()  # one AppTest script run at a time (see module docstring)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024.0 * 1024.0) if sys.platform == "darwin" else rss / 1024.0
+
+
+class LoadStats:
+    """Thread-safe per-page latency samples plus run/rerun/error counters."""
+
+    def __init__(self):
+        self.latency = defaultdict(list)  # page -> seconds per AppTest run
+        self.runs = 0
+        self.reruns = 0   # st.rerun calls (page navigations) inside those runs
+        self.completed = 0
+        self.assessment_runs = []  # script runs (incl. reruns) from Start Reflection to the dashboard
+        self.errors = []
+        self._lock = threading.Lock()
+
+    def record(self, page: str, seconds: float, navigated: bool) -> None:
+        with self._lock:
+            self.latency[page].append(seconds)
+            self.runs += 1
+            self.reruns += int(navigated)
+
+    def assessment(self, runs: int) -> None:
+        with self._lock:
+            self.assessment_runs.append(runs)
+
+    def done(self) -> None:
+        with self._lock:
+            self.completed += 1
+
+    def error(self, who: str, message: str) -> None:
+        with self._lock:
+            self.errors.append(f"{who}: {message}")
+
+
+class SimUser:
+    def __init__(self, name: str, stats: LoadStats, timeout: float, rng: random.Random):
+        from streamlit.testing.v1 import AppTest
+
+        self.name = name
+        self.stats = stats
+        self.rng = rng
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.runs = 0  # script executions of this session, reruns included
+
+    @property
+    def session(self):
+        return self.at.session_state[SESSION_KEY] if SESSION_KEY in self.at.session_state else None
+
+    @property
+    def page(self) -> str:
+        return self.session.page if self.session is not None else "entry"
+
+    def run(self) -> str:
+        before = self.page
+        with _RUN_LOCK:
+            t0 = time.perf_counter()
+            self.at.run()
+            seconds = time.perf_counter() - t0
+        if self.at.exception:
+            raise RuntimeError(self.at.exception[0].message)
+        navigated = self.page != before
+        self.runs += 1 + int(navigated)
+        self.stats.record(self.page, seconds, navigated=navigated)
+        return self.page
+
+    def click(self, key: str) -> str:
+        self.at.button(key=key).click()
+        return self.run()
+
+    def expect(self, page: str) -> None:
+        if self.page != page:
+            raise RuntimeError(f"expected page {page!r}, on {self.page!r}")
+
+    # Flow steps
+    def sign_up(self, password: str = "load-test-pw") -> None:
+        self.run()
+        self.click("entry_create")
+        self.at.text_input(key="cp_username").input(self.name)
+        self.at.text_input(key="cp_password").input(password)
+        self.at.text_input(key="cp_password2").input(password)
+        self.at.checkbox(key="consent_checkbox").check()
+        self.run()
+        self.click("create_continue")
+        self.expect("home")
+
+    def _answer_sliders(self) -> None:
+        for key in [slider.key for slider in self.at.slider]:
+            slider = self.at.slider(key=key)
+            slider.set_value(self.rng.randint(1, 5))
+            if not slider.proto.form_id:  # the browser would rerun right away
+                self.run()
+
+    def reflect(self, use_mutual: bool = True) -> None:
+        self.expect("reflection_start")
+        runs_before = self.runs
+        self.click("refstart_go")
+        self._answer_sliders()
+        self.click("likert_next")
+        if use_mutual:
+            self.at.checkbox(key="mutual_checkbox").check()
+        self.click("preview_next")
+        self._answer_sliders()
+        self.click("assess_submit")
+        self.expect("dashboard")
+        self.stats.assessment(self.runs - runs_before)
+
+
+def run_inviter(user: SimUser, codes: queue.Queue, wait_seconds: float) -> None:
+    user.sign_up()
+    user.click("home_create_invite")  # waits up to RELATESCORE_ACCEPTANCE_CHECK_SECONDS for the partner
+    codes.put(user.session.invite_code)
+    deadline = time.monotonic() + wait_seconds
+    while user.page != "reflection_start":
+        if time.monotonic() > deadline:
+            raise RuntimeError("partner never accepted the invite")
+        user.run()
+    user.reflect()
+
+def run_partner(user: SimUser, codes: queue.Queue, wait_seconds: float) -> None:
+    user.sign_up()
+    code = codes.get(timeout=wait_seconds)
+    user.click("home_enter_invite")
+    user.at.text_input(key="partner_code_input").input(code)
+    user.click("enter_invite_continue")
+    user.reflect()
+
+def _guarded(flow, user: SimUser, codes: queue.Queue, wait_seconds: float) -> None:
+    try:
+        flow(user, codes, wait_seconds)
+        user.stats.done()
+    except Exception as exc:  # keep the other sessions running; report at the end
+        user.stats.error(user.name, f"{type(exc).__name__}: {exc}")
+        if flow is run_inviter:
+            codes.put(None)
+
+
+def run_load(couples: int, timeout: float, wait_seconds: float, seed: int) -> tuple:
+    stats = LoadStats()
+    tag = f"{int(time.time()) % 100000}"
+    threads = []
+    for c in range(couples):
+        codes = queue.Queue(maxsize=1)
+        for role, flow in (("a", run_inviter), ("b", run_partner)):
+            user = SimUser(f"load{tag}_{c}{role}", stats, timeout, random.Random(seed * 1000 + c))
+            threads.append(threading.Thread(target=_guarded, args=(flow, user, codes, wait_seconds),
+                                            name=user.name))
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return stats, time.perf_counter() - t0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--couples", type=int, default=8, help="concurrent couples (2 sessions each)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per AppTest run timeout (s)")
+    parser.add_argument("--wait", type=float, default=120.0, help="max wait for a partner (s)")
+    parser.add_argument("--kdf-cost", choices=("low", "default", "high"), default=None,
+                        help="RELATESCORE_KDF_COST for the run")
+    parser.add_argument("--storage", default=None, help="RELATESCORE_STORAGE for the run")
+    parser.add_argument("--wheel", choices=("matplotlib", "svg"), default=None, help="RELATESCORE_WHEEL")
+    parser.add_argument("--acceptance-check", type=float, default=0.25,
+                        help="RELATESCORE_ACCEPTANCE_CHECK_SECONDS: how long one create_invite run "
+                             "waits for the partner (it holds the run lock meanwhile)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    for env, value in (("RELATESCORE_KDF_COST", args.kdf_cost), ("RELATESCORE_STORAGE", args.storage),
+                       ("RELATESCORE_WHEEL", args.wheel)):
+        if value:
+            os.environ[env] = value
+    os.environ["RELATESCORE_ACCEPTANCE_CHECK_SECONDS"] = str(args.acceptance_check)
+    os.environ.setdefault("RELATESCORE_STARTUP_REPORT", "0")
+
+    rss_before = peak_rss_mb()
+    stats, seconds = run_load(args.couples, args.timeout, args.wait, args.seed)
+
+    sessions = 2 * args.couples
+    print(f"{args.couples} couples ({sessions} sessions) in {seconds:.1f}s: "
+          f"{stats.completed}/{sessions} reached the dashboard, {len(stats.errors)} failed")
+    print(f"script runs: {stats.runs}  reruns (navigations): {stats.reruns}  "
+          f"total executions: {stats.runs + stats.reruns}")
+    if stats.assessment_runs:
+        print(f"script runs per completed assessment: {np.mean(stats.assessment_runs):.1f} "
+              f"(Start Reflection -> dashboard)")
+    print(f"peak RSS: {peak_rss_mb():.1f} MB (before load: {rss_before:.1f} MB)")
+    header = "".join(f"{'p' + str(p) + ' ms':>10}" for p in PERCENTILES)
+    print(f"\n{'page':<18} {'runs':>6}{header}{'max ms':>10}")
+    for page, samples in sorted(stats.latency.items()):
+        ms = np.asarray(samples) * 1000.0
+        cols = "".join(f"{v:>10.1f}" for v in np.percentile(ms, PERCENTILES))
+        print(f"{page:<18} {len(ms):>6d}{cols}{ms.max():>10.1f}")
+    for err in stats.errors[:20]:
+        print("error:", err)
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
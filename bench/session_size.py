@@ -0,0 +1,139 @@
+"""
+Bytes per session: the loose st.session_state keys vs the typed Session model.
+
+Builds the state one browser session holds after signing up, answering both
+questionnaires and submitting N times, in two layouts:
+
+    keys     the previous layout: ~22 top-level st.session_state keys, scores
+             as {category: float} dicts (stored three times: scores,
+             prev_scores, scores_before) and insights as lists of dicts
+    session  one session.Session under a single key: slotted dataclass,
+             array('d') score vectors, array('b') insight rule indices
+
+Sizes are deep sys.getsizeof totals of everything the session owns. Objects
+shared by all sessions (code literals such as key and category names, the
+cached insight texts, interned small ints, None/True/False) are not counted,
+since they cost nothing per extra session. Streamlit's own per-key
+bookkeeping is not included either, so the key-count column is the other
+half of the story.
+
+Run from the repo root:
+    python -m bench.session_size --submissions 1 5 20
+"""
+import argparse
+import gc
+import sys
+import time
+import types
+from array import array
+
+import numpy as np
+
+import responses
+import scoring
+from content import CATEGORIES
+from history import ScoreRing
+from insights import InsightEngine
+from session import SESSION_KEY, Session, score_vector
+
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType)
+
+
+def deep_sizeof(root, shared_ids: set) -> int:
+    """sys.getsizeof summed over all objects reachable from root, skipping shared ones."""
+    seen = set(shared_ids)
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SKIP_TYPES):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, np.ndarray) and obj.base is not None:
+            stack.append(obj.base)
+        stack.extend(gc.get_referents(obj))
+    return total
+
+def shared_objects(engine: InsightEngine, literals) -> set:
+    """ids of per-process objects every session merely references."""
+    shared = [None, True, False, *range(-5, 257), *CATEGORIES, *literals]
+    for insight in engine._text.values():
+        shared.append(insight)
+        shared.extend(insight.values())
+    return {id(o) for o in shared}
+
+
+def simulate(submissions: int, rng: np.random.Generator, engine: InsightEngine):
+    """Yields (raw, smoothed, rgi, ts, prev) the way compute_scores produces them."""
+    prev, prev_ts = None, None
+    ts = time.time() - submissions * 86400.0
+    for _ in range(submissions):
+        likert = array("b", rng.integers(1, 6, responses.N_ITEMS).tolist())
+        assess = array("b", rng.integers(1, 6, responses.N_ITEMS).tolist())
+        raw = scoring.clip_scores(scoring.self_scores(likert, assess)[0])
+        smoothed = raw if prev is None else scoring.smooth_step(raw, prev, scoring.dt_days(ts, prev_ts))
+        yield likert, assess, raw, smoothed, float(scoring.rgi(smoothed)), ts, prev
+        prev, prev_ts = smoothed, ts
+        ts += 86400.0
+
+
+def keys_layout(submissions: int, rng, engine: InsightEngine) -> dict:
+    state = {
+        "page": "dashboard", "logged_in": True, "consent_accepted": True, "username": "user0001",
+        "invite_waiting": True, "invite_accepted": False, "invite_code": "AB12CD34", "partner_code": "",
+        "use_mutual": False, "pair_session_key": "", "pair_version": None,
+        "likert_responses": responses.new_buffer(), "assessment_responses": responses.new_buffer(),
+        "reflection": "", "scores": None, "raw_scores": None, "prev_scores": None, "prev_scores_ts": None,
+        "score_history": ScoreRing(), "insights": None, "scores_before": None, "pause_waiting": False,
+    }
+    for likert, assess, raw, smoothed, rgi, ts, prev in simulate(submissions, rng, engine):
+        state["likert_responses"], state["assessment_responses"] = likert, assess
+        state["raw_scores"] = scoring.scores_to_dict(raw)
+        smoothed_d = scoring.scores_to_dict(smoothed)
+        state["scores"] = {**smoothed_d, "RGI": rgi}
+        state["scores_before"] = dict(state["prev_scores"]) if state["prev_scores"] else None
+        state["prev_scores"] = dict(smoothed_d)
+        state["prev_scores_ts"] = ts
+        state["pair_version"] = 1
+        state["score_history"].append(ts, raw, smoothed, rgi)
+        state["insights"] = engine.insights(smoothed, prev)[0]
+    return state
+
+def session_layout(submissions: int, rng, engine: InsightEngine) -> dict:
+    s = Session(page="dashboard", logged_in=True, consent_accepted=True, username="user0001",
+                invite_waiting=True, invite_code="AB12CD34", history=ScoreRing())
+    for likert, assess, raw, smoothed, rgi, ts, prev in simulate(submissions, rng, engine):
+        s.likert, s.assessment = likert, assess
+        s.before = s.smoothed
+        s.raw, s.smoothed, s.rgi, s.scored_at = score_vector(raw), score_vector(smoothed), rgi, ts
+        s.pair_version = 1
+        s.history.append(ts, raw, smoothed, rgi)
+        s.insight_rules = array("b", engine.evaluate(s.smoothed, s.before)[0].tolist())
+    return {SESSION_KEY: s}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--submissions", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    engine = InsightEngine()
+    print(f"{'submissions':>11} {'layout':<8} {'keys':>5} {'bytes':>8} {'w/o history':>12}")
+    for n in args.submissions:
+        sizes = {}
+        for name, build in (("keys", keys_layout), ("session", session_layout)):
+            state = build(n, np.random.default_rng(args.seed), engine)
+            literals = list(state) + ["dashboard", "user0001", "AB12CD34", ""]
+            shared = shared_objects(engine, literals)
+            ring = state.get("score_history") or state.get(SESSION_KEY).history
+            total = deep_sizeof(state, shared)
+            sizes[name] = total
+            print(f"{n:>11} {name:<8} {len(state):>5} {total:>8} {total - deep_sizeof(ring, shared):>12}")
+        print(f"{'':>11} session/keys: {sizes['session'] / sizes['keys']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Multi-threaded stress test for the shared invite/user stores.
+
+Many threads (one per simulated Streamlit session) race to claim the same
+invite codes and register the same usernames. Consume-once and
+register-once must hold: every code is claimed exactly once and every
+username is created exactly once.
+
+Run from the repo root:
+    python -m bench.stress_stores --threads 32 --codes 2000
+"""
+import argparse
+import sys
+import threading
+import time
+from collections import Counter
+
+from invites import InviteStore
+from users import UserStore
+
+
+def stress_invites(threads: int, codes: int, ttl: float = 1800.0):
+    store = InviteStore(ttl)
+    code_list = [f"C{i:07d}" for i in range(codes)]
+    for code in code_list:
+        store.register(code)
+
+    wins = Counter()
+    wins_lock = threading.Lock()
+    start = threading.Barrier(threads)
+
+    def worker(offset: int):
+        local = Counter()
+        start.wait()
+        # Each thread walks the codes from a different offset to maximize overlap
+        for i in range(codes):
+            code = code_list[(i + offset) % codes]
+            ok, reason = store.claim(code)
+            if ok:
+                local[code] += 1
+            elif reason != "used":
+                local["unexpected:" + reason] += 1
+        with wins_lock:
+            wins.update(local)
+
+    t0 = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(i * 7,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    errors = []
+    unexpected = {k: v for k, v in wins.items() if k.startswith("unexpected:")}
+    if unexpected:
+        errors.append(f"unexpected reasons: {unexpected}")
+    doubles = [c for c in code_list if wins[c] > 1]
+    missed = [c for c in code_list if wins[c] == 0]
+    if doubles:
+        errors.append(f"{len(doubles)} codes claimed more than once (e.g. {doubles[:3]})")
+    if missed:
+        errors.append(f"{len(missed)} codes never claimed (e.g. {missed[:3]})")
+    if not all(store.is_accepted(c) for c in code_list):
+        errors.append("some claimed codes are not marked accepted")
+    attempts = threads * codes
+    print(f"invites: {threads} threads x {codes} codes, {attempts} claims in {elapsed:.3f}s "
+          f"({attempts / elapsed:,.0f} claims/s)")
+    return errors
+
+
+def stress_users(threads: int, users: int):
+    store = UserStore()
+    created = Counter()
+    created_lock = threading.Lock()
+    start = threading.Barrier(threads)
+
+    def worker(tid: int):
+        local = Counter()
+        start.wait()
+        for i in range(users):
+            name = f"user{i}"
+            if store.add(name, {"pw_hash": str(tid), "created_at": time.time()}):
+                local[name] += 1
+        with created_lock:
+            created.update(local)
+
+    t0 = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    errors = []
+    if len(store) != users or any(created[f"user{i}"] != 1 for i in range(users)):
+        errors.append(f"register-once violated: {len(store)} users stored, "
+                      f"{sum(created.values())} successful registrations for {users} names")
+    print(f"users: {threads} threads x {users} names in {elapsed:.3f}s")
+    return errors
+
+
+def stress_expiry(threads: int, codes: int):
+    """Claims racing the expiry purge: expired codes must never be claimable."""
+    now = [1_000_000.0]
+    store = InviteStore(60.0, clock=lambda: now[0])
+    for i in range(codes):
+        # Half the codes are already past their TTL
+        store.register(f"E{i:07d}", created_at=now[0] - (120.0 if i % 2 else 0.0))
+
+    bad = []
+    start = threading.Barrier(threads)
+
+    def worker():
+        start.wait()
+        for i in range(1, codes, 2):
+            ok, reason = store.claim(f"E{i:07d}")
+            if ok:
+                bad.append(i)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    print(f"expiry: {threads} threads racing purge over {codes} codes, {len(store)} left")
+    return [f"{len(bad)} expired codes were claimed"] if bad else []
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--codes", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    # Small switch interval forces frequent thread switches inside critical sections
+    sys.setswitchinterval(1e-6)
+    errors = []
+    for r in range(args.rounds):
+        print(f"--- round {r + 1}/{args.rounds}")
+        errors += stress_invites(args.threads, args.codes)
+        errors += stress_users(args.threads, args.codes)
+        errors += stress_expiry(args.threads, args.codes)
+
+    if errors:
+        for e in errors:
+            print("FAIL:", e)
+        return 1
+    print("OK: consume-once and register-once held under contention")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+"""
+Benchmark suite for the hot paths, with JSON baselines and regression reports.
+
+Covers the per-submission scoring path (compute_scores), dict-level
+smoothing (smooth_scores), generate_insights, draw_rq_wheel (full redraw)
+and the cached WheelRenderer, batch wheel colors, and the invite lifecycle
+register -> validate -> consume -> is_accepted against stores already
+holding 10, 10k and 1M live codes. The Streamlit wrappers in app.py need a
+session, so the scoring cases call the Streamlit-free functions they
+delegate to (submissions.py) with the same process objects.
+
+Every case reports the median time per operation over several repeats.
+
+Run from the repo root:
+    python -m bench.suite                                 # print results
+    python -m bench.suite --save bench/baseline.json      # record a baseline
+    python -m bench.suite --compare bench/baseline.json   # exit 1 on regressions
+    python -m bench.suite --only invite --sizes 10 10000  # subset
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from content import CATEGORIES
+
+REPEATS = 5
+DEFAULT_SIZES = (10, 10_000, 1_000_000)
+DEFAULT_THRESHOLD = 0.20  # slower than baseline by more than 20% = regression
+
+
+def measure(fn, number: int, repeats: int = REPEATS) -> dict:
+    """Runs fn() `number` times per repeat; returns per-op stats in microseconds."""
+    fn()  # warm-up: lazy imports, caches, first-call allocation
+    per_op = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_op.append((time.perf_counter() - t0) * 1e6 / number)
+    return {"us_per_op": statistics.median(per_op), "min_us": min(per_op), "number": number, "repeats": repeats}
+
+
+# -----------------------------
+# Cases: name -> (setup() -> fn, ops per repeat)
+# -----------------------------
+def _responses(rng):
+    return rng.integers(1, 6, 24).astype(np.int8), rng.integers(1, 6, 24).astype(np.int8)
+
+def case_compute_scores():
+    # app.compute_scores: submissions.score_submission with the app's metrics and timing wrappers,
+    # a logged-in mutual-reflection user, MemoryStorage and the population sketches
+    import submissions
+    from metrics import RelateScoreMetrics
+    from pairs import PairIndex
+    from perf import TimingRegistry
+    from quantiles import PopulationSketches
+    from session import Session, score_vector
+    from storage import MemoryStorage
+
+    rng = np.random.default_rng(1)
+    likert, assess = _responses(rng)
+    pairs = PairIndex()
+    pairs.link("bench", "partner")
+    pairs.update("partner", rng.uniform(40, 80, len(CATEGORIES)), share=True)
+    storage = MemoryStorage(invite_ttl_seconds=3600.0)
+    population = PopulationSketches(CATEGORIES)
+    m = RelateScoreMetrics()
+    timings = TimingRegistry()
+    s = Session(username="bench", use_mutual=True,
+                smoothed=score_vector(rng.uniform(40, 80, len(CATEGORIES))), scored_at=time.time() - 86400.0)
+
+    @timings.instrument("compute_scores")
+    def run():
+        with m.compute_scores_seconds.time():
+            submissions.score_submission(s, likert, assess, pairs=pairs, pair_key="bench", storage=storage,
+                                         population=population, now=time.time(), history_capacity=20)
+    return run, 2_000
+
+def case_smooth_scores():
+    # app.smooth_scores: dicts in, dicts out
+    import scoring
+    import submissions
+
+    rng = np.random.default_rng(2)
+    new = scoring.scores_to_dict(rng.uniform(20, 90, len(CATEGORIES)))
+    prev = scoring.scores_to_dict(rng.uniform(20, 90, len(CATEGORIES)))
+    prev_ts = time.time() - 86400.0
+
+    def run():
+        submissions.smooth_scores(new, prev, submissions.dt_days(time.time(), prev_ts))
+    return run, 5_000
+
+def case_smooth_history_batch():
+    # Cohort replay: 1k users x 20 submissions, one smooth_history call per op
+    import scoring
+
+    rng = np.random.default_rng(3)
+    raw = rng.uniform(20, 90, (1_000, 20, len(CATEGORIES)))
+    ts = np.cumsum(rng.uniform(0.5, 3.0, (1_000, 20)) * 86400.0, axis=1)
+
+    def run():
+        scoring.smooth_history(raw, ts)
+    return run, 1
+
+def case_generate_insights():
+    # app.generate_insights: rule indices for the session's smoothed vs before vectors
+    import submissions
+    from insights import InsightEngine
+    from session import score_vector
+
+    rng = np.random.default_rng(4)
+    engine = InsightEngine()
+    smoothed = score_vector(rng.uniform(20, 90, len(CATEGORIES)))
+    before = score_vector(rng.uniform(20, 90, len(CATEGORIES)))
+
+    def run():
+        submissions.insight_rules(engine, smoothed, before)
+    return run, 2_000
+
+def case_draw_rq_wheel():
+    # Full matplotlib draw + PNG encode, no template or cache (the pre-cache cost)
+    import io
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import wheel
+
+    rng = np.random.default_rng(5)
+    scores = {c: float(v) for c, v in zip(CATEGORIES, rng.uniform(20, 90, len(CATEGORIES)))}
+
+    def run():
+        # Same figure size and dpi as WheelRenderer, so cold vs template compares like with like
+        fig, ax = plt.subplots(figsize=wheel.WHEEL_FIGSIZE, subplot_kw={"polar": True})
+        wheel.draw_rq_wheel(ax, CATEGORIES, scores)
+        fig.savefig(io.BytesIO(), format="png", dpi=wheel.WHEEL_DPI, bbox_inches="tight")
+        plt.close(fig)
+    return run, 5
+
+def case_wheel_render_cold():
+    import wheel
+
+    rng = np.random.default_rng(6)
+    renderer = wheel.WheelRenderer(CATEGORIES, cache_size=4)
+
+    def run():
+        renderer.render(dict(zip(CATEGORIES, rng.uniform(20, 90, len(CATEGORIES)))))
+    return run, 5
+
+def case_wheel_render_cached():
+    import wheel
+
+    renderer = wheel.WheelRenderer(CATEGORIES)
+    scores = dict.fromkeys(CATEGORIES, 62.5)
+
+    def run():
+        renderer.render(scores)
+    return run, 5_000
+
+def case_wheel_svg():
+    import wheel
+
+    rng = np.random.default_rng(7)
+
+    def run():
+        wheel.render_wheel_svg(dict(zip(CATEGORIES, rng.uniform(20, 90, len(CATEGORIES)))))
+    return run, 500
+
+def case_wheel_colors_batch():
+    # Per-category colors for a 1k-user report in one LUT lookup
+    import wheel
+
+    rng = np.random.default_rng(8)
+    scores = rng.uniform(20, 90, (1_000, len(CATEGORIES)))
+
+    def run():
+        wheel.category_colors(CATEGORIES, scores)
+    return run, 200
+
+def make_invite_case(size: int):
+    def case():
+        # One lifecycle per op against a store already holding `size` live codes
+        from storage import MemoryStorage
+
+        storage = MemoryStorage(invite_ttl_seconds=3600.0)
+        now = time.time()
+        for i in range(size):
+            storage.register_invite(f"P{i:09d}", created_at=now)
+        counter = iter(range(10 ** 9))
+
+        def run():
+            code = f"B{next(counter):09d}"
+            storage.register_new_invite(code)
+            storage.validate_invite(code)
+            storage.claim_invite(code)
+            storage.is_invite_accepted(code)
+        return run, 2_000
+    return case
+
+def build_cases(sizes) -> dict:
+    cases = {
+        "compute_scores": case_compute_scores,
+        "smooth_scores": case_smooth_scores,
+        "smooth_history_1k_users": case_smooth_history_batch,
+        "generate_insights": case_generate_insights,
+        "draw_rq_wheel": case_draw_rq_wheel,
+        "wheel_render_cold": case_wheel_render_cold,
+        "wheel_render_cached": case_wheel_render_cached,
+        "wheel_svg": case_wheel_svg,
+        "wheel_colors_batch": case_wheel_colors_batch,
+    }
+    for size in sizes:
+        cases[f"invite_lifecycle_{size}"] = make_invite_case(size)
+    return cases
+
+
+# -----------------------------
+# Baselines
+# -----------------------------
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Rows of (name, baseline us, current us, ratio, status) for cases in both runs."""
+    rows = []
+    for name, cur in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            rows.append((name, None, cur["us_per_op"], None, "new"))
+            continue
+        ratio = cur["us_per_op"] / base["us_per_op"] if base["us_per_op"] else float("inf")
+        if ratio > 1.0 + threshold:
+            status = "REGRESSION"
+        elif ratio < 1.0 - threshold:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, base["us_per_op"], cur["us_per_op"], ratio, status))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="*", default=list(DEFAULT_SIZES),
+                        help="live codes already in the invite store")
+    parser.add_argument("--only", nargs="*", default=None, help="run cases whose name contains any of these")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown vs baseline before flagging (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(args.sizes)
+    if args.only:
+        cases = {k: v for k, v in cases.items() if any(s in k for s in args.only)}
+
+    results = {}
+    print(f"{'case':<32} {'us/op':>12} {'ops/s':>12}")
+    for name, case in cases.items():
+        fn, number = case()
+        results[name] = measure(fn, number, args.repeats)
+        us = results[name]["us_per_op"]
+        print(f"{name:<32} {us:>12.2f} {1e6 / us:>12.0f}", flush=True)
+
+    if args.save:
+        if os.path.dirname(args.save):
+            os.makedirs(os.path.dirname(args.save), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+        print(f"saved baseline: {args.save}")
+
+    if not args.compare:
+        return 0
+    with open(args.compare, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline, args.threshold)
+    print(f"\nvs {args.compare} (recorded {baseline.get('environment', {}).get('recorded_at', '?')}, "
+          f"threshold {args.threshold:.0%})")
+    print(f"{'case':<32} {'base us':>10} {'now us':>10} {'ratio':>7}  status")
+    for name, base, cur, ratio, status in rows:
+        base_s = f"{base:10.2f}" if base is not None else f"{'-':>10}"
+        ratio_s = f"{ratio:7.2f}" if ratio is not None else f"{'-':>7}"
+        print(f"{name:<32} {base_s} {cur:10.2f} {ratio_s}  {status}")
+    regressions = [r for r in rows if r[4] == "REGRESSION"]
+    if regressions:
+        print(f"{len(regressions)} regression(s)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import responses
+import scoring
+from content import CATEGORIES
+from insights import InsightEngine
+
+# ------------------------------------------------------------
+# RelateScore™ offline bulk scoring (Streamlit-free CLI)
+# - Streams submissions from JSONL or CSV, scores them with the app's math
+#   (self scores -> clip -> EMA smoothing per user -> RGI -> insight rules)
+#   and streams results out as JSONL or CSV
+# - Rows are read by generators and grouped into chunks; chunks fan out over
+#   a process pool with at most 2 x workers in flight, so memory stays
+#   bounded however large the export is. Output keeps input order
+# - Smoothing runs over each user's consecutive rows (exports sorted by user,
+#   then time); a chunk never splits such a run. Rows without "ts" are smoothed
+#   as one day after the user's previous row, like the app without a history,
+#   and are written out with an empty ts
+# - Mutual (partner) blending is not applied: exports carry one member's answers
+#
+# Input rows:
+#   JSONL: {"user": "u1", "ts": 1700000000, "likert": [24 x 1..5], "assessment": [24 x 1..5]}
+#   CSV:   user, ts, likert_0..likert_23, assessment_0..assessment_23 (item IDs, see responses.py)
+#
+#   python -m bulk_score cohort.jsonl -o scored.jsonl --workers 8 --chunk-rows 5000
+#   python -m bulk_score cohort.csv -o scored.csv
+# ------------------------------------------------------------
+
+DEFAULT_CHUNK_ROWS = 5000
+DAY_SECONDS = 86400.0
+LIKERT_COLUMNS = tuple(f"likert_{i}" for i in range(responses.N_ITEMS))
+ASSESSMENT_COLUMNS = tuple(f"assessment_{i}" for i in range(responses.N_ITEMS))
+MAX_REPORTED_ERRORS = 5
+
+
+# -----------------------------
+# Input (generators, main process)
+# Only JSON/CSV decoding happens here; answers are validated in the workers
+# -----------------------------
+def _jsonl_records(f):
+    for line in f:
+        if line.strip():
+            rec = json.loads(line)
+            yield (str(rec.get("user", "")), rec.get("ts"), rec.get("likert"), rec.get("assessment"))
+
+def _csv_records(f):
+    for rec in csv.DictReader(f):
+        yield (rec.get("user") or "", rec.get("ts"),
+               [rec.get(c) for c in LIKERT_COLUMNS], [rec.get(c) for c in ASSESSMENT_COLUMNS])
+
+class InputErrors:
+    """Counts rows that failed to parse or validate; keeps the first few messages."""
+
+    def __init__(self):
+        self.count = 0
+        self.messages = []
+
+    def add(self, row_no: int, message: str) -> None:
+        self.count += 1
+        if len(self.messages) < MAX_REPORTED_ERRORS:
+            self.messages.append(f"row {row_no}: {message}")
+
+def read_rows(f, fmt: str, errors: InputErrors):
+    """Yields (row number, user, ts, likert answers, assessment answers) as read."""
+    records = _jsonl_records(f) if fmt == "jsonl" else _csv_records(f)
+    row_no = 0
+    while True:
+        row_no += 1
+        try:
+            rec = next(records)
+        except StopIteration:
+            return
+        except (ValueError, AttributeError) as exc:  # bad JSON line: the generator is done, restart after it
+            errors.add(row_no, str(exc))
+            records = _jsonl_records(f)
+            continue
+        yield (row_no, *rec)
+
+def chunks(rows, size: int):
+    """Lists of about `size` rows; a user's consecutive rows stay in one chunk."""
+    chunk = []
+    for row in rows:
+        if len(chunk) >= size and row[1] != chunk[-1][1]:
+            yield chunk
+            chunk = []
+        chunk.append(row)
+    if chunk:
+        yield chunk
+
+
+# -----------------------------
+# Validation + scoring (worker processes)
+# -----------------------------
+_engine = None
+
+def _insight_engine() -> InsightEngine:
+    global _engine
+    if _engine is None:
+        _engine = InsightEngine()
+    return _engine
+
+def _answer_matrix(rows: list, col: int) -> np.ndarray:
+    """(n x N_ITEMS) float answers; rows that don't convert come back as NaN rows."""
+    good = [r[col] if isinstance(r[col], (list, tuple)) and len(r[col]) == responses.N_ITEMS else None
+            for r in rows]
+    nan_row = [math.nan] * responses.N_ITEMS
+    try:
+        return np.array([g if g is not None else nan_row for g in good], dtype=float)
+    except (ValueError, TypeError):
+        out = np.full((len(rows), responses.N_ITEMS), np.nan)
+        for i, g in enumerate(good):
+            try:
+                out[i] = np.array(g, dtype=float) if g is not None else np.nan
+            except (ValueError, TypeError):
+                pass
+        return out
+
+def _ts_value(value) -> float:
+    try:
+        return math.nan if value in (None, "") else float(value)
+    except (ValueError, TypeError):
+        return math.nan
+
+def validate_chunk(chunk: list) -> tuple:
+    """Splits raw rows into (users, ts, likert, assessment) arrays of valid rows plus [(row number, error)]."""
+    likert = _answer_matrix(chunk, 3)
+    assess = _answer_matrix(chunk, 4)
+    lo, hi = responses.LIKERT_MIN, responses.LIKERT_MAX
+    ok_l = ((likert >= lo) & (likert <= hi) & (likert == np.round(likert))).all(axis=1)
+    ok_a = ((assess >= lo) & (assess <= hi) & (assess == np.round(assess))).all(axis=1)
+    ok = ok_l & ok_a
+    errors = [(row[0], f"{'likert' if not ok_l[i] else 'assessment'}: expected {responses.N_ITEMS} "
+                       f"answers in {lo}..{hi}")
+              for i, row in enumerate(chunk) if not ok[i]]
+    keep = np.flatnonzero(ok)
+    users = [chunk[i][1] for i in keep.tolist()]
+    ts = np.array([_ts_value(chunk[i][2]) for i in keep.tolist()], dtype=float)
+    return users, ts, likert[keep], assess[keep], errors
+
+def _fill_ts(ts: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    ts = ts.copy()
+    for i in np.flatnonzero(np.isnan(ts)):
+        ts[i] = DAY_SECONDS if starts[i] else ts[i - 1] + DAY_SECONDS
+    return ts
+
+def score_rows(users: list, ts: np.ndarray, likert, assess, smooth: bool = True) -> dict:
+    """Scores valid rows (in user runs); returns column arrays (users, ts, raw, smoothed, rgi, rules).
+
+    ts is returned as given, NaN where the row had none.
+    """
+    n = len(users)
+    raw = scoring.clip_scores(scoring.self_scores(likert, assess))
+
+    # Per-user runs: group index and position within the run
+    starts = np.ones(n, dtype=bool)
+    starts[1:] = [users[i] != users[i - 1] for i in range(1, n)]
+    group = np.cumsum(starts) - 1
+    first = np.flatnonzero(starts)
+    pos = np.arange(n) - first[group]
+    # Filled-in times only drive smoothing; the output keeps ts missing (NaN)
+    smooth_ts = _fill_ts(ts, starts) if np.isnan(ts).any() else ts
+
+    if smooth:
+        history = np.full((len(first), pos.max() + 1, raw.shape[1]), np.nan)
+        history_ts = np.full(history.shape[:2], np.nan)
+        history[group, pos] = raw
+        history_ts[group, pos] = smooth_ts
+        smoothed = scoring.smooth_history(history, history_ts)[group, pos]
+    else:
+        smoothed = raw
+
+    # Insights compare against the user's previous smoothed scores, like the app
+    prev = np.full_like(smoothed, np.nan)
+    has_prev = ~starts
+    prev[has_prev] = smoothed[np.flatnonzero(has_prev) - 1]
+    return {"users": users, "ts": ts, "raw": raw, "smoothed": smoothed,
+            "rgi": scoring.rgi(smoothed), "rules": _insight_engine().evaluate(smoothed, prev)}
+
+def format_result(result: dict, fmt: str) -> str:
+    names = [rule["name"] for rule in _insight_engine().rules]
+    raw_rows, smoothed_rows = result["raw"].tolist(), result["smoothed"].tolist()
+    ts_list, rgi_list, rule_rows = result["ts"].tolist(), result["rgi"].tolist(), result["rules"].tolist()
+    lines = []
+    for user, ts, raw, smoothed, rgi, rules in zip(result["users"], ts_list, raw_rows, smoothed_rows,
+                                                    rgi_list, rule_rows):
+        if math.isnan(ts):
+            ts = None  # JSON null / empty CSV cell
+        insights = [names[r] if r >= 0 else "" for r in rules]
+        if fmt == "jsonl":
+            lines.append(json.dumps({
+                "user": user, "ts": ts,
+                "raw": dict(zip(CATEGORIES, raw)), "scores": dict(zip(CATEGORIES, smoothed)), "rgi": rgi,
+                "insights": {c: r for c, r in zip(CATEGORIES, insights) if r},
+            }) + "\n")
+        else:
+            lines.append([user, "" if ts is None else repr(ts), *map(repr, raw), *map(repr, smoothed), repr(rgi), *insights])
+    if fmt == "jsonl":
+        return "".join(lines)
+    return _csv_text(lines)
+
+def _csv_text(rows: list) -> str:
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerows(rows)
+    return buf.getvalue()
+
+def csv_header() -> str:
+    return _csv_text([["user", "ts", *(f"raw {c}" for c in CATEGORIES), *CATEGORIES, "RGI",
+                       *(f"insight {c}" for c in CATEGORIES)]])
+
+def score_chunk(chunk: list, smooth: bool = True, fmt: str = "jsonl") -> tuple:
+    """Worker entry point: (formatted text, rows scored, [(row number, error)])."""
+    users, ts, likert, assess, errors = validate_chunk(chunk)
+    if not users:
+        return "", 0, errors
+    return format_result(score_rows(users, ts, likert, assess, smooth), fmt), len(users), errors
+
+
+# -----------------------------
+# Driver
+# -----------------------------
+def score_stream(rows, chunk_rows: int = DEFAULT_CHUNK_ROWS, workers: int = 1,
+                 smooth: bool = True, fmt: str = "jsonl"):
+    """Yields score_chunk() results, in input order."""
+    tasks = chunks(rows, chunk_rows)
+    if workers <= 1:
+        for chunk in tasks:
+            yield score_chunk(chunk, smooth, fmt)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in tasks:
+            pending.append(pool.submit(score_chunk, chunk, smooth, fmt))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _format_of(path: str, explicit: str | None) -> str:
+    if explicit:
+        return explicit
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+def _open(path: str, mode: str):
+    if path == "-":
+        return contextlib.nullcontext(sys.stdin if "r" in mode else sys.stdout)
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Score an exported cohort of RelateScore submissions offline.")
+    parser.add_argument("input", help="JSONL or CSV file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL or CSV file, or - for stdout (default)")
+    parser.add_argument("--input-format", choices=("jsonl", "csv"), help="default: from the file extension")
+    parser.add_argument("--output-format", choices=("jsonl", "csv"), help="default: from the file extension")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="rows per worker task")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes (1 = in-process)")
+    parser.add_argument("--no-smooth", action="store_true", help="skip EMA smoothing (raw scores only)")
+    args = parser.parse_args(argv)
+    if args.chunk_rows < 1:
+        parser.error("--chunk-rows must be >= 1")
+
+    in_fmt = _format_of(args.input, args.input_format)
+    out_fmt = _format_of(args.output, args.output_format)
+    errors = InputErrors()
+    total = 0
+    t0 = time.perf_counter()
+    with _open(args.input, "r") as fin, _open(args.output, "w") as fout:
+        if out_fmt == "csv":
+            fout.write(csv_header())
+        rows = read_rows(fin, in_fmt, errors)
+        for text, n, bad in score_stream(rows, args.chunk_rows, args.workers, not args.no_smooth, out_fmt):
+            fout.write(text)
+            total += n
+            for row_no, message in bad:
+                errors.add(row_no, message)
+    seconds = time.perf_counter() - t0
+
+    print(f"scored {total} rows in {seconds:.2f}s ({total / seconds if seconds else 0.0:,.0f} rows/s, "
+          f"{args.workers} workers, {args.chunk_rows} rows/chunk)", file=sys.stderr)
+    if errors.count:
+        print(f"skipped {errors.count} invalid rows", file=sys.stderr)
+        for message in errors.messages:
+            print(f"  {message}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import secrets
+import string
+import threading
+from collections import deque
+
+# ------------------------------------------------------------
+# RelateScore™ invite code issuing (Streamlit-free, thread-safe)
+# - Codes come from the OS CSPRNG (secrets), not the `random` module: 8 of
+#   36 symbols is ~41 bits, so codes can't be predicted from earlier ones
+# - Uniqueness is enforced by the store itself: register(code) is an atomic
+#   O(1) insert-if-absent (see Storage.register_new_invite), and a taken
+#   code is simply skipped and counted as a collision
+# - A daemon thread keeps a pool of pre-generated codes topped up, so the
+#   request path only pops a deque
+# ------------------------------------------------------------
+
+ALPHABET = string.ascii_uppercase + string.digits
+CODE_LENGTH = 8
+POOL_SIZE = 256
+POOL_LOW_WATER = 64
+MAX_ATTEMPTS = 32
+_UNBIASED_LIMIT = 256 - 256 % len(ALPHABET)  # bytes >= this are rejected, keeping symbols uniform
+
+
+def random_codes(n: int, length: int = CODE_LENGTH) -> list:
+    """n uniformly random codes from one secrets.token_bytes() draw per batch."""
+    out = []
+    while len(out) < n:
+        need = (n - len(out)) * length
+        raw = secrets.token_bytes(need + need // 8 + 8)  # ~1.6% of bytes get rejected
+        symbols = [ALPHABET[b % len(ALPHABET)] for b in raw if b < _UNBIASED_LIMIT]
+        for i in range(0, len(symbols) - length + 1, length):
+            out.append("".join(symbols[i:i + length]))
+    return out[:n]
+
+
+class InviteCodeIssuer:
+    """Issues registered, unique invite codes.
+
+    register(code) must atomically store the code if it is free and return
+    False if it is already live; on_collision(n) is called for every taken code.
+    """
+
+    def __init__(self, register, length: int = CODE_LENGTH, pool_size: int = POOL_SIZE,
+                 low_water: int = POOL_LOW_WATER, on_collision=None, background: bool = True):
+        self._register = register
+        self.length = length
+        self.pool_size = pool_size
+        self.low_water = low_water
+        self._on_collision = on_collision
+        self._pool = deque(random_codes(pool_size, length))
+        self._lock = threading.Lock()
+        self.issued = 0
+        self.collisions = 0
+        self.pool_misses = 0  # issue() found the pool empty and generated inline
+        self._refill = threading.Event()
+        if background:
+            threading.Thread(target=self._refill_loop, name="relatescore-invite-codes", daemon=True).start()
+
+    def _refill_loop(self) -> None:
+        while True:
+            self._refill.wait()
+            self._refill.clear()
+            missing = self.pool_size - len(self._pool)
+            if missing > 0:
+                self._pool.extend(random_codes(missing, self.length))
+
+    def _next_code(self) -> str:
+        try:
+            code = self._pool.popleft()  # deque pops are atomic
+        except IndexError:
+            with self._lock:
+                self.pool_misses += 1
+            code = random_codes(1, self.length)[0]
+        if len(self._pool) < self.low_water:
+            self._refill.set()
+        return code
+
+    def issue(self, created_at: float | None = None) -> str:
+        """Returns a code that is now registered in the store and was not live before."""
+        for _ in range(MAX_ATTEMPTS):
+            code = self._next_code()
+            if self._register(code, created_at):
+                with self._lock:
+                    self.issued += 1
+                return code
+            with self._lock:
+                self.collisions += 1
+            if self._on_collision is not None:
+                self._on_collision(1)
+        raise RuntimeError(f"no free invite code after {MAX_ATTEMPTS} attempts; is the code space exhausted?")
+
+    def stats(self) -> dict:
+        with self._lock:
+            attempts = self.issued + self.collisions
+            return {"issued": self.issued, "collisions": self.collisions, "pool_misses": self.pool_misses,
+                    "collision_rate": self.collisions / attempts if attempts else 0.0, "pool": len(self._pool)}
@@ -0,0 +1,80 @@
+# ------------------------------------------------------------
+# RelateScore™ static content (Streamlit-free, no heavy imports)
+# Built once per process on first import; app.py reruns reuse these objects
+# instead of rebuilding the question tables and CSS/SVG strings every run.
+# ------------------------------------------------------------
+
+CATEGORIES = [
+    "Emotional Awareness",
+    "Communication Style",
+    "Conflict Tendencies",
+    "Attachment Patterns",
+    "Empathy & Responsiveness",
+    "Self-Insight",
+    "Trust & Boundaries",
+    "Stability & Consistency"
+]
+
+# -----------------------------
+# Styling
+# -----------------------------
+APP_CSS = """
+    <style>
+        .block-container { max-width: 520px; padding-top: 24px; }
+        h1, h2, h3 { color: #1A1A1A; font-family: sans-serif; }
+        .stButton > button {
+            background-color: #C6A667 !important;
+            color: #FFFFFF !important;
+            border-radius: 10px !important;
+            border: none !important;
+            padding: 10px 18px !important;
+            width: 100% !important;
+        }
+        .insight-card {
+            background-color: #FFFFFF;
+            border: 1px solid #C6A667;
+            border-radius: 10px;
+            padding: 14px;
+            margin-bottom: 10px;
+        }
+        .logo { text-align:center; margin-bottom: 10px; padding-top: 10px; overflow: visible !important; }
+        .logo svg { display:block; margin:0 auto; overflow: visible !important; }
+        .tagline { text-align:center; color:#3A3A3A; margin-bottom: 18px; }
+        .rgi-big { font-size: 54px; font-weight: 800; color: #C6A667; text-align: center; line-height: 1.0; }
+        .small-muted { color:#666; font-size: 0.92rem; }
+        .tip-under-btn { margin-top: -10px; margin-bottom: 14px; }
+        .rq-wheel svg { display:block; width:100%; height:auto; }
+    </style>
+"""
+
+LOGO_SVG = """
+<div class="logo">
+<svg width="64" height="64" viewBox="0 0 64 64" xmlns="http://www.w3.org/2000/svg" aria-label="RelateScore logo">
+  <circle cx="32" cy="32" r="20" stroke="#C6A667" stroke-width="4" fill="none"/>
+  <path d="M22 32 L29 39 L44 24" stroke="#C6A667" stroke-width="4" fill="none"
+        stroke-linecap="round" stroke-linejoin="round"/>
+</svg>
+<div style="font-size: 22px; font-weight: 700; margin-top: 6px;">RelateScore™</div>
+</div>
+"""
+
+# -----------------------------
+# Questions
+# -----------------------------
+LIKERT_QUESTIONS = {
+    cat: [
+        f"On a scale of 1–5, how important is {cat.lower()} to you in relationships?",
+        f"How would you rate your current level in {cat.lower()}?",
+        f"How often do you reflect on {cat.lower()}?"
+    ]
+    for cat in CATEGORIES
+}
+
+ASSESSMENT_QUESTIONS = {
+    cat: [
+        f"How often do you recognize patterns in {cat.lower()}?",
+        f"How comfortable are you discussing {cat.lower()}?",
+        f"How does {cat.lower()} impact your connections?"
+    ]
+    for cat in CATEGORIES
+}
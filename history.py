@@ -0,0 +1,95 @@
+import numpy as np
+
+# ------------------------------------------------------------
+# RelateScore™ score history ring buffer (Streamlit-free)
+# - One preallocated block per user: timestamps, 8 raw, 8 smoothed, RGI
+#   (scores as float32; timestamps stay float64, since float32 epoch seconds
+#   only resolve to ~2 minutes)
+# - append() writes one row in O(1), with no list slicing or per-entry dicts
+# - Every row is written twice (slot i and i + capacity), so the newest
+#   `capacity` rows are always one contiguous slice: views never copy
+# ------------------------------------------------------------
+
+DEFAULT_CAPACITY = 20
+
+
+class ScoreRing:
+    """Fixed-capacity score history; the oldest row is overwritten once full."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, n_categories: int = 8):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = int(capacity)
+        self.n_categories = int(n_categories)
+        self._ts = np.zeros(2 * self.capacity, dtype=np.float64)
+        self._raw = np.zeros((2 * self.capacity, self.n_categories), dtype=np.float32)
+        self._smoothed = np.zeros((2 * self.capacity, self.n_categories), dtype=np.float32)
+        self._rgi = np.zeros(2 * self.capacity, dtype=np.float32)
+        self._next = 0   # slot (0..capacity-1) the next row goes to
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return self._ts.nbytes + self._raw.nbytes + self._smoothed.nbytes + self._rgi.nbytes
+
+    def _write(self, i: int, ts: float, raw, smoothed, rgi: float) -> None:
+        for j in (i, i + self.capacity):
+            self._ts[j] = ts
+            self._raw[j] = raw
+            self._smoothed[j] = smoothed
+            self._rgi[j] = rgi
+
+    def append(self, ts: float, raw, smoothed, rgi: float) -> None:
+        """raw / smoothed: (n_categories,) in category order."""
+        self._write(self._next, ts, raw, smoothed, rgi)
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def replace_latest(self, ts: float, raw, smoothed, rgi: float) -> None:
+        """Overwrites the newest entry in place (appends if the ring is empty)."""
+        if not self._count:
+            self.append(ts, raw, smoothed, rgi)
+            return
+        self._write((self._next - 1) % self.capacity, ts, raw, smoothed, rgi)
+
+    def _window(self, limit: int | None) -> slice:
+        n = self._count if limit is None else max(0, min(limit, self._count))
+        end = self._next + self.capacity if self._count == self.capacity else self._next
+        return slice(end - n, end)
+
+    # Views: oldest -> newest, read-only slices of the ring (no copies)
+    def _view(self, arr: np.ndarray, limit: int | None) -> np.ndarray:
+        view = arr[self._window(limit)]
+        view.flags.writeable = False
+        return view
+
+    def ts(self, limit: int | None = None) -> np.ndarray:
+        return self._view(self._ts, limit)
+
+    def raw(self, limit: int | None = None) -> np.ndarray:
+        return self._view(self._raw, limit)
+
+    def smoothed(self, limit: int | None = None) -> np.ndarray:
+        return self._view(self._smoothed, limit)
+
+    def rgi(self, limit: int | None = None) -> np.ndarray:
+        return self._view(self._rgi, limit)
+
+    def latest(self):
+        """(ts, raw row, smoothed row, rgi) of the newest entry, or None."""
+        if not self._count:
+            return None
+        i = (self._next - 1) % self.capacity
+        return float(self._ts[i]), self._raw[i].copy(), self._smoothed[i].copy(), float(self._rgi[i])
+
+    def entries(self, categories, limit: int | None = None) -> list:
+        """Newest-last list of {"ts", "raw", "smoothed", "rgi"} dicts (exports/debugging only)."""
+        w = self._window(limit)
+        return [
+            {"ts": float(ts), "raw": dict(zip(categories, map(float, raw))),
+             "smoothed": dict(zip(categories, map(float, sm))), "rgi": float(rgi)}
+            for ts, raw, sm, rgi in zip(self._ts[w], self._raw[w], self._smoothed[w], self._rgi[w])
+        ]
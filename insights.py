@@ -0,0 +1,152 @@
+import math
+import threading
+
+import numpy as np
+
+from content import CATEGORIES
+
+# ------------------------------------------------------------
+# RelateScore™ insight rule engine (Streamlit-free)
+# - Insights come from a declarative rule table (DEFAULT_RULES) instead of
+#   if/elif branches; the table is compiled once into threshold matrices
+# - Rule kinds, each compared per category:
+#     level  the category score itself
+#     delta  change vs the previous smoothed scores (NaN when there are none)
+#     gap    score minus the mean of the other categories, or minus one
+#            specific category ("vs")
+# - evaluate() checks every rule for a whole (N x 8) batch in a few array ops;
+#   per (user, category) the first matching rule in table order wins
+# - Text is rendered once per (category, rule) and cached
+# ------------------------------------------------------------
+
+KINDS = ("level", "delta", "gap")
+_OPS = {">": (1.0, True), ">=": (1.0, False), "<": (-1.0, True), "<=": (-1.0, False)}
+
+# Category-specific experiments used by the default suggestions
+CATEGORY_TIPS = {
+    "Emotional Awareness": "Name one feeling out loud each day, before explaining it.",
+    "Communication Style": "Try one conversation this week where you summarize back before replying.",
+    "Conflict Tendencies": "Agree on a 20-minute pause signal for the next disagreement.",
+    "Attachment Patterns": "Notice one moment of reaching for reassurance, and say what you need directly.",
+    "Empathy & Responsiveness": "Ask one follow-up question before offering advice.",
+    "Self-Insight": "Write down one pattern you noticed in yourself this week.",
+    "Trust & Boundaries": "State one small boundary clearly and follow through on it.",
+    "Stability & Consistency": "Pick one shared routine and keep it for seven days.",
+}
+
+# Evaluated in order; the first matching rule per category wins. "threshold" is a
+# number or {category: number} (categories missing from the dict are skipped).
+DEFAULT_RULES = (
+    {"name": "sharp_drop", "kind": "delta", "op": "<", "threshold": -8.0, "type": "Needs Attention",
+     "description": "{category} dropped noticeably since your last reflection.",
+     "suggestion": "Look back at what changed recently. {tip}"},
+    {"name": "blind_spot", "kind": "level", "op": "<", "threshold": 40.0, "type": "Blind Spot",
+     "description": "This pattern may create misunderstandings."},
+    {"name": "conflict_outpaces_communication", "kind": "gap", "vs": "Communication Style",
+     "categories": ("Conflict Tendencies",), "op": "<", "threshold": -15.0, "type": "Growth Area",
+     "description": "Conflict handling trails how well you communicate day to day.",
+     "suggestion": "Use the communication skills you already have when tension rises. {tip}"},
+    {"name": "lagging", "kind": "gap", "op": "<", "threshold": -12.0, "type": "Growth Area",
+     "description": "{category} sits well below your other areas."},
+    {"name": "rising", "kind": "delta", "op": ">", "threshold": 8.0, "type": "Growing",
+     "description": "{category} improved since your last reflection.",
+     "suggestion": "Keep doing what helped. {tip}"},
+    {"name": "strength", "kind": "level", "op": ">", "threshold": 70.0, "type": "Strength",
+     "description": "This is a strong foundation to build on.",
+     "suggestion": "Lean on this area when others feel harder. {tip}"},
+    {"name": "standout", "kind": "gap", "op": ">", "threshold": 12.0, "type": "Relative Strength",
+     "description": "{category} stands out above your other areas."},
+    {"name": "neutral", "kind": "level", "op": ">=", "threshold": -math.inf, "type": "Neutral",
+     "description": "Balanced area with room for awareness."},
+)
+DEFAULT_SUGGESTION = "Consider a small experiment this week to shift this pattern by 1%. {tip}"
+
+
+class InsightEngine:
+    """Compiled rule table: evaluate() a batch of score vectors, render() cached insight dicts."""
+
+    def __init__(self, rules=DEFAULT_RULES, categories=CATEGORIES):
+        self.rules = tuple(rules)
+        self.categories = tuple(categories)
+        if not self.rules:
+            raise ValueError("rule table is empty")
+        n_rules, n_cats = len(self.rules), len(self.categories)
+        cat_index = {c: i for i, c in enumerate(self.categories)}
+
+        self._kind = np.empty(n_rules, dtype=np.intp)
+        self._sign = np.empty(n_rules, dtype=float)
+        self._strict = np.empty(n_rules, dtype=bool)
+        self._threshold = np.full((n_rules, n_cats), np.nan)  # NaN = rule doesn't apply
+        vs_rows, vs_cols = [], []
+        for r, rule in enumerate(self.rules):
+            if rule["kind"] not in KINDS:
+                raise ValueError(f"rule {rule['name']!r}: unknown kind {rule['kind']!r}")
+            if rule["op"] not in _OPS:
+                raise ValueError(f"rule {rule['name']!r}: unknown op {rule['op']!r}")
+            self._kind[r] = KINDS.index(rule["kind"])
+            self._sign[r], self._strict[r] = _OPS[rule["op"]]
+
+            threshold = rule["threshold"]
+            if not isinstance(threshold, dict):
+                threshold = {c: threshold for c in rule.get("categories", self.categories)}
+            for cat, value in threshold.items():
+                self._threshold[r, cat_index[cat]] = value
+            if rule.get("vs"):
+                if rule["kind"] != "gap":
+                    raise ValueError(f"rule {rule['name']!r}: 'vs' only applies to gap rules")
+                vs_rows.append(r)
+                vs_cols.append(cat_index[rule["vs"]])
+        self._vs_rows = np.array(vs_rows, dtype=np.intp)
+        self._vs_cols = np.array(vs_cols, dtype=np.intp)
+
+        self._text = {}  # (category index, rule index) -> rendered insight dict
+        self._text_lock = threading.Lock()
+
+    def evaluate(self, scores, prev=None) -> np.ndarray:
+        """(N x 8) scores, optional (N x 8) previous scores (NaN rows allowed) -> (N x 8) rule indices, -1 = none."""
+        s = np.asarray(scores, dtype=float)
+        if s.ndim == 1:
+            s = s[np.newaxis, :]
+        n_cats = s.shape[1]
+        if prev is None:
+            delta = np.full_like(s, np.nan)
+        else:
+            delta = s - np.broadcast_to(np.asarray(prev, dtype=float), s.shape)
+        others_mean = (s.sum(axis=1, keepdims=True) - s) / max(1, n_cats - 1)
+
+        features = np.stack([s, delta, s - others_mean])[self._kind]  # (R, N, 8)
+        if self._vs_rows.size:
+            features[self._vs_rows] = s[np.newaxis] - s[:, self._vs_cols].T[:, :, np.newaxis]
+
+        d = self._sign[:, None, None] * (features - self._threshold[:, None, :])
+        with np.errstate(invalid="ignore"):
+            hit = np.where(self._strict[:, None, None], d > 0, d >= 0)  # NaN compares False
+
+        first = hit.argmax(axis=0)  # first matching rule per (user, category)
+        return np.where(hit.any(axis=0), first, -1)
+
+    def render(self, cat_i: int, rule_i: int) -> dict:
+        """Insight dict for one (category, rule); cached, so callers must not mutate it."""
+        key = (cat_i, rule_i)
+        cached = self._text.get(key)
+        if cached is not None:
+            return cached
+        rule, cat = self.rules[rule_i], self.categories[cat_i]
+        fmt = {"category": cat, "tip": CATEGORY_TIPS.get(cat, "")}
+        insight = {
+            "category": cat,
+            "type": rule["type"],
+            "rule": rule["name"],
+            "description": rule["description"].format(**fmt),
+            "suggestion": rule.get("suggestion", DEFAULT_SUGGESTION).format(**fmt).strip(),
+        }
+        with self._text_lock:
+            return self._text.setdefault(key, insight)
+
+    def insights(self, scores, prev=None) -> list:
+        """One list of insight dicts (category order) per row of `scores`."""
+        matched = self.evaluate(scores, prev)
+        return [
+            [self.render(c, int(r)) for c, r in enumerate(row) if r >= 0]
+            for row in matched
+        ]
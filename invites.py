@@ -0,0 +1,198 @@
+import heapq
+import threading
+import time
+
+from locks import StripedLock
+
+# ------------------------------------------------------------
+# RelateScore™ invite store (Streamlit-free, thread-safe)
+# - Codes live in a dict for O(1) lookups
+# - A min-heap ordered by created_at drives expiry, so purging only
+#   touches codes that actually expired (amortized O(log n) each)
+#   instead of scanning the whole store on every call
+# - Per-code striped locks make claim() and register_new() atomic check-and-sets; the heap
+#   has its own lock and purging is skipped if another thread is already on it
+# - Per-code events let the inviting session block until claim() wakes it,
+#   instead of sleeping and rerunning to poll
+# ------------------------------------------------------------
+
+
+class InviteStore:
+    """Shared invite codes: { CODE: {"created_at": ts, "used": bool, "revoked": bool} }"""
+
+    def __init__(self, ttl_seconds: float, clock=time.time, stripes: int = 64, on_expire=None):
+        self.ttl_seconds = float(ttl_seconds)
+        self._clock = clock
+        self._on_expire = on_expire  # called with the number of codes dropped for expiry
+        self._invites = {}
+        self._expiry_heap = []  # (created_at, code); stale entries are skipped lazily
+        self._heap_lock = threading.Lock()
+        self._lock = StripedLock(stripes)
+        self._events = {}  # code -> threading.Event, set on claim/revoke/expiry
+
+    def __len__(self) -> int:
+        return len(self._invites)
+
+    def __contains__(self, code) -> bool:
+        return code in self._invites
+
+    def _is_expired(self, meta: dict, now: float) -> bool:
+        return (now - meta["created_at"]) > self.ttl_seconds
+
+    def purge_expired(self, now: float | None = None) -> int:
+        """Drops expired codes from the front of the heap. Returns how many were removed.
+
+        Best-effort: if another thread is already purging this call returns 0,
+        since lookups check expiry themselves.
+        """
+        now = self._clock() if now is None else now
+        cutoff = now - self.ttl_seconds
+        heap = self._expiry_heap
+        try:
+            # Lock-free peek; another thread may empty the heap in between
+            if heap[0][0] >= cutoff:
+                return 0
+        except IndexError:
+            return 0
+        if not self._heap_lock.acquire(blocking=False):
+            return 0
+        try:
+            due = []
+            while heap and heap[0][0] < cutoff:
+                due.append(heapq.heappop(heap))
+        finally:
+            self._heap_lock.release()
+
+        removed = 0
+        for created_at, code in due:
+            with self._lock(code):
+                meta = self._invites.get(code)
+                # Skip entries left behind by a re-registered code
+                if meta is not None and meta["created_at"] == created_at:
+                    self._drop(code)
+                    removed += 1
+        if removed and self._on_expire is not None:
+            self._on_expire(removed)
+        return removed
+
+    def register(self, code: str, created_at: float | None = None) -> None:
+        created_at = self._clock() if created_at is None else float(created_at)
+        self.purge_expired()
+        with self._lock(code):
+            self._drop(code)
+            self._invites[code] = {"created_at": created_at, "used": False, "revoked": False}
+        with self._heap_lock:
+            heapq.heappush(self._expiry_heap, (created_at, code))
+
+    def register_new(self, code: str, created_at: float | None = None) -> bool:
+        """Registers `code` only if it is not live (missing or expired). Atomic, O(1) + heap push.
+
+        Returns False, leaving the live invite untouched, if the code is taken.
+        """
+        now = self._clock()
+        created_at = now if created_at is None else float(created_at)
+        self.purge_expired(now)
+        with self._lock(code):
+            meta = self._invites.get(code)
+            if meta is not None and not self._is_expired(meta, now):
+                return False
+            self._drop(code)
+            self._invites[code] = {"created_at": created_at, "used": False, "revoked": False}
+        with self._heap_lock:
+            heapq.heappush(self._expiry_heap, (created_at, code))
+        return True
+
+    def get(self, code: str) -> dict | None:
+        """Returns a snapshot of the live invite metadata, or None if missing/expired."""
+        now = self._clock()
+        self.purge_expired(now)
+        with self._lock(code):
+            meta = self._invites.get(code)
+            if not meta or self._is_expired(meta, now):
+                return None
+            return dict(meta)
+
+    def remaining_seconds(self, code: str) -> int:
+        meta = self.get(code)
+        if not meta:
+            return 0
+        return max(0, int(self.ttl_seconds - (self._clock() - meta["created_at"])))
+
+    def _check(self, code: str, now: float):
+        # Caller holds self._lock(code)
+        meta = self._invites.get(code)
+        if not meta:
+            return False, "missing"
+        if self._is_expired(meta, now):
+            self._drop(code)
+            if self._on_expire is not None:
+                self._on_expire(1)
+            return False, "expired"
+        if meta["revoked"]:
+            return False, "revoked"
+        if meta["used"]:
+            return False, "used"
+        return True, "ok"
+
+    def validate(self, code: str):
+        """
+        Returns (is_valid, reason)
+        Reasons: ok | missing | expired | revoked | used
+        """
+        now = self._clock()
+        self.purge_expired(now)
+        with self._lock(code):
+            return self._check(code, now)
+
+    def claim(self, code: str):
+        """Atomically validates and marks the invite used. Only one caller ever gets (True, "ok")."""
+        now = self._clock()
+        self.purge_expired(now)
+        with self._lock(code):
+            ok, reason = self._check(code, now)
+            if ok:
+                self._invites[code]["used"] = True
+                self._notify(code)
+            return ok, reason
+
+    def revoke(self, code: str) -> None:
+        """Marks an invite as revoked so it cannot be used."""
+        with self._lock(code):
+            meta = self._invites.get(code)
+            if meta:
+                meta["revoked"] = True
+                self._notify(code)
+
+    def _drop(self, code: str) -> None:
+        # Caller holds self._lock(code); wakes waiters so they see the code is gone
+        self._invites.pop(code, None)
+        event = self._events.pop(code, None)
+        if event is not None:
+            event.set()
+
+    def _notify(self, code: str) -> None:
+        # Caller holds self._lock(code)
+        event = self._events.get(code)
+        if event is not None:
+            event.set()
+
+    def wait_for_acceptance(self, code: str, timeout: float) -> bool:
+        """Blocks until the invite is claimed or revoked, or `timeout` seconds pass.
+
+        Returns is_accepted(code). Waiting costs no CPU; claim() wakes every
+        waiter on the code immediately.
+        """
+        with self._lock(code):
+            meta = self._invites.get(code)
+            if not meta or meta["used"] or meta["revoked"]:
+                return bool(meta and meta["used"])
+            event = self._events.get(code)
+            if event is None:
+                event = self._events[code] = threading.Event()
+        event.wait(timeout)
+        return self.is_accepted(code)
+
+    def is_accepted(self, code: str) -> bool:
+        """Returns True if the invite exists and has been marked used/accepted."""
+        meta = self.get(code)
+        return bool(meta and meta["used"])
@@ -0,0 +1,17 @@
+import threading
+
+# ------------------------------------------------------------
+# Lock striping for the shared (st.cache_resource) stores
+# - Every Streamlit session runs its script on its own thread
+# - One global lock would serialize all sessions; instead each key hashes
+#   to one of a fixed set of locks, so unrelated codes/users never contend
+# ------------------------------------------------------------
+
+
+class StripedLock:
+    def __init__(self, stripes: int = 64):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def __call__(self, key) -> threading.Lock:
+        """Returns the lock guarding `key` (use as a context manager)."""
+        return self._locks[hash(key) % len(self._locks)]
@@ -0,0 +1,385 @@
+import bisect
+import os
+import threading
+import time
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ------------------------------------------------------------
+# RelateScore™ metrics (Streamlit-free): counters, gauges, histograms
+# rendered in the Prometheus text exposition format
+# - Hot-path updates take no lock: every thread writes only its own cell
+#   (a small list); a scrape sums the cells. Cells of finished threads are
+#   folded into a retired total, so memory tracks live threads only
+# - Labeled children are resolved once and can be kept by the caller
+# - Export: serve(registry, port) runs a tiny HTTP endpoint (/metrics), or
+#   TextfileDumper writes the same text to a file every few seconds
+# ------------------------------------------------------------
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Cells:
+    """Per-thread accumulators of `width` floats: lock-free writes, summed on read."""
+
+    def __init__(self, width: int):
+        self._width = width
+        self._local = threading.local()
+        self._cells = []  # (weakref to owning thread, cell)
+        self._retired = [0.0] * width
+        self._lock = threading.Lock()
+
+    def cell(self) -> list:
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = self._local.cell = [0.0] * self._width
+            with self._lock:
+                self._fold_dead()
+                self._cells.append((weakref.ref(threading.current_thread()), cell))
+            return cell
+
+    def _fold_dead(self) -> None:
+        # Caller holds self._lock; finished threads never write their cell again
+        live = []
+        for ref, cell in self._cells:
+            thread = ref()
+            if thread is not None and thread.is_alive():
+                live.append((ref, cell))
+            else:
+                for i, v in enumerate(cell):
+                    self._retired[i] += v
+        self._cells = live
+
+    def totals(self) -> list:
+        with self._lock:
+            self._fold_dead()
+            out = list(self._retired)
+            for _, cell in self._cells:
+                for i, v in enumerate(cell):
+                    out[i] += v
+        return out
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _label_str(names, values, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._children_lock = threading.Lock()
+
+    def labels(self, *values):
+        """Child for one label-value combination (resolve once, keep it on hot paths)."""
+        values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        child = self._children.get(values)
+        if child is None:
+            with self._children_lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _default(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; use .labels(...)")
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> list:
+        """[(suffix, label string, value)] for the exposition text."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{self.name}{suffix}{labels} {_fmt(value)}" for suffix, labels, value in self.samples()]
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    __slots__ = ("_cells",)
+
+    def __init__(self):
+        self._cells = _Cells(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._cells.cell()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._cells.totals()[0]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def samples(self) -> list:
+        return [("", _label_str(self.labelnames, k), c.value) for k, c in sorted(self._children.items())]
+
+
+class _GaugeChild:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+class Gauge(_Metric):
+    """Set directly, or computed at scrape time from `fn` (unlabeled only)."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), fn=None):
+        super().__init__(name, documentation, labelnames)
+        if fn is not None and self.labelnames:
+            raise ValueError("callback gauges can't have labels")
+        self._fn = fn
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def samples(self) -> list:
+        if self._fn is not None:
+            try:
+                return [("", "", float(self._fn()))]
+            except Exception:  # a failing callback must not break the whole scrape
+                return []
+        return [("", _label_str(self.labelnames, k), c.value) for k, c in sorted(self._children.items())]
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_cells")
+
+    def __init__(self, bounds: tuple):
+        self._bounds = bounds
+        self._cells = _Cells(len(bounds) + 3)  # per-bucket counts (+Inf last), sum, count
+
+    def observe(self, value: float) -> None:
+        cell = self._cells.cell()
+        cell[bisect.bisect_left(self._bounds, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def time(self):
+        return _Timer(self)
+
+    @property
+    def count(self) -> float:
+        return self._cells.totals()[-1]
+
+    @property
+    def sum(self) -> float:
+        return self._cells.totals()[-2]
+
+class _Timer:
+    __slots__ = ("_child", "_t0")
+
+    def __init__(self, child):
+        self._child = child
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.observe(time.perf_counter() - self._t0)
+        return False
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def time(self):
+        """Context manager observing the block's wall time in seconds."""
+        return self._default().time()
+
+    def samples(self) -> list:
+        out = []
+        for key, child in sorted(self._children.items()):
+            totals = child._cells.totals()
+            cumulative = 0.0
+            for bound, n in zip(self.buckets + (float("inf"),), totals):
+                cumulative += n
+                out.append(("_bucket", _label_str(self.labelnames, key, f'le="{_fmt(bound)}"'), cumulative))
+            out.append(("_sum", _label_str(self.labelnames, key), totals[-2]))
+            out.append(("_count", _label_str(self.labelnames, key), totals[-1]))
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _add(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"metric {metric.name!r} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=(), fn=None) -> Gauge:
+        return self._add(Gauge(name, documentation, labelnames, fn))
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(m.render() for m in metrics) + "\n"
+
+
+# -----------------------------
+# Export
+# -----------------------------
+def serve(registry: Registry, port: int, addr: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serves GET /metrics on a daemon thread. Binds to localhost by default."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    threading.Thread(target=server.serve_forever, name="relatescore-metrics", daemon=True).start()
+    return server
+
+def write_textfile(registry: Registry, path: str) -> None:
+    """Atomic dump (e.g. for node_exporter's textfile collector)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(registry.render())
+    os.replace(tmp, path)
+
+class TextfileDumper:
+    """Rewrites `path` every `interval` seconds on a daemon thread."""
+
+    def __init__(self, registry: Registry, path: str, interval: float = 15.0):
+        self._registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="relatescore-metrics-dump", daemon=True)
+        self._thread.start()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                write_textfile(self._registry, self.path)
+            except OSError:
+                pass
+
+    def stop(self) -> None:
+        self._stop.set()
+        write_textfile(self._registry, self.path)
+
+
+# -----------------------------
+# The app's metric set
+# -----------------------------
+LOGIN_RESULTS = ("ok", "invalid", "throttled", "busy")
+RUN_BUCKETS = (5, 10, 15, 20, 30, 40, 60, 80, 100, 150, 200, 300)
+INVITE_RESULTS = ("ok", "missing", "expired", "revoked", "used")
+
+class RelateScoreMetrics:
+    """Metrics updated by app.py; label children are pre-resolved for the hot paths."""
+
+    def __init__(self, registry: Registry | None = None):
+        self.registry = registry or Registry()
+        r = self.registry
+        self.invites_registered = r.counter(
+            "relatescore_invites_registered_total", "Invite codes created.").labels()
+        self.invite_code_collisions = r.counter(
+            "relatescore_invite_code_collisions_total",
+            "Generated invite codes discarded because they were already live.").labels()
+        consumed = r.counter(
+            "relatescore_invites_consumed_total", "Invite redemption attempts by result.", ("result",))
+        self.invites_consumed = {res: consumed.labels(res) for res in INVITE_RESULTS}
+        self.invites_expired = r.counter(
+            "relatescore_invites_expired_total", "Invite codes removed after their TTL passed.").labels()
+        logins = r.counter("relatescore_logins_total", "Login attempts by result.", ("result",))
+        self.logins = {res: logins.labels(res) for res in LOGIN_RESULTS}
+        self.login_seconds = r.histogram(
+            "relatescore_login_seconds", "verify_user wall time, including the password KDF.").labels()
+        self.compute_scores_seconds = r.histogram(
+            "relatescore_compute_scores_seconds", "compute_scores wall time.").labels()
+        self.script_runs = r.counter(
+            "relatescore_script_runs_total", "Full Streamlit script runs by page.", ("page",))
+        self.assessment_runs = r.histogram(
+            "relatescore_assessment_script_runs",
+            "Script runs from Start Reflection to a submitted assessment.", buckets=RUN_BUCKETS).labels()
+        self.started_at = r.gauge(
+            "relatescore_process_start_time_seconds", "Unix time the metrics registry was created.")
+        self.started_at.set(time.time())
+        self._live_invites = None
+        r.gauge("relatescore_invites_live", "Invite codes currently stored.", fn=lambda: self._live_invites())
+
+    def watch_live_invites(self, fn) -> None:
+        """Sets the scrape-time source of the live invite gauge (e.g. Storage.live_invite_count)."""
+        self._live_invites = fn
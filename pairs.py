@@ -0,0 +1,165 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from scoring import blend_mutual, clip_scores
+
+# ------------------------------------------------------------
+# RelateScore™ partner pairing index (Streamlit-free, thread-safe)
+# - The inviter offers a code; whoever consumes it is linked to the inviter,
+#   both directions in one dict, so partner lookups are O(1)
+# - Self scores are kept only for members who opted in to the mutual blend;
+#   a blend exists only while BOTH members of a pair share, since a blend
+#   and one's own answers are enough to solve for the partner's scores
+# - Each member's mutual blend (SELF_WEIGHT own + MUTUAL_WEIGHT partner) is
+#   recomputed for just the two members of a pair whenever either one resubmits
+# - Offers expire with their invite: they are queued in creation order and
+#   the expired front of the queue is dropped on every new offer
+# - Members are identified by a key (username, or a per-session key for
+#   partners who join without an account)
+# - Like MemoryStorage, the index lives in this process
+# ------------------------------------------------------------
+
+
+class PairIndex:
+    """{ key: partner key } plus each member's latest self scores and live mutual blend."""
+
+    def __init__(self, offer_ttl_seconds: float = float("inf"), clock=time.time):
+        self.offer_ttl_seconds = float(offer_ttl_seconds)
+        self._clock = clock
+        self._offers = {}    # invite code -> (inviter key, offered_at)
+        self._offer_order = deque()  # (offered_at, code), oldest first; stale entries are skipped
+        self._partner = {}   # key -> partner key (stored both ways)
+        self._own = {}       # key -> (8,) unclipped self scores, only for members who share them
+        self._blended = {}   # key -> (8,) blend against the partner's latest scores
+        self._version = {}   # key -> bumped whenever key's blend changes
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of linked pairs."""
+        return len(self._partner) // 2
+
+    # Linking
+    def offer(self, code: str, owner: str) -> None:
+        """Remembers who created invite `code`, so accepting it can link the pair."""
+        now = self._clock()
+        with self._lock:
+            self._prune_offers(now)
+            self._offers[code] = (owner, now)
+            self._offer_order.append((now, code))
+
+    def _prune_offers(self, now: float) -> None:
+        cutoff = now - self.offer_ttl_seconds
+        order = self._offer_order
+        while order and order[0][0] < cutoff:
+            offered_at, code = order.popleft()
+            entry = self._offers.get(code)
+            # Skip entries left behind by a re-offered, accepted or withdrawn code
+            if entry is not None and entry[1] == offered_at:
+                del self._offers[code]
+
+    @property
+    def pending_offers(self) -> int:
+        return len(self._offers)
+
+    def withdraw(self, code: str) -> None:
+        with self._lock:
+            self._offers.pop(code, None)
+
+    def accept(self, code: str, key: str) -> str | None:
+        """Links `key` to the owner of invite `code`. Returns the owner, or None if unknown."""
+        with self._lock:
+            owner, offered_at = self._offers.pop(code, (None, 0.0))
+            if owner is None or owner == key or self._clock() - offered_at > self.offer_ttl_seconds:
+                return None
+            self._link(owner, key)
+            return owner
+
+    def link(self, a: str, b: str) -> None:
+        with self._lock:
+            self._link(a, b)
+
+    def _link(self, a: str, b: str) -> None:
+        self._unlink(a)
+        self._unlink(b)
+        self._partner[a] = b
+        self._partner[b] = a
+        self._reblend(a, b)
+
+    def unlink(self, key: str) -> None:
+        with self._lock:
+            self._unlink(key)
+
+    def _unlink(self, key: str) -> None:
+        partner = self._partner.pop(key, None)
+        if partner is None:
+            return
+        self._partner.pop(partner, None)
+        for k in (key, partner):
+            if self._blended.pop(k, None) is not None:
+                self._version[k] = self._version.get(k, 0) + 1
+
+    def partner_of(self, key: str) -> str | None:
+        return self._partner.get(key)
+
+    # Scores
+    def _reblend(self, a: str, b: str) -> None:
+        own_a, own_b = self._own.get(a), self._own.get(b)
+        if own_a is None or own_b is None:
+            return
+        self._blended[a] = blend_mutual(own_a, clip_scores(own_b))
+        self._blended[b] = blend_mutual(own_b, clip_scores(own_a))
+        self._version[a] = self._version.get(a, 0) + 1
+        self._version[b] = self._version.get(b, 0) + 1
+
+    def _drop_blends(self, key: str) -> None:
+        partner = self._partner.get(key)
+        for k in (key, partner):
+            if k is not None and self._blended.pop(k, None) is not None:
+                self._version[k] = self._version.get(k, 0) + 1
+
+    def update(self, key: str, own, share: bool) -> np.ndarray | None:
+        """Records `key`'s latest unclipped self scores and whether they may be blended into the partner's.
+
+        Returns key's new mutual blend, or None unless both linked members share.
+        With share=False the scores are not kept at all, and any blend the pair had is dropped.
+        """
+        own = np.array(own, dtype=float)
+        with self._lock:
+            if not share:
+                self._stop_sharing(key)
+                return None
+            self._own[key] = own
+            partner = self._partner.get(key)
+            if partner is None:
+                return None
+            self._reblend(key, partner)
+            blended = self._blended.get(key)
+            return None if blended is None else blended.copy()
+
+    def stop_sharing(self, key: str) -> None:
+        """Withdraws `key`'s opt-in: forgets their scores and drops both blends of the pair."""
+        with self._lock:
+            self._stop_sharing(key)
+
+    def _stop_sharing(self, key: str) -> None:
+        self._own.pop(key, None)
+        self._drop_blends(key)
+
+    def partner_scores(self, key: str) -> np.ndarray | None:
+        """The partner's latest shared category scores (clipped), or None."""
+        with self._lock:
+            partner = self._partner.get(key)
+            own = self._own.get(partner) if partner is not None else None
+            return None if own is None else clip_scores(own)
+
+    def blended(self, key: str) -> np.ndarray | None:
+        with self._lock:
+            blended = self._blended.get(key)
+            return None if blended is None else blended.copy()
+
+    def version(self, key: str) -> int:
+        """Changes whenever `key`'s mutual blend changes (own or partner resubmit, link, unlink)."""
+        return self._version.get(key, 0)
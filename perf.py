@@ -0,0 +1,141 @@
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# ------------------------------------------------------------
+# RelateScore™ runtime timing histograms (Streamlit-free, thread-safe)
+# - One process-wide registry (app.py keeps it in st.cache_resource) with a
+#   histogram per instrumented name: page renders, compute_scores, wheel
+#   rendering, invite store calls
+# - Histograms use fixed log-spaced buckets (~5% wide, 1us..~100s), so
+#   recording is O(1), memory is constant under any traffic, and p50/p95/p99
+#   are read from bucket counts with ~5% error
+# - Idle waits (blocking on an Event) are timed with idle(): recorded under
+#   their own name and subtracted from every enclosing time() block on the
+#   same thread, so a page that just waits doesn't rank as expensive
+# ------------------------------------------------------------
+
+BUCKET_GROWTH = 1.05
+MIN_SECONDS = 1e-6
+N_BUCKETS = 380  # MIN_SECONDS * 1.05 ** 380 ~= 113 s; slower samples land in the last bucket
+_LOG_GROWTH = math.log(BUCKET_GROWTH)
+
+
+def _bucket(seconds: float) -> int:
+    if seconds <= MIN_SECONDS:
+        return 0
+    return min(N_BUCKETS - 1, int(math.log(seconds / MIN_SECONDS) / _LOG_GROWTH) + 1)
+
+def _bucket_seconds(i: int) -> float:
+    """Geometric midpoint of bucket i."""
+    if i == 0:
+        return MIN_SECONDS
+    return MIN_SECONDS * BUCKET_GROWTH ** (i - 0.5)
+
+
+class Histogram:
+    """Count, total, max and log-bucketed distribution of durations in seconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._buckets = [0] * N_BUCKETS
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        i = _bucket(seconds)
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+            self._buckets[i] += 1
+
+    def quantile(self, q: float) -> float:
+        with self._lock:
+            count, buckets, max_seen = self.count, list(self._buckets), self.max
+        if not count:
+            return 0.0
+        rank = max(1, math.ceil(q * count))
+        seen = 0
+        for i, n in enumerate(buckets):
+            seen += n
+            if seen >= rank:
+                return min(_bucket_seconds(i), max_seen)
+        return max_seen
+
+    def summary(self, quantiles=(0.5, 0.95, 0.99)) -> dict:
+        out = {"count": self.count, "total_s": self.total,
+               "mean_s": self.total / self.count if self.count else 0.0, "max_s": self.max}
+        for q in quantiles:
+            out[f"p{round(q * 100)}_s"] = self.quantile(q)
+        return out
+
+
+class TimingRegistry:
+    """name -> Histogram, with helpers to time blocks and functions."""
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._hists = {}
+        self._lock = threading.Lock()
+        self._idle = threading.local()  # .seconds: idle time recorded on this thread so far
+        self.started_at = time.time()
+
+    def histogram(self, name: str) -> Histogram:
+        hist = self._hists.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self._hists.setdefault(name, Histogram())
+        return hist
+
+    def record(self, name: str, seconds: float) -> None:
+        self.histogram(name).record(seconds)
+
+    @contextmanager
+    def time(self, name: str):
+        """Records the block's wall time, minus idle() waits inside it, under `name` (also when it raises, e.g. st.rerun)."""
+        t0 = self._clock()
+        idle0 = self._idle_seconds()
+        try:
+            yield
+        finally:
+            self.record(name, self._clock() - t0 - (self._idle_seconds() - idle0))
+
+    def _idle_seconds(self) -> float:
+        return getattr(self._idle, "seconds", 0.0)
+
+    @contextmanager
+    def idle(self, name: str):
+        """Records a wait that uses no CPU under `name` and leaves it out of enclosing time() blocks."""
+        t0 = self._clock()
+        try:
+            yield
+        finally:
+            elapsed = self._clock() - t0
+            self.record(name, elapsed)
+            self._idle.seconds = self._idle_seconds() + elapsed
+
+    def instrument(self, name: str):
+        """Decorator form of time()."""
+        def wrap(fn):
+            @functools.wraps(fn)
+            def timed_fn(*args, **kwargs):
+                with self.time(name):
+                    return fn(*args, **kwargs)
+            return timed_fn
+        return wrap
+
+    def names(self) -> list:
+        return sorted(self._hists)
+
+    def summaries(self, prefix: str = "") -> dict:
+        return {name: self._hists[name].summary() for name in self.names() if name.startswith(prefix)}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hists = {}
+            self.started_at = time.time()
@@ -0,0 +1,229 @@
+import bisect
+import json
+import math
+import random
+import threading
+
+from content import CATEGORIES
+
+# ------------------------------------------------------------
+# RelateScore™ population percentiles (Streamlit-free, thread-safe)
+# - KLL quantile sketch (Karnin, Lang, Liberty 2016): a stack of compactors;
+#   a full level is sorted and every other item moves up a level with twice
+#   the weight. Memory stays O(k) items however many scores are added, and
+#   rank error is ~1.7/k of the count
+# - Sketches merge level by level, so per-process sketches can be combined;
+#   to_dict()/from_dict() are JSON-safe for shipping them between processes
+# - Rank queries bisect a sorted (value, cumulative weight) view that is
+#   rebuilt only after the sketch changed, so repeat lookups are ~1us
+# ------------------------------------------------------------
+
+DEFAULT_K = 200
+LEVEL_SHRINK = 2.0 / 3.0  # each level below the top holds 2/3 of the one above
+MIN_LEVEL_CAPACITY = 2
+RGI = "RGI"
+
+
+class KLLSketch:
+    """Streaming quantile sketch of floats. Not thread-safe; see PopulationSketches."""
+
+    def __init__(self, k: int = DEFAULT_K, seed: int | None = None):
+        if k < MIN_LEVEL_CAPACITY:
+            raise ValueError(f"k must be >= {MIN_LEVEL_CAPACITY}")
+        self.k = int(k)
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._levels = [[]]  # level h holds items of weight 2**h
+        self._size = 0       # items held across all levels
+        self._limit = self._max_size()  # compress once _size reaches this
+        self._rng = random.Random(seed)
+        self._view = None    # (sorted values, cumulative weights), None when stale
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self._levels) - h - 1
+        return max(MIN_LEVEL_CAPACITY, int(math.ceil(self.k * LEVEL_SHRINK ** depth)))
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self._levels)))
+
+    def update(self, value: float) -> None:
+        value = float(value)
+        if value != value:  # NaN has no rank
+            return
+        self._levels[0].append(value)
+        self._size += 1
+        self.n += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self._view = None
+        if self._size >= self._limit:
+            self._compress()
+
+    def update_many(self, values) -> None:
+        for v in values:
+            self.update(v)
+
+    def _grow(self) -> None:
+        self._levels.append([])
+        self._limit = self._max_size()
+
+    def _compress(self) -> None:
+        for h, level in enumerate(self._levels):
+            if len(level) < self._capacity(h):
+                continue
+            if h + 1 == len(self._levels):
+                self._grow()
+            # An odd item out stays behind, so the weight moved up is exact
+            keep = [level.pop()] if len(level) % 2 else []
+            level.sort()
+            self._levels[h + 1].extend(level[self._rng.getrandbits(1)::2])
+            self._levels[h] = keep
+            self._size = sum(len(lv) for lv in self._levels)
+            if self._size < self._limit:
+                break
+
+    def merge(self, other: "KLLSketch") -> None:
+        """Adds `other`'s items into this sketch (other is unchanged)."""
+        if not other.n:
+            return
+        while len(self._levels) < len(other._levels):
+            self._grow()
+        for h, level in enumerate(other._levels):
+            self._levels[h].extend(level)
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._size = sum(len(lv) for lv in self._levels)
+        self._view = None
+        while self._size >= self._limit:
+            before = self._size
+            self._compress()
+            if self._size == before:
+                break
+
+    # Queries
+    def _sorted_view(self) -> tuple:
+        view = self._view
+        if view is None:
+            weighted = sorted((v, 1 << h) for h, level in enumerate(self._levels) for v in level)
+            values, cum, total = [], [], 0
+            for v, w in weighted:
+                total += w
+                values.append(v)
+                cum.append(total)
+            view = self._view = (values, cum)
+        return view
+
+    def rank(self, value: float) -> float:
+        """Estimated fraction of added values <= value (0..1)."""
+        if not self.n:
+            return 0.0
+        values, cum = self._sorted_view()
+        i = bisect.bisect_right(values, float(value))
+        return cum[i - 1] / cum[-1] if i else 0.0
+
+    def percentile(self, value: float) -> float:
+        """Percentile rank of `value` (0..100), e.g. 63.4 -> 71.2."""
+        return 100.0 * self.rank(value)
+
+    def quantile(self, q: float) -> float:
+        """Estimated value at fraction q (0..1); NaN when empty."""
+        if not self.n:
+            return math.nan
+        if q <= 0.0:
+            return self.min
+        if q >= 1.0:
+            return self.max
+        values, cum = self._sorted_view()
+        i = bisect.bisect_left(cum, q * cum[-1])
+        return values[min(i, len(values) - 1)]
+
+    # Serialization
+    def to_dict(self) -> dict:
+        empty = not self.n
+        return {"k": self.k, "n": self.n, "min": None if empty else self.min, "max": None if empty else self.max,
+                "levels": [list(level) for level in self._levels]}
+
+    @classmethod
+    def from_dict(cls, data: dict, seed: int | None = None) -> "KLLSketch":
+        sketch = cls(int(data["k"]), seed)
+        sketch.n = int(data["n"])
+        sketch._levels = [[float(v) for v in level] for level in data["levels"]] or [[]]
+        sketch._size = sum(len(lv) for lv in sketch._levels)
+        sketch._limit = sketch._max_size()
+        if sketch.n:
+            sketch.min, sketch.max = float(data["min"]), float(data["max"])
+        return sketch
+
+
+class PopulationSketches:
+    """One KLLSketch per category plus RGI, over every submission this process has scored."""
+
+    def __init__(self, categories=CATEGORIES, k: int = DEFAULT_K, seed: int | None = None):
+        self.categories = tuple(categories)
+        self.k = k
+        self._sketches = {name: KLLSketch(k, seed) for name in (*self.categories, RGI)}
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return self._sketches[RGI].n
+
+    def update(self, scores, rgi: float) -> None:
+        """scores: category scores in category order; rgi: the matching RGI."""
+        with self._lock:
+            for name, value in zip(self.categories, scores):
+                self._sketches[name].update(value)
+            self._sketches[RGI].update(rgi)
+
+    def percentile(self, name: str, value: float) -> float:
+        """Percentile rank (0..100) of `value` in category `name` (or "RGI")."""
+        with self._lock:
+            return self._sketches[name].percentile(value)
+
+    def percentiles(self, scores, rgi: float) -> dict:
+        """{category: percentile, ..., "RGI": percentile} for one user's scores."""
+        with self._lock:
+            out = {name: self._sketches[name].percentile(v) for name, v in zip(self.categories, scores)}
+            out[RGI] = self._sketches[RGI].percentile(rgi)
+        return out
+
+    def quantile(self, name: str, q: float) -> float:
+        with self._lock:
+            return self._sketches[name].quantile(q)
+
+    def merge(self, other: "PopulationSketches") -> None:
+        other_sketches = other.snapshot()
+        with self._lock:
+            for name, sketch in other_sketches.items():
+                if name in self._sketches:
+                    self._sketches[name].merge(sketch)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: KLLSketch.from_dict(s.to_dict()) for name, s in self._sketches.items()}
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {"categories": list(self.categories), "k": self.k,
+                    "sketches": {name: s.to_dict() for name, s in self._sketches.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PopulationSketches":
+        pop = cls(data["categories"], int(data["k"]))
+        for name, sketch in data["sketches"].items():
+            pop._sketches[name] = KLLSketch.from_dict(sketch)
+        return pop
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str) -> "PopulationSketches":
+        return cls.from_dict(json.loads(text))
@@ -0,0 +1,44 @@
+from array import array
+
+from content import ASSESSMENT_QUESTIONS, CATEGORIES, LIKERT_QUESTIONS
+
+# ------------------------------------------------------------
+# RelateScore™ compact response model (Streamlit-free, no numpy)
+# - Every question has a fixed integer item ID: category-major, 3 per category
+#   (item = cat_index * 3 + q_index), the same layout scoring.py expects
+# - A session stores its answers as one 24-byte array('b') per instrument
+#   instead of a dict keyed by the full question text
+# - ITEM_CATEGORY maps item ID -> category index for the scorer
+# ------------------------------------------------------------
+
+QUESTIONS_PER_CATEGORY = 3
+N_ITEMS = len(CATEGORIES) * QUESTIONS_PER_CATEGORY  # 24
+LIKERT_MIN = 1
+LIKERT_MAX = 5
+DEFAULT_ANSWER = 3  # slider default
+
+ITEM_CATEGORY = array("b", [i // QUESTIONS_PER_CATEGORY for i in range(N_ITEMS)])
+
+
+def item_id(cat_index: int, q_index: int) -> int:
+    return cat_index * QUESTIONS_PER_CATEGORY + q_index
+
+def _items(questions: dict) -> tuple:
+    return tuple(
+        (item_id(cat_i, q_i), cat_i, text)
+        for cat_i, cat in enumerate(CATEGORIES)
+        for q_i, text in enumerate(questions[cat])
+    )
+
+# (item ID, category index, question text), in item order
+LIKERT_ITEMS = _items(LIKERT_QUESTIONS)
+ASSESSMENT_ITEMS = _items(ASSESSMENT_QUESTIONS)
+
+
+def new_buffer(default: int = DEFAULT_ANSWER) -> array:
+    """One session's answers for one instrument: N_ITEMS signed bytes."""
+    return array("b", [default]) * N_ITEMS
+
+def to_dict(buffer, items=LIKERT_ITEMS) -> dict:
+    """Buffer -> {question text: answer}, for exports/debugging."""
+    return {text: int(buffer[i]) for i, _, text in items}
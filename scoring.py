@@ -0,0 +1,175 @@
+import numpy as np
+
+from content import CATEGORIES
+from responses import ITEM_CATEGORY, N_ITEMS, QUESTIONS_PER_CATEGORY
+
+# ------------------------------------------------------------
+# RelateScore™ scoring engine (Streamlit-free)
+# - Pure NumPy: safe to import from the app, batch jobs, or notebooks
+# - Responses are (N users x 24) arrays indexed by item ID (see responses.py);
+#   a session's array('b') buffer is accepted as a single row
+# ------------------------------------------------------------
+
+# Column order that groups items by category (identity for the current layout)
+_ITEM_ORDER = np.argsort(np.frombuffer(ITEM_CATEGORY, dtype=np.int8), kind="stable")
+_ITEMS_GROUPED = bool((_ITEM_ORDER == np.arange(N_ITEMS)).all())
+
+# RGI weights, aligned with CATEGORIES
+RGI_WEIGHTS = np.array([0.15, 0.15, 0.15, 0.10, 0.15, 0.10, 0.10, 0.10], dtype=float)
+
+SCORE_MIN = 20.0
+SCORE_MAX = 90.0
+
+# Mutual reflection blend: score = SELF_WEIGHT * self + MUTUAL_WEIGHT * partner
+SELF_WEIGHT = 0.4
+MUTUAL_WEIGHT = 0.6
+
+
+def _as_items(responses, name: str) -> np.ndarray:
+    arr = np.asarray(responses, dtype=float)
+    if arr.ndim == 1:
+        arr = arr[np.newaxis, :]
+    if arr.ndim != 2 or arr.shape[1] != N_ITEMS:
+        raise ValueError(f"{name} must have shape (N, {N_ITEMS}), got {arr.shape}")
+    return arr
+
+def category_means(responses, name: str = "responses") -> np.ndarray:
+    """(N x 24) item responses -> (N x 8) per-category means."""
+    arr = _as_items(responses, name)
+    if not _ITEMS_GROUPED:
+        arr = arr[:, _ITEM_ORDER]
+    return arr.reshape(arr.shape[0], len(CATEGORIES), QUESTIONS_PER_CATEGORY).mean(axis=2)
+
+def self_scores(likert, assessment) -> np.ndarray:
+    """Unclipped (N x 8) self-reflection scores: assessment vs Likert baseline, 50 = on baseline."""
+    baseline = category_means(likert, "likert") * 20.0
+    raw = category_means(assessment, "assessment") * 20.0
+    if baseline.shape != raw.shape:
+        raise ValueError("likert and assessment must have the same number of rows")
+
+    # score = raw / baseline * 50, falling back to raw where the baseline is empty
+    safe = np.where(baseline > 0, baseline, 1.0)
+    return np.where(baseline > 0, raw / safe * 50.0, raw)
+
+def clip_scores(scores) -> np.ndarray:
+    return np.clip(np.asarray(scores, dtype=float), SCORE_MIN, SCORE_MAX)
+
+def blend_mutual(own, partner) -> np.ndarray:
+    """SELF_WEIGHT * own (unclipped self scores) + MUTUAL_WEIGHT * partner category scores, clipped."""
+    return clip_scores(SELF_WEIGHT * np.asarray(own, dtype=float) + MUTUAL_WEIGHT * np.asarray(partner, dtype=float))
+
+def category_scores(likert, assessment, mutual=None) -> np.ndarray:
+    """Raw (unsmoothed) category scores for a batch of submissions.
+
+    likert / assessment: (N x 24) Likert 1-5 answers (a single 24-vector is accepted).
+    mutual: optional (N x 8) or (8,) partner scores blended in SELF_WEIGHT/MUTUAL_WEIGHT.
+    Returns an (N x 8) float matrix clipped to [SCORE_MIN, SCORE_MAX].
+    """
+    score = self_scores(likert, assessment)
+    if mutual is not None:
+        return blend_mutual(score, mutual)
+    return clip_scores(score)
+
+def rgi(cat_scores) -> np.ndarray:
+    """Weighted Relationship Growth Index per row of an (N x 8) category matrix."""
+    arr = np.asarray(cat_scores, dtype=float)
+    return np.clip(arr @ RGI_WEIGHTS, SCORE_MIN, SCORE_MAX)
+
+def score_batch(likert, assessment, mutual=None):
+    """One vectorized pass: returns (category matrix (N x 8), RGI vector (N,))."""
+    cats = category_scores(likert, assessment, mutual)
+    return cats, rgi(cats)
+
+def scores_to_dict(row) -> dict:
+    """(8,) category row -> {category: float} as used by the Streamlit session."""
+    return {cat: float(v) for cat, v in zip(CATEGORIES, row)}
+
+def dict_to_scores(scores: dict, default: float = 0.0) -> np.ndarray:
+    """{category: float} -> (8,) row aligned with CATEGORIES."""
+    return np.array([float(scores.get(cat, default)) for cat in CATEGORIES], dtype=float)
+
+
+# -----------------------------
+# Stability Smoothing (EMA + Dampening), vectorized
+# - smooth_step: one update for any broadcastable (..., 8) arrays
+# - smooth_history: replays N users x T submissions x 8 categories
+# -----------------------------
+EMA_ALPHA = 0.25  # 0<alpha<=1; lower = smoother, higher = more responsive
+MAX_DAILY_CHANGE = 15.0  # max allowed change in score points per day (per category)
+MIN_CHANGE_FLOOR = 2.0   # minimum allowed change even if dt is very small (prevents "stuck" feeling)
+OUTLIER_SOFT_THRESHOLD = 25.0  # deltas above this get compressed ("dampened")
+MIN_DT_DAYS = 1.0 / 1440.0  # at least 1 minute between submissions
+
+
+def dt_days(ts, prev_ts) -> np.ndarray:
+    """Elapsed days between submissions, floored at one minute."""
+    dt = np.maximum(0.0, np.asarray(ts, dtype=float) - np.asarray(prev_ts, dtype=float))
+    return np.maximum(dt / 86400.0, MIN_DT_DAYS)
+
+def smooth_step(new_scores, prev_scores, days,
+                alpha: float = EMA_ALPHA,
+                max_daily_change: float = MAX_DAILY_CHANGE,
+                min_change_floor: float = MIN_CHANGE_FLOOR,
+                outlier_threshold: float = OUTLIER_SOFT_THRESHOLD) -> np.ndarray:
+    """EMA smoothing + square-root outlier dampening + time-scaled delta cap.
+
+    new_scores / prev_scores: (..., 8) category arrays; days: (...) elapsed days per row.
+    """
+    new = np.asarray(new_scores, dtype=float)
+    prev = np.asarray(prev_scores, dtype=float)
+
+    # 1) dampen outliers in the update step (smooth, monotonic beyond the threshold)
+    delta = new - prev
+    excess = np.maximum(np.abs(delta) - outlier_threshold, 0.0)
+    damp = np.where(excess > 0, np.sign(delta) * (outlier_threshold + np.sqrt(excess) * 5.0), delta)
+
+    # 2) EMA on the dampened target
+    ema_delta = alpha * damp
+
+    # 3) cap maximum movement based on elapsed time
+    allowed = np.maximum(min_change_floor, max_daily_change * np.asarray(days, dtype=float))[..., np.newaxis]
+    capped = np.clip(ema_delta, -allowed, allowed)
+    return np.clip(prev + capped, SCORE_MIN, SCORE_MAX)
+
+def smooth_history(raw_history, timestamps, prev_scores=None, prev_ts=None, **params) -> np.ndarray:
+    """Replay smoothing over a cohort's submission history.
+
+    raw_history: (N x T x 8) raw category scores; timestamps: (N x T) epoch seconds.
+    Ragged histories are padded with NaN timestamps; padded steps keep the previous
+    state and come back as NaN rows.
+    prev_scores / prev_ts: optional (N x 8) / (N,) state from before the first step.
+    params: overrides for smooth_step (alpha, max_daily_change, ...).
+    Returns the (N x T x 8) smoothed scores.
+    """
+    raw = np.asarray(raw_history, dtype=float)
+    ts = np.asarray(timestamps, dtype=float)
+    if raw.ndim != 3 or ts.shape != raw.shape[:2]:
+        raise ValueError(f"expected raw (N, T, {len(CATEGORIES)}) and timestamps (N, T), "
+                         f"got {raw.shape} and {ts.shape}")
+    n, t_steps, n_cats = raw.shape
+
+    state = np.zeros((n, n_cats), dtype=float)
+    last_ts = np.zeros(n, dtype=float)
+    has_prev = np.zeros(n, dtype=bool)
+    if prev_scores is not None:
+        state[:] = prev_scores
+        has_prev[:] = True
+        if prev_ts is not None:
+            last_ts[:] = prev_ts
+    # Rows without a previous timestamp are treated as one day apart (like the app)
+    has_prev_ts = has_prev & (last_ts > 0)
+
+    out = np.full_like(raw, np.nan)
+    for t in range(t_steps):
+        ts_t = ts[:, t]
+        valid = ~np.isnan(ts_t)
+        days = np.where(has_prev_ts, dt_days(np.where(valid, ts_t, 0.0), last_ts), 1.0)
+        stepped = smooth_step(raw[:, t], state, days, **params)
+        nxt = np.where(has_prev[:, np.newaxis], stepped, raw[:, t])
+
+        state = np.where(valid[:, np.newaxis], nxt, state)
+        out[valid, t] = state[valid]
+        last_ts = np.where(valid, ts_t, last_ts)
+        has_prev |= valid
+        has_prev_ts |= valid
+    return out
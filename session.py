@@ -0,0 +1,77 @@
+from array import array
+from dataclasses import dataclass, field
+
+import responses
+from content import CATEGORIES
+
+# ------------------------------------------------------------
+# RelateScore™ per-session model (Streamlit-free)
+# - One slotted dataclass stored under a single st.session_state key instead
+#   of ~20 loose keys: no per-instance __dict__, typed fields
+# - Score vectors are array('d') in CATEGORIES order (8 doubles, no boxed
+#   floats or per-category dict entries); the smoothed vector doubles as the
+#   smoothing state (it used to be copied into both "scores" and "prev_scores")
+# - Insights are stored as one rule index per category; the text lives in the
+#   process-wide InsightEngine cache
+# ------------------------------------------------------------
+
+SESSION_KEY = "relatescore"
+
+
+def score_vector(values) -> array:
+    """Category scores (dict or sequence in CATEGORIES order) -> array('d')."""
+    if isinstance(values, dict):
+        values = [values[c] for c in CATEGORIES]
+    return array("d", (float(v) for v in values))
+
+def scores_dict(vector) -> dict:
+    return {cat: float(v) for cat, v in zip(CATEGORIES, vector)}
+
+
+@dataclass(slots=True)
+class Session:
+    page: str = "entry"
+    logged_in: bool = False
+    consent_accepted: bool = False
+    username: str = ""
+    invite_waiting: bool = False
+    invite_accepted: bool = False
+
+    # Invite flow
+    invite_code: str | None = None   # last generated code in THIS session
+    partner_code: str = ""
+    pause_waiting: bool = False
+
+    # Partner pairing
+    use_mutual: bool = False
+    pair_session_key: str = ""
+    pair_version: int | None = None  # PairIndex.version() the current scores were blended at
+
+    # Assessment answers: array('b') indexed by item ID (responses.py)
+    likert: array = field(default_factory=responses.new_buffer)
+    assessment: array = field(default_factory=responses.new_buffer)
+    reflection: str = ""
+
+    # Scores (array('d') in CATEGORIES order, None until the first submission)
+    raw: array | None = None         # before smoothing
+    smoothed: array | None = None    # shown on the dashboard; also the next smoothing baseline
+    rgi: float = 0.0
+    scored_at: float | None = None   # when `smoothed` was computed
+    before: array | None = None      # smoothed scores before the latest submission (delta insights)
+    before_at: float | None = None   # when `before` was computed (re-blending re-smooths from it)
+    history: object = None           # history.ScoreRing, created on the first submission
+    insight_rules: array | None = None  # array('b'): InsightEngine rule index per category, -1 = none
+
+    # Server work: full script runs in this session, and the run "Start Reflection" was clicked in
+    runs: int = 0
+    reflection_started_run: int = 0
+
+    @property
+    def has_scores(self) -> bool:
+        return self.smoothed is not None
+
+    def scores(self) -> dict:
+        """{category: smoothed score, "RGI": rgi} for display."""
+        out = scores_dict(self.smoothed)
+        out["RGI"] = self.rgi
+        return out
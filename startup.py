@@ -0,0 +1,66 @@
+import importlib
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# ------------------------------------------------------------
+# Cold-start timing report
+# - app.py imports this module first, so PROCESS_T0 marks the first script run
+# - Each phase is recorded the first time it happens in this process
+#   (later reruns are warm and would only hide the cold numbers)
+# - The report is printed to stderr once, after the first full script run;
+#   phases first seen later (e.g. lazy imports) are printed as they happen.
+#   Set RELATESCORE_STARTUP_REPORT=0 to silence it
+# ------------------------------------------------------------
+
+PROCESS_T0 = time.perf_counter()
+TIMINGS = {}  # phase -> seconds, first occurrence only
+_reported = False
+
+
+def _enabled() -> bool:
+    return os.environ.get("RELATESCORE_STARTUP_REPORT", "1") != "0"
+
+def _record(phase: str, seconds: float) -> None:
+    if phase in TIMINGS:
+        return
+    TIMINGS[phase] = seconds
+    if _reported and _enabled():
+        print(f"RelateScore startup: {seconds * 1000.0:.1f} ms  {phase}", file=sys.stderr, flush=True)
+
+@contextmanager
+def timed(phase: str):
+    """Records how long the block took, the first time `phase` runs."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(phase, time.perf_counter() - t0)
+
+def mark(phase: str) -> None:
+    """Records the time since PROCESS_T0, the first time `phase` is reached."""
+    _record(phase, time.perf_counter() - PROCESS_T0)
+
+def lazy_import(name: str):
+    """Imports `name` on first use and records the cold import time."""
+    module = sys.modules.get(name)
+    if module is None:
+        with timed(f"import {name}"):
+            module = importlib.import_module(name)
+    return module
+
+def report() -> str:
+    lines = ["RelateScore startup timings (first occurrence per process):"]
+    for phase, seconds in TIMINGS.items():
+        lines.append(f"  {seconds * 1000.0:9.1f} ms  {phase}")
+    return "\n".join(lines)
+
+def print_report_once() -> None:
+    global _reported
+    if _reported:
+        return
+    mark("first script run complete")
+    _reported = True
+    if _enabled():
+        print(report(), file=sys.stderr, flush=True)
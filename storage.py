@@ -0,0 +1,468 @@
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+
+from invites import InviteStore
+from users import UserStore
+
+# ------------------------------------------------------------
+# RelateScore™ storage backends (Streamlit-free)
+# - Storage: the interface the app talks to for users, invites and score history
+# - MemoryStorage: process-local (the original prototype behavior)
+# - SQLiteStorage: durable, shareable between processes on one host
+# Pick one with open_storage(url): "memory" or "sqlite:///path/to/relatescore.db"
+# ------------------------------------------------------------
+
+SCORE_HISTORY_LIMIT = 20
+
+
+class Storage(ABC):
+    """Backend interface. Invite reasons match InviteStore: ok | missing | expired | revoked | used.
+
+    Abstract, so a backend missing a method fails when open_storage() builds it, not mid-request.
+    """
+
+    invite_ttl_seconds: float
+
+    # Users
+    @abstractmethod
+    def add_user(self, username: str, record: dict) -> bool:
+        """Inserts {"pw_hash", "created_at"} if `username` is free. Returns False if it exists."""
+
+    @abstractmethod
+    def get_user(self, username: str) -> dict | None:
+        ...
+
+    @abstractmethod
+    def set_pw_hash(self, username: str, pw_hash: str) -> None:
+        """Replaces a user's password hash (e.g. upgrading a legacy or lower-cost hash)."""
+
+    # Invites
+    @abstractmethod
+    def register_invite(self, code: str, created_at: float | None = None) -> None:
+        ...
+
+    @abstractmethod
+    def register_new_invite(self, code: str, created_at: float | None = None) -> bool:
+        """Atomically registers `code` unless it is live. Returns False if it was taken."""
+
+    @abstractmethod
+    def get_invite(self, code: str) -> dict | None:
+        """Live invite metadata {"created_at", "used", "revoked"}, or None if missing/expired."""
+
+    @abstractmethod
+    def validate_invite(self, code: str):
+        ...
+
+    @abstractmethod
+    def claim_invite(self, code: str):
+        """Atomic validate-and-consume. Returns (is_valid, reason)."""
+
+    @abstractmethod
+    def revoke_invite(self, code: str) -> None:
+        ...
+
+    @abstractmethod
+    def is_invite_accepted(self, code: str) -> bool:
+        ...
+
+    @abstractmethod
+    def wait_for_acceptance(self, code: str, timeout: float) -> bool:
+        ...
+
+    @abstractmethod
+    def purge_expired_invites(self) -> int:
+        ...
+
+    @abstractmethod
+    def live_invite_count(self) -> int:
+        """Invite codes currently stored (may include expired codes not yet purged)."""
+
+    # Score history
+    @abstractmethod
+    def append_scores(self, username: str, ts: float, raw: dict, smoothed: dict, rgi: float) -> None:
+        ...
+
+    @abstractmethod
+    def latest_scores(self, username: str):
+        """Returns (smoothed dict, ts) of the newest entry, or None."""
+
+    @abstractmethod
+    def score_history(self, username: str, limit: int = SCORE_HISTORY_LIMIT) -> list:
+        """Newest-last list of {"ts", "raw", "smoothed", "rgi"}."""
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryStorage(Storage):
+    def __init__(self, invite_ttl_seconds: float, history_limit: int = SCORE_HISTORY_LIMIT,
+                 on_invite_expired=None):
+        self.invite_ttl_seconds = float(invite_ttl_seconds)
+        self.invites = InviteStore(invite_ttl_seconds, on_expire=on_invite_expired)
+        self.users = UserStore()
+        self._history_limit = history_limit
+        self._history = {}  # username -> deque of entries
+
+    def add_user(self, username: str, record: dict) -> bool:
+        return self.users.add(username, record)
+
+    def get_user(self, username: str) -> dict | None:
+        return self.users.get(username)
+
+    def set_pw_hash(self, username: str, pw_hash: str) -> None:
+        self.users.update(username, pw_hash=pw_hash)
+
+    def register_invite(self, code: str, created_at: float | None = None) -> None:
+        self.invites.register(code, created_at)
+
+    def register_new_invite(self, code: str, created_at: float | None = None) -> bool:
+        return self.invites.register_new(code, created_at)
+
+    def get_invite(self, code: str) -> dict | None:
+        return self.invites.get(code)
+
+    def validate_invite(self, code: str):
+        return self.invites.validate(code)
+
+    def claim_invite(self, code: str):
+        return self.invites.claim(code)
+
+    def revoke_invite(self, code: str) -> None:
+        self.invites.revoke(code)
+
+    def is_invite_accepted(self, code: str) -> bool:
+        return self.invites.is_accepted(code)
+
+    def wait_for_acceptance(self, code: str, timeout: float) -> bool:
+        return self.invites.wait_for_acceptance(code, timeout)
+
+    def purge_expired_invites(self) -> int:
+        return self.invites.purge_expired()
+
+    def live_invite_count(self) -> int:
+        return len(self.invites)
+
+    def append_scores(self, username: str, ts: float, raw: dict, smoothed: dict, rgi: float) -> None:
+        hist = self._history.setdefault(username, deque(maxlen=self._history_limit))
+        hist.append({"ts": float(ts), "raw": dict(raw), "smoothed": dict(smoothed), "rgi": float(rgi)})
+
+    def latest_scores(self, username: str):
+        hist = self._history.get(username)
+        if not hist:
+            return None
+        last = hist[-1]
+        return dict(last["smoothed"]), last["ts"]
+
+    def score_history(self, username: str, limit: int = SCORE_HISTORY_LIMIT) -> list:
+        return list(self._history.get(username, ()))[-limit:]
+
+
+# -----------------------------
+# SQLite
+# - WAL mode: readers never block the writer (one writer at a time, per SQLite)
+# - Small connection pool: no per-call connect cost, statements stay in each
+#   connection's prepared-statement cache
+# - Indexes on invites(code) (primary key) and invites(created_at) for expiry
+# - Score history appends are buffered and written with executemany, by the
+#   appending call once a batch fills and by a daemon thread every
+#   flush_interval seconds otherwise, so a quiet server still writes them out
+# -----------------------------
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username   TEXT PRIMARY KEY,
+    pw_hash    TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS invites (
+    code       TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    used       INTEGER NOT NULL DEFAULT 0,
+    revoked    INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_invites_created_at ON invites(created_at);
+CREATE TABLE IF NOT EXISTS score_history (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    ts       REAL NOT NULL,
+    rgi      REAL NOT NULL,
+    raw      TEXT NOT NULL,
+    smoothed TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_score_history_user_ts ON score_history(username, ts);
+"""
+
+_SQL_INSERT_USER = "INSERT OR IGNORE INTO users (username, pw_hash, created_at) VALUES (?, ?, ?)"
+_SQL_GET_USER = "SELECT pw_hash, created_at FROM users WHERE username = ?"
+_SQL_SET_PW_HASH = "UPDATE users SET pw_hash = ? WHERE username = ?"
+_SQL_UPSERT_INVITE = ("INSERT INTO invites (code, created_at, used, revoked) VALUES (?, ?, 0, 0) "
+                      "ON CONFLICT(code) DO UPDATE SET created_at = excluded.created_at, used = 0, revoked = 0")
+_SQL_INSERT_NEW_INVITE = "INSERT OR IGNORE INTO invites (code, created_at, used, revoked) VALUES (?, ?, 0, 0)"
+_SQL_GET_INVITE = "SELECT created_at, used, revoked FROM invites WHERE code = ?"
+_SQL_CLAIM_INVITE = ("UPDATE invites SET used = 1 "
+                     "WHERE code = ? AND used = 0 AND revoked = 0 AND created_at >= ?")
+_SQL_REVOKE_INVITE = "UPDATE invites SET revoked = 1 WHERE code = ?"
+_SQL_PURGE_INVITES = "DELETE FROM invites WHERE created_at < ?"
+_SQL_COUNT_INVITES = "SELECT COUNT(*) FROM invites"
+_SQL_INSERT_SCORES = "INSERT INTO score_history (username, ts, rgi, raw, smoothed) VALUES (?, ?, ?, ?, ?)"
+_SQL_SCORE_HISTORY = ("SELECT ts, rgi, raw, smoothed FROM score_history "
+                      "WHERE username = ? ORDER BY ts DESC LIMIT ?")
+
+
+class SQLiteStorage(Storage):
+    def __init__(self, path: str, invite_ttl_seconds: float,
+                 pool_size: int = 4, write_batch_size: int = 64, flush_interval: float = 1.0,
+                 acceptance_poll_seconds: float = 0.25, clock=time.time, on_invite_expired=None):
+        self.path = path
+        self.invite_ttl_seconds = float(invite_ttl_seconds)
+        self._clock = clock
+        self._on_invite_expired = on_invite_expired
+        self._write_batch_size = write_batch_size
+        self._flush_interval = flush_interval
+        self._acceptance_poll_seconds = acceptance_poll_seconds
+
+        self._pool = queue.Queue()
+        for _ in range(max(1, pool_size)):
+            self._pool.put(self._connect())
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+        self._pending_scores = []
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one flush at a time; only flushes remove pending rows
+        self._events = {}  # code -> [threading.Event, waiter count], only while someone waits
+        self._events_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="relatescore-sqlite-flush", daemon=True)
+        self._flusher.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None,
+                               check_same_thread=False, cached_statements=64)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=10000")
+        return conn
+
+    @contextmanager
+    def _conn(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def _transaction(self):
+        # Connections autocommit each statement (isolation_level=None); this groups several
+        with self._conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    # Users
+    def add_user(self, username: str, record: dict) -> bool:
+        with self._conn() as conn:
+            cur = conn.execute(_SQL_INSERT_USER, (username, record["pw_hash"], float(record["created_at"])))
+            return cur.rowcount == 1
+
+    def get_user(self, username: str) -> dict | None:
+        with self._conn() as conn:
+            row = conn.execute(_SQL_GET_USER, (username,)).fetchone()
+        if row is None:
+            return None
+        return {"pw_hash": row[0], "created_at": row[1]}
+
+    def set_pw_hash(self, username: str, pw_hash: str) -> None:
+        with self._conn() as conn:
+            conn.execute(_SQL_SET_PW_HASH, (pw_hash, username))
+
+    # Invites
+    def register_invite(self, code: str, created_at: float | None = None) -> None:
+        created_at = self._clock() if created_at is None else float(created_at)
+        with self._conn() as conn:
+            purged = conn.execute(_SQL_PURGE_INVITES, (created_at - self.invite_ttl_seconds,)).rowcount
+            conn.execute(_SQL_UPSERT_INVITE, (code, created_at))
+        self._expired(purged)
+
+    def register_new_invite(self, code: str, created_at: float | None = None) -> bool:
+        # Purge and insert share one transaction, so only a live code can block the insert
+        created_at = self._clock() if created_at is None else float(created_at)
+        with self._transaction() as conn:
+            purged = conn.execute(_SQL_PURGE_INVITES, (created_at - self.invite_ttl_seconds,)).rowcount
+            inserted = conn.execute(_SQL_INSERT_NEW_INVITE, (code, created_at)).rowcount
+        self._expired(purged)
+        return inserted == 1
+
+    def _cutoff(self) -> float:
+        return self._clock() - self.invite_ttl_seconds
+
+    def get_invite(self, code: str) -> dict | None:
+        with self._conn() as conn:
+            row = conn.execute(_SQL_GET_INVITE, (code,)).fetchone()
+        if row is None or row[0] < self._cutoff():
+            return None
+        return {"created_at": row[0], "used": bool(row[1]), "revoked": bool(row[2])}
+
+    def validate_invite(self, code: str):
+        meta = self.get_invite(code)
+        if not meta:
+            return False, "missing"
+        if meta["revoked"]:
+            return False, "revoked"
+        if meta["used"]:
+            return False, "used"
+        return True, "ok"
+
+    def claim_invite(self, code: str):
+        # Compare-and-set in one UPDATE: only one caller can flip used 0 -> 1
+        with self._conn() as conn:
+            cur = conn.execute(_SQL_CLAIM_INVITE, (code, self._cutoff()))
+        if cur.rowcount == 1:
+            self._notify(code)
+            return True, "ok"
+        return self.validate_invite(code)
+
+    def revoke_invite(self, code: str) -> None:
+        with self._conn() as conn:
+            conn.execute(_SQL_REVOKE_INVITE, (code,))
+        self._notify(code)
+
+    def is_invite_accepted(self, code: str) -> bool:
+        meta = self.get_invite(code)
+        return bool(meta and meta["used"])
+
+    def _notify(self, code: str) -> None:
+        with self._events_lock:
+            entry = self._events.pop(code, None)
+        if entry is not None:
+            entry[0].set()
+
+    def wait_for_acceptance(self, code: str, timeout: float) -> bool:
+        """Wakes immediately for claims made in this process; polls the DB for other processes."""
+        deadline = self._clock() + timeout
+        with self._events_lock:
+            entry = self._events.get(code)
+            if entry is None:
+                entry = self._events[code] = [threading.Event(), 0]
+            entry[1] += 1
+        try:
+            while True:
+                meta = self.get_invite(code)
+                if not meta or meta["used"] or meta["revoked"]:
+                    return bool(meta and meta["used"])
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    return False
+                if entry[0].wait(min(remaining, self._acceptance_poll_seconds)):
+                    return self.is_invite_accepted(code)
+        finally:
+            # The last waiter out removes the event, whether the code was claimed here,
+            # claimed by another process, expired or the wait timed out
+            with self._events_lock:
+                entry[1] -= 1
+                if not entry[1] and self._events.get(code) is entry:
+                    del self._events[code]
+
+    def _expired(self, count: int) -> None:
+        if count > 0 and self._on_invite_expired is not None:
+            self._on_invite_expired(count)
+
+    def purge_expired_invites(self) -> int:
+        with self._conn() as conn:
+            purged = conn.execute(_SQL_PURGE_INVITES, (self._cutoff(),)).rowcount
+        self._expired(purged)
+        return purged
+
+    def live_invite_count(self) -> int:
+        with self._conn() as conn:
+            return conn.execute(_SQL_COUNT_INVITES).fetchone()[0]
+
+    # Score history
+    def append_scores(self, username: str, ts: float, raw: dict, smoothed: dict, rgi: float) -> None:
+        row = (username, float(ts), float(rgi), json.dumps(raw), json.dumps(smoothed))
+        with self._pending_lock:
+            self._pending_scores.append(row)
+            due = len(self._pending_scores) >= self._write_batch_size
+        if due:
+            self.flush()
+
+    def _flush_loop(self) -> None:
+        while not self._closed.wait(self._flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass  # rows stay buffered; retried on the next tick
+
+    def flush(self) -> None:
+        # Rows stay in the buffer until committed, so readers always find them in one place or
+        # the other; appends only add to the end, so the flushed rows are still its prefix
+        with self._flush_lock:
+            with self._pending_lock:
+                rows = list(self._pending_scores)
+            if not rows:
+                return
+            with self._transaction() as conn:
+                conn.executemany(_SQL_INSERT_SCORES, rows)
+            with self._pending_lock:
+                del self._pending_scores[:len(rows)]
+
+    def _pending_for(self, username: str) -> list:
+        with self._pending_lock:
+            return [r for r in self._pending_scores if r[0] == username]
+
+    def score_history(self, username: str, limit: int = SCORE_HISTORY_LIMIT) -> list:
+        # Buffer first, then the DB: a row flushed in between is then in both (deduplicated
+        # below) rather than in neither, since flush() commits before it drops rows
+        pending = [row[1:] for row in self._pending_for(username)]
+        with self._conn() as conn:
+            rows = conn.execute(_SQL_SCORE_HISTORY, (username, limit)).fetchall()
+        stored = set(rows)
+        rows = [*reversed(rows), *(row for row in pending if row not in stored)]
+        return [{"ts": ts, "rgi": rgi, "raw": json.loads(raw), "smoothed": json.loads(sm)}
+                for ts, rgi, raw, sm in rows[-limit:]]
+
+    def latest_scores(self, username: str):
+        hist = self.score_history(username, limit=1)
+        if not hist:
+            return None
+        return dict(hist[-1]["smoothed"]), hist[-1]["ts"]
+
+    def close(self) -> None:
+        self._closed.set()
+        self._flusher.join()
+        self.flush()
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+def open_storage(url: str | None, invite_ttl_seconds: float, on_invite_expired=None) -> Storage:
+    """Opens a backend from a URL: memory (default) or sqlite:///path/to/file.db
+
+    on_invite_expired(n) is called whenever n codes are dropped for expiry.
+    """
+    url = (url or "memory").strip()
+    if url == "memory":
+        return MemoryStorage(invite_ttl_seconds, on_invite_expired=on_invite_expired)
+    if url.startswith("sqlite:///"):
+        path = url[len("sqlite:///"):]
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        storage = SQLiteStorage(path, invite_ttl_seconds, on_invite_expired=on_invite_expired)
+        atexit.register(storage.close)  # write out buffered score history
+        return storage
+    raise ValueError(f"Unsupported storage url: {url!r}")
@@ -0,0 +1,99 @@
+from array import array
+
+import scoring
+from content import CATEGORIES
+from history import ScoreRing
+from session import Session, score_vector, scores_dict
+
+# ------------------------------------------------------------
+# RelateScore™ submission scoring (Streamlit-free)
+# - The body of app.compute_scores / generate_insights with the shared
+#   process objects (pair index, storage, population sketches) passed in,
+#   so bench/suite.py times exactly what a submission runs
+# - app.py adds only the session lookup, metrics and timing wrappers
+# ------------------------------------------------------------
+
+
+def dt_days(now: float, prev_ts: float | None) -> float:
+    """Days since the previous submission (1.0 when there is none)."""
+    if not prev_ts:
+        return 1.0
+    return float(scoring.dt_days(now, float(prev_ts)))
+
+
+def smooth_scores(new_scores: dict, prev_scores: dict | None, days: float) -> dict:
+    """Apply EMA smoothing + outlier dampening + max-delta cap to category score dicts (not including RGI)."""
+    if not prev_scores:
+        return new_scores
+    new_v = scoring.dict_to_scores(new_scores)
+    old_v = scoring.dict_to_scores({**new_scores, **prev_scores})
+    return scoring.scores_to_dict(scoring.smooth_step(new_v, old_v, days))
+
+
+def score_submission(s: Session, likert, assessment, *, pairs, pair_key: str, storage, population,
+                     now: float, history_capacity: int) -> None:
+    """Scores one assessment into `s`: pair blend, smoothing, RGI, history, storage and population."""
+    # --- Step 1: Compute "raw" category scores from the current assessment session
+    own = scoring.self_scores(likert, assessment)[0]
+    # Mutual reflection: own scores reach the pair index only if this member opted in, and the
+    # blend with the partner's latest scores exists only once both have (None until then)
+    blended = pairs.update(pair_key, own, share=s.use_mutual)
+    s.pair_version = pairs.version(pair_key)
+    raw = scoring.clip_scores(own) if blended is None else blended
+
+    # --- Step 2: Apply stability smoothing (EMA + dampening)
+    # Prior state comes from this session, else from storage (e.g. after a restart or on a new device)
+    prev, prev_ts = s.smoothed, s.scored_at
+    if prev is None and s.username:
+        latest = storage.latest_scores(s.username)
+        if latest:
+            prev, prev_ts = score_vector(latest[0]), latest[1]
+    smoothed = raw if prev is None else scoring.smooth_step(raw, prev, dt_days(now, prev_ts))
+
+    # --- Step 3: Compute RGI from the (smoothed) category scores
+    rgi = float(scoring.rgi(smoothed))
+
+    # --- Step 4: Persist the smoothed state for next computation (session + storage)
+    s.before, s.before_at = prev, prev_ts  # for delta insights and re-blending
+    s.raw = score_vector(raw)
+    s.smoothed = score_vector(smoothed)
+    s.rgi = rgi
+    s.scored_at = now
+    if s.username:
+        storage.append_scores(s.username, now, scores_dict(raw), scores_dict(smoothed), rgi)
+
+    # Session history for the dashboard trend: fixed-size float32 ring, O(1) append
+    if s.history is None:
+        s.history = ScoreRing(history_capacity, len(CATEGORIES))
+    s.history.append(now, raw, smoothed, rgi)
+    population.update(smoothed, rgi)
+
+
+def reblend_submission(s: Session, *, pairs, pair_key: str) -> bool:
+    """Re-scores the latest submission against the partner's newer reflection.
+
+    Not a new submission: raw is the current pair blend of the same own scores,
+    smoothed again from the pre-submission baseline over the original interval,
+    and it replaces the newest history entry. Storage and the population
+    sketches are left alone. Returns False if there is no blend to use.
+    """
+    blended = pairs.blended(pair_key)
+    if blended is None or s.scored_at is None:
+        return False
+    raw = blended
+    prev = s.before
+    smoothed = raw if prev is None else scoring.smooth_step(raw, prev, dt_days(s.scored_at, s.before_at))
+    rgi = float(scoring.rgi(smoothed))
+
+    s.pair_version = pairs.version(pair_key)
+    s.raw = score_vector(raw)
+    s.smoothed = score_vector(smoothed)
+    s.rgi = rgi
+    if s.history is not None:
+        s.history.replace_latest(s.scored_at, raw, smoothed, rgi)
+    return True
+
+
+def insight_rules(engine, smoothed, before) -> array:
+    """array('b'): the matched InsightEngine rule index per category (-1 = none)."""
+    return array("b", engine.evaluate(smoothed, before)[0].tolist())
@@ -0,0 +1,197 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict, deque
+
+# ------------------------------------------------------------
+# RelateScore™ toxicity gate for free-text reflections (Streamlit-free)
+# - Blocklist words and phrases are compiled once into an Aho-Corasick
+#   automaton, so a text is scanned in a single pass regardless of list size
+# - Text and patterns go through the same normalization: case-folding,
+#   leetspeak digits/symbols -> letters, punctuation -> spaces. Runs of 3+ of
+#   a letter match one or two of it ("stuuupiiid" == "stupid", "fuuuck"), but
+#   ordinary double letters are kept, so "looser" is not "loser"
+# - Common contractions and texting forms are expanded first ("you're",
+#   "ur", "u r" -> "you are"), so directed phrases catch how people write
+# - Matches are whole words/phrases only, so "class" never trips on "ass";
+#   single blocklist words also match with a plural/agent suffix ("idiots",
+#   "fucker"), compiled into the automaton as extra patterns
+# - Results are cached by a hash of the raw text (the text itself is not kept)
+# ------------------------------------------------------------
+
+# Words people use about themselves in honest reflection ("I felt useless",
+# "I was a loser at cards") only appear inside directed phrases
+DEFAULT_BLOCKLIST = (
+    "idiot", "moron", "bitch", "bastard", "asshole",
+    "fuck", "fucking", "motherfucker", "shit", "bullshit", "slut", "whore",
+)
+DEFAULT_PHRASES = (
+    "shut up", "kill yourself", "go die", "i hate you", "nobody loves you",
+    "you are nothing", "you are worthless", "you are useless", "you are pathetic",
+    "you are stupid", "you are a loser", "piece of shit",
+)
+WORD_SUFFIXES = ("s", "es", "er", "ers")  # also matched after single blocklist words
+CACHE_SIZE = 4096
+
+_LEET = str.maketrans({
+    "0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "9": "g",
+    "@": "a", "$": "s", "+": "t",
+})
+# "!" and "|" only count as an "i" inside a word ("sh!t"), not as punctuation ("stop!")
+_BANG_IN_WORD = re.compile(r"[!|]+(?=[a-z0-9@$+])")
+_NON_WORD = re.compile(r"[^a-z]+")
+_ELONGATED = re.compile(r"([a-z])\1{2,}")
+_CONTRACTIONS = {"you re": "you are", "youre": "you are", "ur": "you are", "u": "you", "r": "are"}
+_CONTRACTION = re.compile(r"(?<= )(%s)(?= )" % "|".join(
+    re.escape(k) for k in sorted(_CONTRACTIONS, key=len, reverse=True)))
+
+
+def _fold(text: str) -> str:
+    text = (text or "").casefold()
+    text = _BANG_IN_WORD.sub(lambda m: "i" * len(m.group()), text).translate(_LEET)
+    text = _NON_WORD.sub(" ", text)
+    return _CONTRACTION.sub(lambda m: _CONTRACTIONS[m.group()], f" {text.strip()} ")
+
+def normalize(text: str) -> str:
+    """Folded, de-leeted, single-spaced text padded with one space on each side; runs of 3+ cut to 2."""
+    return _ELONGATED.sub(r"\1\1", _fold(text))
+
+def _scan_form(text: str) -> str:
+    # Elongated runs become one uppercase letter, read by AhoCorasick.search as "one or two of it"
+    return _ELONGATED.sub(lambda m: m.group(1).upper(), _fold(text))
+
+def load_terms(path: str) -> tuple:
+    """One term per line; blank lines and lines starting with '#' are skipped."""
+    with open(path, encoding="utf-8") as f:
+        return tuple(line.strip() for line in f if line.strip() and not line.lstrip().startswith("#"))
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: finds every pattern occurrence in one left-to-right pass."""
+
+    def __init__(self, patterns):
+        self.patterns = tuple(patterns)
+        goto = [{}]   # state -> {char: next state}
+        out = [()]    # state -> pattern indices ending here
+        for i, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(())
+                state = nxt
+            out[state] += (i,)
+
+        # Breadth-first failure links; each state inherits its fallback's outputs
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] += out[fail[nxt]]
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def _step(self, state: int, ch: str) -> int:
+        goto, fail = self._goto, self._fail
+        while state and ch not in goto[state]:
+            state = fail[state]
+        return goto[state].get(ch, 0)
+
+    def search(self, text: str) -> set:
+        """Indices of all patterns that occur in `text`.
+
+        Patterns are lowercase; an uppercase letter in `text` stands for one or
+        two of that letter. Only then does the matcher follow a (small) set of
+        states; plain text walks a single state.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state, states = 0, None
+        for ch in text:
+            if states is None and not ch.isupper():
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+                if out[state]:
+                    found.update(out[state])
+                continue
+            if ch.isupper():
+                ch = ch.lower()
+                once = {self._step(st, ch) for st in (states or (state,))}
+                states = once | {self._step(st, ch) for st in once}
+            else:
+                states = {self._step(st, ch) for st in states}
+            for st in states:
+                if out[st]:
+                    found.update(out[st])
+            if len(states) == 1:
+                state, states = states.pop(), None
+        return found
+
+
+class ToxicityGate:
+    """Compiled blocklist + phrase list with an LRU of results keyed by text hash."""
+
+    def __init__(self, blocklist=DEFAULT_BLOCKLIST, phrases=DEFAULT_PHRASES, cache_size: int = CACHE_SIZE):
+        terms, keys = [], set()
+        for term in (*blocklist, *phrases):
+            key = normalize(term)
+            if key.strip() and key not in keys:
+                keys.add(key)
+                terms.append(term)
+        self.terms = tuple(terms)
+        patterns, self._pattern_terms = [], []  # pattern i matches term self._pattern_terms[i]
+        for i, term in enumerate(self.terms):
+            key = normalize(term)
+            forms = [key]
+            if " " not in key.strip():
+                forms += [f"{key[:-1]}{suffix} " for suffix in WORD_SUFFIXES]
+            for form in forms:
+                patterns.append(form)
+                self._pattern_terms.append(i)
+        self._matcher = AhoCorasick(patterns)
+        self._cache_size = cache_size
+        self._cache = OrderedDict()  # blake2b(text) -> matched terms
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _scan(self, text: str) -> tuple:
+        found = {self._pattern_terms[i] for i in self._matcher.search(_scan_form(text))}
+        return tuple(self.terms[i] for i in sorted(found))
+
+    def check(self, text: str) -> tuple:
+        """Blocklist terms found in `text` (empty tuple when clean)."""
+        if not text or not text.strip():
+            return ()
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        with self._lock:
+            matches = self._cache.get(key)
+            if matches is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return matches
+            self.misses += 1
+        matches = self._scan(text)
+        with self._lock:
+            self._cache[key] = matches
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return matches
+
+    def is_toxic(self, text: str) -> bool:
+        return bool(self.check(text))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
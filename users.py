@@ -0,0 +1,40 @@
+from locks import StripedLock
+
+# ------------------------------------------------------------
+# RelateScore™ user store (Streamlit-free, thread-safe)
+# Prototype-only credential store for a Streamlit Cloud instance.
+# ------------------------------------------------------------
+
+
+class UserStore:
+    """Shared user records: { username: {"pw_hash": str, "created_at": ts} }"""
+
+    def __init__(self, stripes: int = 64):
+        self._users = {}
+        self._lock = StripedLock(stripes)
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def __contains__(self, username) -> bool:
+        return username in self._users
+
+    def get(self, username: str) -> dict | None:
+        return self._users.get(username)
+
+    def add(self, username: str, record: dict) -> bool:
+        """Inserts `record` only if `username` is free. Returns False if it already exists."""
+        with self._lock(username):
+            if username in self._users:
+                return False
+            self._users[username] = record
+            return True
+
+    def update(self, username: str, **fields) -> bool:
+        """Updates fields of an existing record. Returns False if `username` is unknown."""
+        with self._lock(username):
+            record = self._users.get(username)
+            if record is None:
+                return False
+            self._users[username] = {**record, **fields}
+            return True
@@ -0,0 +1,302 @@
+import functools
+import io
+import math
+import threading
+from collections import OrderedDict
+from html import escape as html_escape
+
+import numpy as np
+
+from content import CATEGORIES
+
+# ------------------------------------------------------------
+# RelateScore™ RQ Wheel (Streamlit-free)
+# - draw_rq_wheel: draws onto any polar matplotlib axes
+# - WheelRenderer: renders image bytes from one reusable figure template
+#   and caches them in an LRU keyed by scores quantized to 0.1
+# - render_wheel_svg: the same wheel as a plain SVG string, no matplotlib
+# matplotlib is only imported when a WheelRenderer is created.
+# ------------------------------------------------------------
+
+# -----------------------------
+# RQ Wheel Color System (per category)
+# - Uses RelateScore palette where possible (Accent Blue / Mint / Gold)
+# - Adds distinct, premium-safe supporting colors for clear differentiation
+# - Every (category, score) color is computed once per process into a lookup
+#   table at 0.1 resolution; renders index it with the whole score vector
+# -----------------------------
+CATEGORY_COLORS = {
+    "Emotional Awareness": "#2E6AF3",        # Accent Blue
+    "Communication Style": "#0C9A6F",        # Success Green
+    "Conflict Tendencies": "#E54646",        # Error Red
+    "Attachment Patterns": "#6B5B95",        # Deep Violet (supporting)
+    "Empathy & Responsiveness": "#A6E3DA",   # Mint
+    "Self-Insight": "#F4A623",               # Warning Amber
+    "Trust & Boundaries": "#C6A667",         # Gold
+    "Stability & Consistency": "#1A1A1A",    # Charcoal
+}
+
+def _hex_to_rgb01(hex_color: str):
+    hex_color = hex_color.lstrip("#")
+    return tuple(int(hex_color[i:i+2], 16) / 255.0 for i in (0, 2, 4))
+
+DEFAULT_BASE_COLOR = "#2E6AF3"
+WARM_NEUTRAL = "#FAFAF8"  # Warm Surface
+COLOR_LUT_STEP = 0.1  # same as SCORE_QUANTUM: the cached renderers never ask for finer scores
+COLOR_LUT_SIZE = int(round(100.0 / COLOR_LUT_STEP)) + 1  # scores 0.0 .. 100.0
+
+def _color_intensity(score):
+    # Map score to intensity; keep conservative so it stays premium
+    return np.clip((np.asarray(score, dtype=float) - 20.0) / 70.0, 0.0, 1.0)  # 20->0, 90->1
+
+@functools.lru_cache(maxsize=None)
+def _color_lut(categories: tuple):
+    """(row per category, hex table (rows x COLOR_LUT_SIZE)); the last row is the default color."""
+    bases = [CATEGORY_COLORS.get(cat, DEFAULT_BASE_COLOR) for cat in categories] + [DEFAULT_BASE_COLOR]
+    t = _color_intensity(np.arange(COLOR_LUT_SIZE) * COLOR_LUT_STEP)[np.newaxis, :, np.newaxis]
+    neutral = np.array(_hex_to_rgb01(WARM_NEUTRAL))
+    base = np.array([_hex_to_rgb01(b) for b in bases])[:, np.newaxis, :]
+    rgb = ((neutral + (base - neutral) * t) * 255).astype(int)  # truncates like the former per-call blend
+    table = np.array([["#{:02X}{:02X}{:02X}".format(*px) for px in row] for row in rgb.tolist()], dtype=object)
+    return {cat: i for i, cat in enumerate(categories)}, table
+
+def category_colors(categories, scores) -> np.ndarray:
+    """Colors for a score vector (or an N x categories batch) in one lookup; no hex parsing.
+
+    Scores are rounded to COLOR_LUT_STEP. Returns an object array of "#RRGGBB" strings.
+    """
+    categories = tuple(categories)
+    _, table = _color_lut(categories)
+    idx = np.clip(np.rint(np.asarray(scores, dtype=float) / COLOR_LUT_STEP), 0, COLOR_LUT_SIZE - 1).astype(np.intp)
+    return table[np.arange(len(categories)), idx]
+
+def _category_dynamic_color(category: str, score: float) -> str:
+    """Real-time color per category based on its score (0-100):
+    - Low scores bias toward a warm neutral (subtle)
+    - High scores move toward the category's base color
+    """
+    rows, table = _color_lut(tuple(CATEGORIES))
+    row = rows.get(category, len(CATEGORIES))
+    i = min(max(int(round(float(score) / COLOR_LUT_STEP)), 0), COLOR_LUT_SIZE - 1)
+    return table[row, i]
+
+def draw_rq_wheel(ax, categories, scores_dict):
+    """Draw an RQ Wheel with per-category colors + wedge fills."""
+    n = len(categories)
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    values = np.array([float(scores_dict[c]) for c in categories], dtype=float)
+    colors = category_colors(categories, values)
+
+    # Close the polygon
+    angles_loop = np.concatenate([angles, [angles[0]]])
+    values_loop = np.concatenate([values, [values[0]]])
+
+    # Background + grid styling
+    ax.set_facecolor("#FAFAF8")
+    ax.grid(True, linewidth=0.8, alpha=0.25)
+    ax.spines["polar"].set_alpha(0.25)
+    ax.set_ylim(0, 100)
+    ax.set_yticks([20, 40, 60, 80, 100])
+    ax.set_yticklabels([])
+
+    # Colored wedges per category (gives the "real-time" multi-color feel)
+    for i in range(n):
+        a0 = angles[i]
+        a1 = angles[(i + 1) % n]
+        v0 = values[i]
+        v1 = values[(i + 1) % n]
+
+        # Handle wrap-around for the last wedge
+        if i == n - 1:
+            a1 = angles[0] + 2 * np.pi
+
+        ax.fill([a0, a0, a1, a1], [0, v0, v1, 0], color=colors[i], alpha=0.22, linewidth=0)
+
+    # Outline polygon (neutral premium stroke)
+    ax.plot(angles_loop, values_loop, linewidth=2.2, alpha=0.9)
+
+    # Markers per axis in category color
+    for i in range(n):
+        ax.scatter([angles[i]], [float(values[i])], s=60, c=[colors[i]], edgecolors="#1A1A1A",
+                   linewidths=0.6, zorder=5)
+
+    # Category labels, colored to match
+    ax.set_xticks(angles)
+    labels = []
+    for i, cat in enumerate(categories):
+        v = float(values[i])
+        labels.append(cat)
+        # Apply colored tick labels after set_xticklabels
+    ax.set_xticklabels(labels, fontsize=10)
+    for tick, cat in zip(ax.get_xticklabels(), categories):
+        tick.set_color(CATEGORY_COLORS.get(cat, "#1A1A1A"))
+        tick.set_fontweight("medium")
+
+
+# -----------------------------
+# Cached renderer
+# - The figure, axes, grid, labels and artists are built once; a render only
+#   moves the wedge polygons, outline and markers and recolors them
+# - Figures come from matplotlib.figure.Figure, not pyplot, so nothing is
+#   registered globally and nothing leaks between reruns
+# -----------------------------
+WHEEL_FIGSIZE = (6.3, 6.3)
+WHEEL_DPI = 200  # matches st.pyplot's default
+WHEEL_CACHE_SIZE = 512
+SCORE_QUANTUM = 0.1
+
+
+def quantize_scores(values) -> tuple:
+    """Score vector -> hashable key rounded to SCORE_QUANTUM."""
+    return tuple(round(float(v) / SCORE_QUANTUM) for v in values)
+
+
+class WheelRenderer:
+    def __init__(self, categories=CATEGORIES, cache_size: int = WHEEL_CACHE_SIZE,
+                 figsize=WHEEL_FIGSIZE, dpi: int = WHEEL_DPI):
+        self.categories = list(categories)
+        self.cache_size = cache_size
+        self.dpi = dpi
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()  # (quantized scores, fmt) -> bytes
+        self._cache_lock = threading.Lock()
+        self._render_lock = threading.Lock()  # matplotlib artists are not thread-safe
+
+        from matplotlib.figure import Figure
+
+        n = len(self.categories)
+        self._angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+        self._fig = Figure(figsize=figsize)
+        self._ax = self._fig.add_subplot(projection="polar")
+        draw_rq_wheel(self._ax, self.categories, {c: 0.0 for c in self.categories})
+        self._wedges = list(self._ax.patches)
+        self._outline = self._ax.lines[0]
+        self._markers = list(self._ax.collections)  # one scatter per category
+
+    def _wedge_angles(self, i: int):
+        a0 = self._angles[i]
+        a1 = self._angles[i + 1] if i + 1 < len(self._angles) else self._angles[0] + 2 * np.pi
+        return a0, a1
+
+    def _draw(self, values: np.ndarray, fmt: str) -> bytes:
+        n = len(self.categories)
+        colors = category_colors(self.categories, values)
+        for i, wedge in enumerate(self._wedges):
+            a0, a1 = self._wedge_angles(i)
+            wedge.set_xy([[a0, 0.0], [a0, values[i]], [a1, values[(i + 1) % n]], [a1, 0.0]])
+            wedge.set_facecolor(colors[i])
+        self._outline.set_data(np.concatenate([self._angles, self._angles[:1]]),
+                               np.concatenate([values, values[:1]]))
+        for i, marker in enumerate(self._markers):
+            marker.set_offsets([[self._angles[i], values[i]]])
+            marker.set_facecolor(colors[i])
+
+        buf = io.BytesIO()
+        self._fig.savefig(buf, format=fmt, dpi=self.dpi, bbox_inches="tight")
+        return buf.getvalue()
+
+    def render(self, scores, fmt: str = "png") -> bytes:
+        """scores: {category: value} or a vector aligned with categories. Returns PNG/SVG bytes."""
+        if isinstance(scores, dict):
+            scores = [scores[c] for c in self.categories]
+        key = (quantize_scores(scores), fmt)
+        with self._cache_lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return hit
+            self.misses += 1
+
+        values = np.array(key[0], dtype=float) * SCORE_QUANTUM
+        with self._render_lock:
+            data = self._draw(values, fmt)
+
+        with self._cache_lock:
+            self._cache[key] = data
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return data
+
+    def clear(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+
+# -----------------------------
+# Native SVG renderer
+# - Same geometry as the matplotlib wheel: theta=0 at 3 o'clock, counter-clockwise,
+#   radius 0-100, straight wedge/outline edges, colored tick labels
+# - Pure string formatting: microseconds per render, no matplotlib import
+# -----------------------------
+SVG_RADIUS = 150.0
+SVG_LABEL_PAD = 14.0
+SVG_SIDE_MARGIN = 150.0  # room for the longest horizontal label
+SVG_TOP_MARGIN = 36.0
+SVG_OUTLINE_COLOR = "#1F77B4"  # matplotlib's default first line color
+SVG_GRID_COLOR = "#B0B0B0"
+
+
+def _svg_point(cx: float, cy: float, angle: float, value: float):
+    r = SVG_RADIUS * value / 100.0
+    return cx + r * math.cos(angle), cy - r * math.sin(angle)
+
+@functools.lru_cache(maxsize=WHEEL_CACHE_SIZE)
+def _render_wheel_svg(categories: tuple, key: tuple) -> str:
+    n = len(categories)
+    values = [k * SCORE_QUANTUM for k in key]
+    angles = [2 * math.pi * i / n for i in range(n)]
+    width = 2 * (SVG_RADIUS + SVG_SIDE_MARGIN)
+    height = 2 * (SVG_RADIUS + SVG_TOP_MARGIN)
+    cx, cy = width / 2, height / 2
+    colors = category_colors(categories, values)
+
+    parts = [
+        f'<svg viewBox="0 0 {width:.0f} {height:.0f}" width="100%" xmlns="http://www.w3.org/2000/svg" '
+        f'role="img" aria-label="RQ Wheel" font-family="sans-serif">',
+        f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{SVG_RADIUS:.1f}" fill="#FAFAF8"/>',
+    ]
+
+    # Grid: rings at 20..80, spokes per category, outer spine at 100
+    grid = [f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{SVG_RADIUS * g / 100.0:.1f}"/>' for g in (20, 40, 60, 80)]
+    for a in angles:
+        x, y = _svg_point(cx, cy, a, 100.0)
+        grid.append(f'<line x1="{cx:.1f}" y1="{cy:.1f}" x2="{x:.1f}" y2="{y:.1f}"/>')
+    parts.append(f'<g fill="none" stroke="{SVG_GRID_COLOR}" stroke-width="0.8" stroke-opacity="0.25">'
+                 + "".join(grid) + "</g>")
+    parts.append(f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{SVG_RADIUS:.1f}" fill="none" '
+                 f'stroke="#000000" stroke-opacity="0.25" stroke-width="0.8"/>')
+
+    # Colored wedges per category
+    points = [_svg_point(cx, cy, a, v) for a, v in zip(angles, values)]
+    for i in range(n):
+        (x0, y0), (x1, y1) = points[i], points[(i + 1) % n]
+        parts.append(f'<path d="M{cx:.1f},{cy:.1f} L{x0:.1f},{y0:.1f} L{x1:.1f},{y1:.1f} Z" '
+                     f'fill="{colors[i]}" fill-opacity="0.22"/>')
+
+    # Outline polygon + markers
+    poly = " ".join(f"{x:.1f},{y:.1f}" for x, y in points)
+    parts.append(f'<polygon points="{poly}" fill="none" stroke="{SVG_OUTLINE_COLOR}" '
+                 f'stroke-width="2.2" stroke-opacity="0.9" stroke-linejoin="round"/>')
+    for (x, y), col in zip(points, colors):
+        parts.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="3.9" fill="{col}" stroke="#1A1A1A" stroke-width="0.6"/>')
+
+    # Category labels, colored to match
+    for a, cat in zip(angles, categories):
+        x, y = _svg_point(cx, cy, a, 100.0 + 100.0 * SVG_LABEL_PAD / SVG_RADIUS)
+        c, s = math.cos(a), math.sin(a)
+        anchor = "start" if c > 0.1 else ("end" if c < -0.1 else "middle")
+        baseline = "auto" if s > 0.1 else ("hanging" if s < -0.1 else "middle")
+        parts.append(f'<text x="{x:.1f}" y="{y:.1f}" font-size="10" font-weight="500" '
+                     f'text-anchor="{anchor}" dominant-baseline="{baseline}" '
+                     f'fill="{CATEGORY_COLORS.get(cat, "#1A1A1A")}">{html_escape(cat)}</text>')
+
+    parts.append("</svg>")
+    return "".join(parts)
+
+def render_wheel_svg(scores, categories=CATEGORIES) -> str:
+    """scores: {category: value} or a vector aligned with categories. Returns an SVG string."""
+    if isinstance(scores, dict):
+        scores = [scores[c] for c in categories]
+    return _render_wheel_svg(tuple(categories), quantize_scores(scores))